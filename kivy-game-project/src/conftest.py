@@ -0,0 +1 @@
+# Lets pytest import the game packages (logic, utils) from the tests, like the game does from src
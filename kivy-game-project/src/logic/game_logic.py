@@ -1,27 +1,84 @@
 import random
 import os
-from pathlib import Path
+from array import array
+from utils.paths import get_items_dir
+from utils.asset_manifest import get_manifest
+from utils.texture_atlas import ensure_deck_atlas, get_card_source, get_deck_images, choose_tier, ATLAS_CELL_WIDTH
+from utils import color_filters
+from utils import synthetic_deck
 
-def find_project_root():
-    """Find the project root directory by looking for known directories"""
-    # Start with the directory of this file and go up until we find the project root
-    current_dir = Path(__file__).resolve().parent.parent.parent.parent
+# Estados de uma carta no tabuleiro
+HIDDEN = 0
+FLIPPED = 1
+MATCHED = 2
+
+# Pares seguidos que contam para o multiplicador de pontos
+MAX_MULTIPLIER = 5
+# Segundos que as duas cartas viradas ficam à vista antes de se ver se formam par
+MATCH_CHECK_DELAY = 0.5
+# Segundos sem poder virar cartas depois de um par errado
+MISMATCH_DELAY = 0.5
+# Segundos que as cartas ficam à vista no modo fácil
+REVEAL_TIME = 2
+# Segundos que as cartas sugeridas por uma dica ficam destacadas
+HINT_TIME = 1.5
+
+# Tabuleiros do ecrã de dificuldade: (texto, número de cartas, (colunas, linhas))
+DIFFICULTIES = {
+    "Easy": (("4x4", 16, (4, 4)), ("5x4", 20, (5, 4))),
+    "Medium": (("6x4", 24, (6, 4)), ("6x5", 30, (6, 5))),
+    "Hard": (("6x6", 36, (6, 6)), ("6x7", 42, (6, 7))),
+}
+# Tabuleiros enormes, para testar o jogo à escala: usam o baralho sintético e deslizam no ecrã
+HUGE_BOARDS = (("20x20", 400, (20, 20)), ("40x40", 1600, (40, 40)))
+# A partir deste número de cartas o tabuleiro só cria as cartas que estão à vista
+HUGE_BOARD_MIN_CARDS = 100
+
+def is_huge_board(num_cards):
+    return num_cards >= HUGE_BOARD_MIN_CARDS
+
+def get_display_theme(theme, colorblind_filter=None):
+    """
+    Return the deck directory and colour variant to draw for a theme.
     
-    # Check if we're at the project root
-    if (current_dir / "Items_Jogo").exists():
-        return str(current_dir)
-    if (current_dir.parent / "Items_Jogo").exists():
-        return str(current_dir.parent)
+    In colorblind mode the filtered deck is generated from the colour one when
+    NumPy is available, otherwise the black and white decks on disk are used.
+    """
+    if not colorblind_filter or "preto_e_branco" in theme:
+        return theme, color_filters.COLOR
+    
+    if color_filters.is_available():
+        return theme, colorblind_filter
     
-    # Fallback to a hardcoded path but with the correct username from the file path
-    file_path = Path(__file__).resolve()
-    username = file_path.parts[2]  # Extract username from path
-    return os.path.join('C:', os.sep, 'Users', username, 'Documents', 'GitHub', 'IPC_24-25')
+    items_dir = get_items_dir()
+    if "baralho_animais" in theme:
+        return os.path.join(items_dir, "baralho_animais_preto_e_branco"), color_filters.COLOR
+    elif "baralho_numeros" in theme:
+        return os.path.join(items_dir, "baralho_numeros_preto_e_branco"), color_filters.COLOR
+    return theme, color_filters.COLOR
+
+def get_board_theme(theme, num_cards):
+    """
+    Baralho usado num tabuleiro: o do tema, ou o baralho sintético quando o
+    tema não tem cartas diferentes que cheguem (tabuleiros enormes).
+    """
+    num_pairs = num_cards // 2
+    if len(get_deck_images(theme)) >= num_pairs or not synthetic_deck.is_available():
+        return theme
+    return synthetic_deck.ensure_synthetic_deck(num_pairs)
 
-def start_game(theme, num_cards):
+def get_card_sound_path(image_path):
+    """Return the sound file of a card image, None if it has no sound (black and white cards share the colour deck sounds)"""
+    return get_manifest().get_card_sound(image_path)
+
+def get_deck_sound_paths(theme):
+    """Return the existing sound files for every card of a deck"""
+    return get_manifest().get_deck_sounds(theme)
+
+def start_game(theme, num_cards, card_width=None, variant=color_filters.COLOR, lazy_faces=False, seed=None):
     # Initialize game state and variables
-    cards = generate_cards(theme, num_cards)
-    return cards
+    pairs = generate_pairs(theme, num_cards, card_width, variant, lazy_faces)
+    return Board.from_seed(len(pairs), seed, pairs)
 
 def end_game():
     # Handle end of game logic
@@ -35,9 +92,9 @@ def reset_game():
     # Reset the game to its initial state
     pass
 
-def check_win_condition(cards):
+def check_win_condition(board):
     # Check if the win condition has been met
-    return all(card["matched"] for card in cards)
+    return board.is_won()
 
 def load_game_data():
     # Load game data from a file or database
@@ -47,59 +104,170 @@ def save_game_data():
     # Save current game data to a file or database
     pass
 
-def generate_cards(theme, num_cards):
+def generate_pairs(theme, num_cards, card_width=None, variant=color_filters.COLOR, lazy_faces=False):
     """
-    Gera as cartas para o jogo.
+    Gera os pares para o jogo (uma entrada por par, as duas cartas partilham-na).
     
     Args:
         theme (str): Caminho para o diretório do tema
         num_cards (int): Número total de cartas (deve ser par)
+        card_width (float): Largura das cartas no ecrã em píxeis, usada para
+            escolher a versão reduzida do baralho (opcional)
+        variant (str): Filtro de cor aplicado às cartas (modo daltónico)
+        lazy_faces (bool): Não prepara as faces das cartas (ficam a None até
+            serem viradas pela primeira vez)
     
     Returns:
-        list: Lista de dicionários representando as cartas
+        list: Lista de dicionários {"image", "face", "sound"}, o índice é o id do par
     """
     # Verifica se o número de cartas é par
     if num_cards % 2 != 0:
         raise ValueError("O número de cartas deve ser par")
     
     # Load images from the selected theme directory
-    images = [os.path.join(theme, img) for img in os.listdir(theme) if img.endswith('.png')]
+    images = get_deck_images(theme)
     
     # Verifica se há imagens suficientes
     if len(images) < num_cards // 2:
         raise ValueError(f"Not enough images in the theme. Required: {num_cards // 2}, Available: {len(images)}")
     
-    # Seleciona o número correto de imagens e duplica para formar os pares
-    images = images[:num_cards // 2] * 2
-    random.shuffle(images)
-    
-    cards = []
-    
-    # Get project root directory
-    project_root = find_project_root()
-    
-    # Determine the appropriate sound folder based on the theme
-    sound_folder = None
-    if "baralho_animais" in theme.lower():
-        sound_folder = os.path.join(project_root, "Items_Jogo", "audios_wav_animais")
-    elif "baralho_numeros" in theme.lower():
-        sound_folder = os.path.join(project_root, "Items_Jogo", "audios_numeros_wav")
-    else:
-        # Fallback to the default folder
-        sound_folder = os.path.join(project_root, "Items_Jogo", "audios_wav_animais")
+    # Card faces come from the deck atlas when available (one texture for the whole deck),
+    # using the smallest downscaled tier that is still sharp at the on-screen card size
+    tier = choose_tier(card_width) if card_width else ATLAS_CELL_WIDTH
+    atlas_base = None if lazy_faces else ensure_deck_atlas(theme, cell_width=tier, variant=variant)
     
-    for img_path in images:
-        base_filename = os.path.basename(img_path)
-        
+    pairs = []
+    for img_path in images[:num_cards // 2]:
         # For number theme, cards use 0-indexed filenames (0.png = number 1, 31.png = number 32)
         # Audio files follow the same naming convention (0.wav = spoken "one", etc.)
-        sound_path = os.path.join(sound_folder, base_filename.replace(".png", ".wav"))
-        
-        cards.append({
+        pairs.append({
             "image": img_path, 
-            "flipped": False, 
-            "matched": False, 
-            "sound": sound_path if os.path.exists(sound_path) else None
+            "face": None if lazy_faces else get_card_source(atlas_base, img_path),
+            "sound": get_card_sound_path(img_path)
         })
     
-    return cards
\ No newline at end of file
+    return pairs
+
+class Board:
+    """
+    Estado de um tabuleiro, sem nada de Kivy.
+    
+    Cada carta é só o id do seu par (um inteiro) e um estado (HIDDEN, FLIPPED
+    ou MATCHED), guardados em arrays compactos. Os contadores de pares
+    encontrados e de cartas viradas são atualizados a cada jogada, por isso
+    saber se o jogo acabou não percorre as cartas.
+    
+    O que se mostra de cada par (imagem, face, som) fica em pairs, indexado
+    pelo id do par; o tabuleiro não olha para isso.
+    """
+    __slots__ = ('pair_ids', 'states', 'pairs', 'seed', 'total_pairs', 'matched_pairs', 'flipped_count',
+                 'selected', 'moves', 'score', 'multiplier', 'consecutive_matches')
+
+    def __init__(self, pair_ids, pairs=None, seed=None):
+        if len(pair_ids) % 2 != 0:
+            raise ValueError("O número de cartas deve ser par")
+        self.pair_ids = array('I', pair_ids)
+        self.states = bytearray(len(pair_ids))  # HIDDEN em todas
+        self.pairs = pairs
+        self.seed = seed  # Semente com que as cartas foram baralhadas (None se não se sabe)
+        self.total_pairs = len(pair_ids) // 2
+        self.matched_pairs = 0
+        self.flipped_count = 0  # Cartas viradas que ainda não formaram par
+        self.selected = []  # Índices das cartas viradas nesta jogada (no máximo 2)
+        self.moves = 0  # Jogadas feitas (pares de cartas verificados)
+        self.score = 0
+        self.multiplier = 1
+        self.consecutive_matches = 0
+
+    @classmethod
+    def from_seed(cls, num_pairs, seed=None, pairs=None):
+        """
+        Baralha duas cartas de cada par num tabuleiro novo.
+        
+        A mesma semente dá sempre o mesmo tabuleiro (é o que permite repetir
+        um jogo gravado); sem semente é escolhida uma ao acaso.
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        pair_ids = list(range(num_pairs)) * 2
+        random.Random(seed).shuffle(pair_ids)
+        return cls(pair_ids, pairs, seed)
+
+    def __len__(self):
+        return len(self.pair_ids)
+
+    def get_pair(self, index):
+        """Dados do par da carta index (None se o tabuleiro não os tiver)"""
+        return self.pairs[self.pair_ids[index]] if self.pairs is not None else None
+
+    def is_flipped(self, index):
+        return self.states[index] == FLIPPED
+
+    def is_matched(self, index):
+        return self.states[index] == MATCHED
+
+    def is_face_up(self, index):
+        return self.states[index] != HIDDEN
+
+    def can_flip(self, index):
+        return self.states[index] == HIDDEN and len(self.selected) < 2
+
+    def flip(self, index):
+        """Vira a carta index. Devolve False se não puder ser virada agora"""
+        if not self.can_flip(index):
+            return False
+        self.states[index] = FLIPPED
+        self.flipped_count += 1
+        self.selected.append(index)
+        return True
+
+    def has_pair_selected(self):
+        """Há duas cartas viradas à espera de check_selected()"""
+        return len(self.selected) == 2
+
+    def check_selected(self):
+        """
+        Resolve a jogada com as duas cartas viradas: ficam encontradas se forem
+        do mesmo par, voltam a ficar escondidas se não forem.
+        
+        Returns:
+            tuple: (primeira carta, segunda carta, True se formaram par)
+        """
+        if len(self.selected) != 2:
+            raise ValueError(f"São precisas 2 cartas viradas, há {len(self.selected)}")
+        first, second = self.selected
+        self.selected = []
+        self.flipped_count -= 2
+        self.moves += 1
+        
+        is_match = self.pair_ids[first] == self.pair_ids[second]
+        if is_match:
+            self.states[first] = self.states[second] = MATCHED
+            self.matched_pairs += 1
+            self.consecutive_matches += 1
+            self.multiplier = min(self.consecutive_matches, MAX_MULTIPLIER)
+            self.score += self.multiplier
+        else:
+            self.states[first] = self.states[second] = HIDDEN
+            self.consecutive_matches = 0
+            self.multiplier = 1
+        return first, second, is_match
+
+    def reveal_all(self):
+        """Vira todas as cartas escondidas (modo fácil). Devolve os índices que foram virados"""
+        revealed = [index for index, state in enumerate(self.states) if state == HIDDEN]
+        for index in revealed:
+            self.states[index] = FLIPPED
+        self.flipped_count += len(revealed)
+        return revealed
+
+    def hide(self, indexes):
+        """Volta a esconder as cartas de reveal_all() que continuam viradas fora da jogada"""
+        hidden = [index for index in indexes if self.states[index] == FLIPPED and index not in self.selected]
+        for index in hidden:
+            self.states[index] = HIDDEN
+        self.flipped_count -= len(hidden)
+        return hidden
+
+    def is_won(self):
+        return self.matched_pairs == self.total_pairs
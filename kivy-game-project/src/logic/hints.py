@@ -0,0 +1,87 @@
+from array import array
+from logic.game_logic import MATCHED
+
+class HintEngine:
+    """
+    Suggests the next card to flip from what the player has already seen.
+
+    Every card that was face up at some point is recorded when it is shown
+    (on_seen), so nothing is ever rescanned:
+    - seen_first/seen_second: the seen cards of every pair (-1 while unseen)
+    - known_pairs: pairs with both cards seen, most recent on top. Matched
+      pairs are dropped lazily when they reach the top, so a match costs nothing
+    - unseen: the cards never seen, with their position in unseen_positions
+      so a card is removed by swapping it with the last one
+
+    Every update and every get_hint() is O(1) (amortized for the lazy drops),
+    whatever the size of the board, except while easy mode shows the board:
+    known pairs that are face up can't be suggested and are skipped.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        num_cards = len(board)
+        self.seen_first = array('i', [-1]) * board.total_pairs
+        self.seen_second = array('i', [-1]) * board.total_pairs
+        self.known_pairs = []
+        self.unseen = array('i', range(num_cards))
+        self.unseen_positions = array('i', range(num_cards))
+
+    def on_seen(self, index):
+        """A card was shown to the player (flipped, or revealed in easy mode)"""
+        position = self.unseen_positions[index]
+        if position < 0:
+            return
+        last = self.unseen.pop()
+        if last != index:
+            self.unseen[position] = last
+            self.unseen_positions[last] = position
+        self.unseen_positions[index] = -1
+
+        pair = self.board.pair_ids[index]
+        if self.seen_first[pair] < 0:
+            self.seen_first[pair] = index
+        else:
+            self.seen_second[pair] = index
+            self.known_pairs.append(pair)
+
+    def get_partner(self, index):
+        """The other card of the pair of a card if it was seen, -1 otherwise"""
+        pair = self.board.pair_ids[index]
+        first = self.seen_first[pair]
+        return self.seen_second[pair] if first == index else first
+
+    def get_hint(self):
+        """
+        Cards the player should flip next.
+
+        Returns:
+            list: Both cards of a pair the player has seen, the partner of the
+                card already flipped if it was seen, otherwise a card never
+                seen (the only kind that shows something new). Only cards that
+                can be flipped right now are suggested, so the list is empty
+                while two cards wait to be checked, while easy mode shows the
+                board, or once the board is won.
+        """
+        board = self.board
+        if board.is_won() or len(board.selected) > 1:
+            return []
+
+        if board.selected:
+            partner = self.get_partner(board.selected[0])
+            if partner >= 0 and board.can_flip(partner):
+                return [partner]
+        else:
+            # Pairs matched since they were seen are only dropped when they get here
+            known_pairs = self.known_pairs
+            while known_pairs and board.states[self.seen_first[known_pairs[-1]]] == MATCHED:
+                known_pairs.pop()
+            # Pairs face up for a moment (easy mode reveal) are kept for later
+            for pair in reversed(known_pairs):
+                first, second = self.seen_first[pair], self.seen_second[pair]
+                if board.can_flip(first) and board.can_flip(second):
+                    return [first, second]
+
+        if self.unseen and board.can_flip(self.unseen[-1]):
+            return [self.unseen[-1]]
+        return []
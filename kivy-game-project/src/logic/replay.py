@@ -0,0 +1,192 @@
+import os
+import time
+import struct
+from logic.game_logic import Board
+
+REPLAY_MAGIC = b'MGRP'
+REPLAY_VERSION = 1
+REPLAY_EXTENSION = '.mgr'
+# magic, version, length of the theme path that follows (UTF-8)
+HEADER = struct.Struct('<4sHH')
+# Seconds since the game started, board seed, card index, event
+RECORD = struct.Struct('<dIHBx')
+
+# Events of a game
+EVENT_START = 0   # A new board, card is the number of cards
+EVENT_FLIP = 1    # A card was flipped
+EVENT_CHECK = 2   # The two flipped cards were checked, card is 1 if they matched
+EVENT_REVEAL = 3  # Easy mode showed every card
+EVENT_HIDE = 4    # ...and hid them again
+EVENT_PAUSE = 5   # The ESC menu was opened
+EVENT_RESUME = 6  # ...and the game resumed
+
+EVENT_NAMES = {
+    EVENT_START: 'start',
+    EVENT_FLIP: 'flip',
+    EVENT_CHECK: 'check',
+    EVENT_REVEAL: 'reveal',
+    EVENT_HIDE: 'hide',
+    EVENT_PAUSE: 'pause',
+    EVENT_RESUME: 'resume',
+}
+
+class ReplayRecorder:
+    """
+    Records every move of a game as fixed size binary records (16 bytes each).
+
+    The board seed is in every record, so a log cut at any point still says
+    which board it was played on. The recording of a game is written to
+    disk when the game ends or the next one starts.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.replay_dir = None
+        self.theme = None
+        self.seed = 0
+        self.started = 0.0  # perf_counter() of the start, the clock the records are timed with
+        self.started_at = 0.0  # Wall clock time of the start, names the file
+        self.records = bytearray()
+
+    def start(self, theme, num_cards, seed):
+        """Start recording a new board, saving the unfinished recording of the previous one"""
+        if not self.enabled:
+            return
+        self.save()
+        self.theme = theme
+        self.seed = seed
+        # time.time() can jump (NTP, clock changes) in the middle of a game
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.records = bytearray()
+        self.record(EVENT_START, num_cards)
+
+    def record(self, event, card=0):
+        if not self.enabled or self.theme is None:
+            return
+        self.records += RECORD.pack(time.perf_counter() - self.started, self.seed, card, event)
+
+    def save(self):
+        """Write the current recording to replay_dir, returns its path (None if there was nothing to save)"""
+        if not self.enabled or self.theme is None or self.replay_dir is None:
+            return None
+        path = os.path.join(self.replay_dir, time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at))
+                            + f"-{self.seed:08x}{REPLAY_EXTENSION}")
+        try:
+            os.makedirs(self.replay_dir, exist_ok=True)
+            write_replay(path, self.theme, self.records)
+        except Exception as e:
+            print(f"Error saving replay: {e}")
+            path = None
+        self.theme = None
+        self.records = bytearray()
+        return path
+
+def write_replay(path, theme, records):
+    theme_bytes = theme.encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, len(theme_bytes)))
+        f.write(theme_bytes)
+        f.write(records)
+
+def read_replay(path):
+    """
+    Read a replay file.
+
+    Returns:
+        tuple: (theme, list of (time, seed, card, event) records)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, theme_length = HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError(f"Not a replay file: {path}")
+    offset = HEADER.size + theme_length
+    theme = data[HEADER.size:offset].decode('utf-8')
+    # A recording cut while it was written ends with part of a record
+    end = offset + (len(data) - offset) // RECORD.size * RECORD.size
+    return theme, list(RECORD.iter_unpack(data[offset:end]))
+
+def get_replay_dir(settings_dir):
+    return os.path.join(settings_dir, 'replays')
+
+def get_replay_files(replay_dir):
+    """Replay files of a directory, oldest first"""
+    if not os.path.isdir(replay_dir):
+        return []
+    return sorted(os.path.join(replay_dir, name) for name in os.listdir(replay_dir) if name.endswith(REPLAY_EXTENSION))
+
+def replay_board(records):
+    """
+    Play a recording again on a headless board.
+
+    Every move is applied to a Board built from the recorded seed and every
+    recorded check is compared with what the board decides, so a recording
+    that doesn't play back the same way points at a bug in the game logic.
+
+    Returns:
+        dict: 'board', 'time' (seconds played, pauses excluded), 'paused'
+            (seconds in the ESC menu) and 'errors' (list of strings)
+    """
+    board = None
+    revealed = []
+    errors = []
+    paused = 0.0
+    paused_at = None
+    last_time = 0.0
+
+    for record_time, seed, card, event in records:
+        last_time = record_time
+        if event == EVENT_START:
+            board = Board.from_seed(card // 2, seed)
+            continue
+        if board is None:
+            errors.append(f"{record_time:.3f}s: {EVENT_NAMES.get(event, event)} before the board started")
+            continue
+
+        if event == EVENT_FLIP:
+            if not board.flip(card):
+                errors.append(f"{record_time:.3f}s: card {card} can't be flipped")
+        elif event == EVENT_CHECK:
+            if not board.has_pair_selected():
+                errors.append(f"{record_time:.3f}s: check with {len(board.selected)} cards flipped")
+                continue
+            first, second, is_match = board.check_selected()
+            if is_match != bool(card):
+                errors.append(f"{record_time:.3f}s: cards {first} and {second} recorded as {'a match' if card else 'no match'}")
+        elif event == EVENT_REVEAL:
+            revealed = board.reveal_all()
+        elif event == EVENT_HIDE:
+            board.hide(revealed)
+            revealed = []
+        elif event == EVENT_PAUSE:
+            paused_at = record_time
+        elif event == EVENT_RESUME and paused_at is not None:
+            paused += record_time - paused_at
+            paused_at = None
+
+    if paused_at is not None:
+        paused += last_time - paused_at
+    return {'board': board, 'time': last_time - paused, 'paused': paused, 'errors': errors}
+
+# Shared by the whole game, turned on by the 'record_replays' setting
+replay_recorder = ReplayRecorder()
+
+if __name__ == '__main__':
+    # Check every recorded game: python -m logic.replay [replay dir]
+    import sys
+    from utils.settings_manager import get_settings_dir
+    replay_dir = sys.argv[1] if len(sys.argv) > 1 else get_replay_dir(get_settings_dir())
+    started = time.perf_counter()
+    files = get_replay_files(replay_dir)
+    for path in files:
+        theme, records = read_replay(path)
+        result = replay_board(records)
+        board = result['board']
+        status = 'won' if board and board.is_won() else 'unfinished'
+        print(f"{os.path.basename(path)}: {os.path.basename(theme)}, {status}, score {board.score if board else 0}, "
+              f"{board.moves if board else 0} moves, {result['time']:.1f}s" + (f", {len(result['errors'])} errors" if result['errors'] else ''))
+        for error in result['errors']:
+            print(f"  {error}")
+    if files:
+        print(f"{len(files)} replays in {time.perf_counter() - started:.3f}s")
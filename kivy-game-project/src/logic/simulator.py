@@ -0,0 +1,174 @@
+import sys
+import time
+from logic.game_logic import DIFFICULTIES, MAX_MULTIPLIER, MATCH_CHECK_DELAY, MISMATCH_DELAY
+
+# NumPy is only needed to run the simulations (python -m logic.simulator)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Games played at once, bigger batches are faster but take more memory
+DEFAULT_BATCH_SIZE = 200000
+# Percentiles reported for every distribution
+REPORT_PERCENTILES = (10, 50, 90, 99)
+
+def is_available():
+    return np is not None
+
+class PlayerModel:
+    """
+    How a simulated player picks the cards of a turn.
+
+    Every turn the player first flips a pair they remember, if they remember
+    one. Otherwise they flip a card they don't remember and, if they remember
+    where its partner is, the partner; if not, another card they don't
+    remember. Between turns every remembered card is forgotten with chance
+    1 - memory, so memory=1 never forgets and memory=0 plays at random.
+    """
+
+    def __init__(self, name, memory=1.0, flip_time=1.0):
+        self.name = name
+        self.memory = memory
+        self.flip_time = flip_time  # Seconds the player takes to pick and tap a card
+
+    def __repr__(self):
+        return f"PlayerModel({self.name!r}, memory={self.memory}, flip_time={self.flip_time})"
+
+PLAYER_MODELS = {
+    'perfect': PlayerModel('perfect', memory=1.0),
+    'forgetful': PlayerModel('forgetful', memory=0.85),
+    'random': PlayerModel('random', memory=0.0),
+}
+
+def get_board_sizes():
+    """(label, number of cards) of every board of the difficulty screen, easiest first"""
+    return [(label, num_cards) for boards in DIFFICULTIES.values() for label, num_cards, grid_size in boards]
+
+def generate_boards(games, num_pairs, rng):
+    """
+    Shuffle `games` boards at once.
+
+    Returns:
+        numpy.ndarray: (games, 2 * num_pairs) array with the index of the
+            other card of the pair of every card
+    """
+    num_cards = 2 * num_pairs
+    # Card i shows pair order[i] // 2, its partner is where order[i] ^ 1 ended up
+    order = np.argsort(rng.random((games, num_cards)), axis=1).astype(np.int32)
+    position = np.empty_like(order)
+    np.put_along_axis(position, order, np.arange(num_cards, dtype=np.int32)[None, :], axis=1)
+    return np.take_along_axis(position, order ^ 1, axis=1)
+
+def _pick(rng, hidden, preferred, exclude=None):
+    """A random hidden card of every game, from the preferred cards when there are any"""
+    keys = rng.random(hidden.shape, dtype=np.float32) + preferred
+    keys[~hidden] = -1
+    if exclude is not None:
+        keys[np.arange(len(keys)), exclude] = -1
+    return keys.argmax(axis=1)
+
+def simulate_batch(num_cards, games, model, rng, max_multiplier=MAX_MULTIPLIER,
+                   check_delay=MATCH_CHECK_DELAY, mismatch_delay=MISMATCH_DELAY):
+    """
+    Play `games` games of one board size at once, every game one turn per step.
+
+    The scoring is the one of Board.check_selected: every pair is worth the
+    number of pairs found in a row, up to max_multiplier. The time is the
+    player's flip_time for every card plus the delays of the game screen.
+
+    Returns:
+        dict: 'moves', 'score' and 'time' arrays with one value per game
+    """
+    num_pairs = num_cards // 2
+    partner = generate_boards(games, num_pairs, rng)
+    hidden = np.ones(partner.shape, dtype=bool)
+    known = np.zeros(partner.shape, dtype=bool)
+    game_ids = np.arange(games)
+    streak = np.zeros(games, dtype=np.int32)
+    score = np.zeros(games, dtype=np.int64)
+    moves = np.zeros(games, dtype=np.int32)
+    pairs_left = np.full(games, num_pairs, dtype=np.int32)
+
+    results = {
+        'moves': np.zeros(games, dtype=np.int32),
+        'score': np.zeros(games, dtype=np.int64),
+        'time': np.zeros(games, dtype=np.float64),
+    }
+    mismatches = np.zeros(games, dtype=np.int32)
+
+    while len(game_ids):
+        rows = np.arange(len(game_ids))
+        if model.memory < 1.0:
+            known &= rng.random(known.shape, dtype=np.float32) < model.memory
+
+        # A pair the player remembers both cards of
+        known_pairs = known & np.take_along_axis(known, partner, axis=1)
+        has_pair = known_pairs.any(axis=1)
+        first = np.where(has_pair, known_pairs.argmax(axis=1), _pick(rng, hidden, ~known))
+        first_partner = partner[rows, first]
+
+        # The partner of the first card if the player remembers it, another unknown card otherwise
+        remembers_partner = has_pair | known[rows, first_partner]
+        second = np.where(remembers_partner, first_partner, _pick(rng, hidden, ~known, exclude=first))
+
+        known[rows, first] = True
+        known[rows, second] = True
+        is_match = second == first_partner
+        matched_rows = rows[is_match]
+        for card in (first[is_match], second[is_match]):
+            hidden[matched_rows, card] = False
+            known[matched_rows, card] = False
+
+        streak = np.where(is_match, streak + 1, 0)
+        score += np.where(is_match, np.minimum(streak, max_multiplier), 0)
+        pairs_left -= is_match
+        moves += 1
+        mismatches[game_ids] += ~is_match
+
+        # Store the finished games and keep playing the others
+        done = pairs_left == 0
+        if done.any():
+            finished = game_ids[done]
+            results['moves'][finished] = moves[done]
+            results['score'][finished] = score[done]
+            playing = ~done
+            game_ids, partner, hidden, known = game_ids[playing], partner[playing], hidden[playing], known[playing]
+            streak, score, moves, pairs_left = streak[playing], score[playing], moves[playing], pairs_left[playing]
+
+    results['time'] = results['moves'] * (2 * model.flip_time + check_delay) + mismatches * mismatch_delay
+    return results
+
+def simulate(num_cards, games, model, seed=None, batch_size=DEFAULT_BATCH_SIZE, **rules):
+    """Play `games` games in batches, returns the same arrays as simulate_batch"""
+    rng = np.random.default_rng(seed)
+    batches = []
+    for start in range(0, games, batch_size):
+        batches.append(simulate_batch(num_cards, min(batch_size, games - start), model, rng, **rules))
+    return {key: np.concatenate([batch[key] for batch in batches]) for key in ('moves', 'score', 'time')}
+
+def summarize(results):
+    """Mean and percentiles of every distribution"""
+    summary = {}
+    for key, values in results.items():
+        stats = {'mean': round(float(values.mean()), 3)}
+        for p, value in zip(REPORT_PERCENTILES, np.percentile(values, REPORT_PERCENTILES)):
+            stats[f'p{p}'] = round(float(value), 3)
+        summary[key] = stats
+    return summary
+
+def print_summary(label, model, summary, games, seconds):
+    print(f"{label} {model.name} ({games} games, {games / seconds / 1e6 * 60:.1f}M games/min)")
+    for key, stats in summary.items():
+        print(f"  {key:5}: " + ", ".join(f"{name} {value}" for name, value in stats.items()))
+
+if __name__ == '__main__':
+    # Simulate every board of the difficulty screen: python -m logic.simulator [games per board]
+    if np is None:
+        raise SystemExit("NumPy is required to run the simulator")
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for model in PLAYER_MODELS.values():
+        for label, num_cards in get_board_sizes():
+            started = time.perf_counter()
+            results = simulate(num_cards, games, model, seed=0)
+            print_summary(label, model, summarize(results), games, time.perf_counter() - started)
@@ -0,0 +1,146 @@
+import os
+import sys
+import csv
+import json
+import time
+import zlib
+import itertools
+import multiprocessing
+from logic.game_logic import MAX_MULTIPLIER, MATCH_CHECK_DELAY, MISMATCH_DELAY
+from logic.simulator import PlayerModel, simulate, summarize, get_board_sizes, is_available
+from utils.settings_manager import get_settings_dir
+
+CHECKPOINT_NAME = 'checkpoint.jsonl'
+RESULTS_NAME = 'results.csv'
+# Games simulated for every configuration
+DEFAULT_GAMES = 100000
+# Smaller batches than a single run, every core holds one
+SWEEP_BATCH_SIZE = 50000
+
+# Every combination of these values is simulated
+DEFAULT_SWEEP = {
+    'num_cards': [num_cards for label, num_cards in get_board_sizes()],
+    'max_multiplier': [3, MAX_MULTIPLIER, 8],
+    'check_delay': [0.3, MATCH_CHECK_DELAY, 0.8],
+    'mismatch_delay': [MISMATCH_DELAY],
+    'memory': [1.0, 0.85, 0.6],
+    'flip_time': [1.0],
+}
+
+def get_sweep_dir():
+    return os.path.join(get_settings_dir(), 'sweep')
+
+def get_configurations(sweep):
+    """Every combination of the sweep values, as dicts in a stable order"""
+    keys = list(sweep)
+    return [dict(zip(keys, values)) for values in itertools.product(*(sweep[key] for key in keys))]
+
+def get_config_seed(config):
+    """Seed of a configuration, so a resumed sweep gives the same numbers"""
+    return zlib.crc32(','.join(f"{key}={config[key]}" for key in sorted(config)).encode('utf-8'))
+
+def get_config_key(config, games):
+    """
+    Identifies a run of a configuration in the checkpoint, e.g.
+    'check_delay=0.5,flip_time=1.0,...,games=100000,seed=123'. A run with
+    another number of games (or seed) is a different run.
+    """
+    return ','.join([f"{key}={config[key]}" for key in sorted(config)]
+                    + [f"games={games}", f"seed={get_config_seed(config)}"])
+
+def run_configuration(task):
+    """Simulate one configuration (runs in a worker process)"""
+    config, games = task
+    key = get_config_key(config, games)
+    model = PlayerModel(f"memory={config['memory']}", memory=config['memory'], flip_time=config['flip_time'])
+    started = time.perf_counter()
+    results = simulate(config['num_cards'], games, model, seed=get_config_seed(config),
+                       batch_size=SWEEP_BATCH_SIZE, max_multiplier=config['max_multiplier'],
+                       check_delay=config['check_delay'], mismatch_delay=config['mismatch_delay'])
+    row = dict(config, games=games, seconds=round(time.perf_counter() - started, 2))
+    for metric, stats in summarize(results).items():
+        for name, value in stats.items():
+            row[f"{metric}_{name}"] = value
+    return key, row
+
+def load_checkpoint(path):
+    """Rows of the configurations already simulated, by configuration key"""
+    rows = {}
+    if not os.path.exists(path):
+        return rows
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # The last line is cut short if the sweep was killed while writing it
+                continue
+            rows[entry['key']] = entry['row']
+    return rows
+
+def end_with_newline(path):
+    """Terminate a checkpoint whose last line was cut short, so the next record starts on its own line"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b'\n':
+            f.write(b'\n')
+
+def save_results(path, rows):
+    """Write every row to one CSV table"""
+    columns = []
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def run_sweep(sweep=DEFAULT_SWEEP, output_dir=None, games=DEFAULT_GAMES, processes=None):
+    """
+    Simulate every configuration of the sweep on all cores.
+
+    Finished configurations are appended to output_dir/checkpoint.jsonl as
+    they come in, so an interrupted sweep run again with the same output_dir
+    only simulates what is missing. At the end every row (the ones from
+    earlier runs too) is merged into output_dir/results.csv.
+
+    Returns:
+        list: One dict per configuration, this sweep's first and in sweep order
+    """
+    output_dir = output_dir or get_sweep_dir()
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_NAME)
+
+    configurations = get_configurations(sweep)
+    done = load_checkpoint(checkpoint_path)
+    tasks = [(config, games) for config in configurations if get_config_key(config, games) not in done]
+    print(f"Sweep: {len(configurations)} configurations, {len(configurations) - len(tasks)} already done")
+
+    if tasks:
+        end_with_newline(checkpoint_path)
+        with multiprocessing.Pool(processes) as pool, open(checkpoint_path, 'a') as checkpoint:
+            for count, (key, row) in enumerate(pool.imap_unordered(run_configuration, tasks), 1):
+                done[key] = row
+                checkpoint.write(json.dumps({'key': key, 'row': row}) + '\n')
+                checkpoint.flush()
+                os.fsync(checkpoint.fileno())
+                print(f"[{count}/{len(tasks)}] {key}: score p50 {row['score_p50']}, moves p50 {row['moves_p50']}")
+
+    # Rows of other sweeps run into the same directory go after this one's
+    keys = [get_config_key(config, games) for config in configurations]
+    sweep_keys = set(keys)
+    keys += [key for key in done if key not in sweep_keys]
+    rows = [done[key] for key in keys]
+    save_results(os.path.join(output_dir, RESULTS_NAME), rows)
+    return rows
+
+if __name__ == '__main__':
+    # Run the default sweep: python -m logic.sweep [output dir] [games per configuration]
+    if not is_available():
+        raise SystemExit("NumPy is required to run the sweep")
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_GAMES
+    rows = run_sweep(output_dir=output_dir, games=games)
+    print(f"Results of {len(rows)} configurations saved to {os.path.join(output_dir or get_sweep_dir(), RESULTS_NAME)}")
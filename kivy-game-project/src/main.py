@@ -2,7 +2,9 @@ from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager
 from kivy.core.window import Window
 from kivy.uix.floatlayout import FloatLayout
-from kivy.uix.image import Image
+from kivy.uix.image import Image, AsyncImage
+from kivy.graphics.texture import Texture
+from kivy.animation import Animation
 from kivy.graphics import Color, Rectangle  # Add missing import
 from kivy import Config
 from kivy.clock import Clock
@@ -19,12 +21,23 @@ Config.set('graphics', 'frame_interval', '1')  # Force frame interval to 1 for m
 Config.set('kivy', 'show_fps', '1')
 
 # Import settings manager
-from utils.settings_manager import load_settings, save_settings
+from utils.settings_manager import load_settings, save_settings, get_settings_dir
 from utils.music_manager import MusicManager
+from utils.deck_preloader import DeckPreloader
+from utils.texture_manager import texture_manager, evict_image, texture_bytes, BACKGROUND
+from utils.texture_atlas import PILImage
+from utils.asset_manifest import get_manifest
+from utils.asset_fs import get_asset_fs
+from utils.pcm_bank import pcm_bank
+from utils.audio_mixer import audio_mixer
+from utils.latency_monitor import latency_monitor, get_report_path
+from utils.replay_player import play_replay
+from logic.replay import replay_recorder, get_replay_dir, EVENT_PAUSE
 
 # Import path utilities
 import os
-from pathlib import Path
+import sys
+import threading
 
 # Import screens
 from screens.main_menu import MainMenu
@@ -44,21 +57,10 @@ from screens.match_screen import MatchScreen
 from screens.esc_submenu import EscSubmenu
 # Removed elegant menu import
 
-def find_project_root():
-    """Find the project root directory by looking for known directories"""
-    # Start with the directory of this file and go up until we find the project root
-    current_dir = Path(__file__).resolve().parent.parent.parent
-    
-    # Check if we're at the project root
-    if (current_dir / "Items_Jogo").exists():
-        return str(current_dir)
-    if (current_dir.parent / "Items_Jogo").exists():
-        return str(current_dir.parent)
-    
-    # Fallback to a hardcoded path but with the correct username from the file path
-    file_path = Path(__file__).resolve()
-    username = file_path.parts[2]  # Extract username from path
-    return os.path.join('C:', os.sep, 'Users', username, 'Documents', 'GitHub', 'IPC_24-25')
+# The background is decoded again once the window stops being resized for this long
+BACKGROUND_RESIZE_DELAY = 0.5
+# ... and only if a side changed by more than this fraction of the decoded size
+BACKGROUND_RESIZE_STEP = 0.2
 
 class BackgroundFloatLayout(FloatLayout):
     screen_manager = ObjectProperty(None)  # Add a property to reference the ScreenManager
@@ -66,52 +68,151 @@ class BackgroundFloatLayout(FloatLayout):
     def __init__(self, **kwargs):
         super(BackgroundFloatLayout, self).__init__(**kwargs)
         self.bg_image = None  # Cache the background image
+        self.rect = None
+        self.decode_size = None  # Window size the background was last decoded for
+        self.decode_generation = 0  # Decodes started before a newer one are dropped
+        self.resize_event = None
         self.setup_background()
+        # The window is maximized or made fullscreen after build(), and can be resized later
+        Window.bind(on_resize=self._on_window_resize)
 
     def setup_background(self):
+        # Solid colour until the image is decoded, so the first frame doesn't wait for it
+        self._set_solid_color_background()
+        if self.bg_image:
+            return
+        self._start_background_decode()
+
+    def _start_background_decode(self):
+        # Decode and downscale the image on a worker thread
+        self.decode_size = tuple(Window.size)
+        self.decode_generation += 1
+        worker = threading.Thread(
+            target=self._load_background_worker,
+            args=(self.decode_size, self.decode_generation),
+            daemon=True
+        )
+        worker.start()
+
+    def _on_window_resize(self, window, width, height):
+        # Wait for the resize to settle, a drag sends an event every frame
+        if self.resize_event:
+            self.resize_event.cancel()
+        self.resize_event = Clock.schedule_once(self._redecode_background, BACKGROUND_RESIZE_DELAY)
+
+    def _redecode_background(self, dt):
+        self.resize_event = None
+        # Without Pillow Kivy already decoded the image at full size
+        if PILImage is None or self.decode_size is None:
+            return
+        old_width, old_height = self.decode_size
+        width, height = Window.size
+        if (abs(width - old_width) <= BACKGROUND_RESIZE_STEP * old_width and
+                abs(height - old_height) <= BACKGROUND_RESIZE_STEP * old_height):
+            return
+        print(f"Window resized to {width}x{height}, decoding the background again")
+        self._start_background_decode()
+
+    def _find_background_file(self):
+        # The asset manifest already lists the background images
+        backgrounds = get_manifest().get_backgrounds()
+        print(f"Available background images: {[os.path.basename(f) for f in backgrounds]}")
+        
+        for bg_file in backgrounds:
+            if os.path.basename(bg_file) == 'fundo.jpg':
+                return bg_file
+        
+        # Use the first image file found
+        if backgrounds:
+            print(f"Using alternative background file: {backgrounds[0]}")
+            return backgrounds[0]
+        return None
+
+    def _load_background_worker(self, window_size, generation):
         try:
-            # Get project root and check for background image
-            project_root = find_project_root()
-            fundo_dir = os.path.join(project_root, "Items_Jogo", "fundo")
-            print(f"Looking for background images in: {fundo_dir}")
+            bg_file = self._find_background_file()
+            if not bg_file:
+                return
             
-            if os.path.exists(fundo_dir):
-                fundo_files = os.listdir(fundo_dir)
-                print(f"Available files in fundo directory: {fundo_files}")
-                
-                if 'fundo.jpg' in fundo_files:
-                    bg_file = os.path.join(fundo_dir, 'fundo.jpg')
-                elif len(fundo_files) > 0 and any(f.endswith(('.jpg','.png','.jpeg')) for f in fundo_files):
-                    # Use the first image file found
-                    image_files = [f for f in fundo_files if f.endswith(('.jpg','.png','.jpeg'))]
-                    bg_file = os.path.join(fundo_dir, image_files[0])
-                    print(f"Using alternative background file: {bg_file}")
-                else:
-                    self._set_solid_color_background()
-                    return
-            else:
-                print(f"Background directory does not exist: {fundo_dir}")
-                self._set_solid_color_background()
+            if PILImage is None:
+                # Without Pillow let Kivy's async loader decode it at full size
+                real_path = get_asset_fs().get_real_path(bg_file)
+                Clock.schedule_once(lambda dt: self._show_background(real_path, None, generation))
                 return
             
-            if not self.bg_image:
-                print(f"Loading background image: {bg_file}")
-                self.bg_image = Image(
-                    source=bg_file,
-                    allow_stretch=True,
-                    keep_ratio=False,
-                    size_hint=(1, 1),
-                    pos_hint={'center_x': 0.5, 'center_y': 0.5}
-                )
-                self.add_widget(self.bg_image)
+            print(f"Loading background image: {bg_file}")
+            with PILImage.open(get_asset_fs().open(bg_file)) as img:
+                img = img.convert('RGBA')
+                # The image is stretched over the window, no need for more pixels than that
+                width = max(1, min(img.width, int(window_size[0])))
+                height = max(1, min(img.height, int(window_size[1])))
+                if (width, height) != img.size:
+                    img = img.resize((width, height), PILImage.BILINEAR)
+                img = img.transpose(PILImage.FLIP_TOP_BOTTOM)  # OpenGL row order
+                pixels = img.tobytes()
+            
+            # Textures can only be created on the UI thread
+            Clock.schedule_once(lambda dt: self._show_background(bg_file, (width, height, pixels), generation))
         except Exception as e:
             print(f"Error loading background image: {e}")
-            self._set_solid_color_background()
+
+    def _show_background(self, bg_file, decoded, generation):
+        if generation != self.decode_generation:
+            return  # The window was resized while decoding, a newer decode is on its way
+        if self.bg_image:
+            if decoded is not None:
+                self._replace_background_texture(bg_file, decoded)
+            return
+        
+        image_args = dict(
+            allow_stretch=True,
+            keep_ratio=False,
+            size_hint=(1, 1),
+            pos_hint={'center_x': 0.5, 'center_y': 0.5},
+            opacity=0
+        )
+        if decoded is None:
+            self.bg_image = AsyncImage(source=bg_file, **image_args)
+            self.bg_image.bind(on_load=lambda instance: self._fade_in_background(bg_file))
+        else:
+            self.bg_image = Image(texture=self._create_background_texture(decoded), **image_args)
+        
+        # Behind the screen manager
+        self.add_widget(self.bg_image, index=len(self.children))
+        if decoded is not None:
+            self._fade_in_background(bg_file)
+
+    def _create_background_texture(self, decoded):
+        width, height, pixels = decoded
+        texture = Texture.create(size=(width, height), colorfmt='rgba')
+        texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+        return texture
+
+    def _replace_background_texture(self, bg_file, decoded):
+        # Same image at the new window size, shown without fading it in again
+        self.bg_image.texture = self._create_background_texture(decoded)
+        texture_manager.register(bg_file, BACKGROUND, texture_bytes(self.bg_image.texture), evict_image)
+        texture_manager.pin(bg_file)
+
+    def _fade_in_background(self, bg_file):
+        Animation(opacity=1, duration=0.4).start(self.bg_image)
+        
+        # Count the background in the texture budget, it's always on screen
+        if self.bg_image.texture:
+            texture_manager.register(bg_file, BACKGROUND, texture_bytes(self.bg_image.texture), evict_image)
+            texture_manager.pin(bg_file)
 
     def _set_solid_color_background(self):
+        if self.rect:
+            return
         with self.canvas.before:
             Color(0.1, 0.1, 0.3, 1)  # Dark blue background
             self.rect = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._update_solid_color_background, size=self._update_solid_color_background)
+
+    def _update_solid_color_background(self, *args):
+        self.rect.pos = self.pos
+        self.rect.size = self.size
 
 class MyScreenManager(ScreenManager):
     pass
@@ -122,8 +223,25 @@ class MemoryGameApp(App):
         # Load settings from file
         self.settings = load_settings()
         
+        # Read the asset manifest once, the screens look every asset up in it
+        get_manifest()
+        # Open the asset pack (if the game ships one) before anything is loaded
+        get_asset_fs()
+        
         # Initialize the music manager
         self.music_manager = MusicManager()
+        # Sound effects duck the music
+        audio_mixer.attach_music(self.music_manager)
+        
+        # Loads the chosen deck in the background during theme/difficulty selection
+        self.deck_preloader = DeckPreloader()
+        
+        # Decode the audio assistance sounds up front so flipping a card plays them instantly
+        if self.settings.get('audio_assist', False):
+            pcm_bank.load_async()
+        
+        # GPU memory the decks, backgrounds and icons may use before old ones are evicted
+        texture_manager.set_budget(self.settings.get('texture_budget_mb', 256) * 1024 * 1024)
         
         # Apply window settings based on fullscreen preference but ensure maximum resolution
         if self.settings.get('fullscreen', False):
@@ -136,6 +254,17 @@ class MemoryGameApp(App):
 
         # Bind ESC key to open the ESC submenu
         Window.bind(on_key_down=self.on_key_down)
+        
+        # Tap to pixel measurements are resolved when the next frame reaches the screen
+        if self.settings.get('latency_monitor', False):
+            latency_monitor.enabled = True
+            Window.bind(on_flip=latency_monitor.on_frame_flip)
+        
+        # Every game can be played again from its recording
+        if self.settings.get('record_replays', False):
+            replay_recorder.enabled = True
+            replay_recorder.replay_dir = get_replay_dir(get_settings_dir())
+        self.replay_request = None  # (replay file, speed) to play once the screens exist
 
     def on_key_down(self, window, key, *args):
         # Open the ESC submenu when ESC is pressed
@@ -144,6 +273,10 @@ class MemoryGameApp(App):
                 # Stop the timer before switching screens
                 game_screen = self.root.screen_manager.get_screen('game_screen')
                 game_screen.stop_timer()
+                replay_recorder.record(EVENT_PAUSE)
+                # The player takes over from a replay where it was stopped
+                if game_screen.replay_player:
+                    game_screen.replay_player.stop()
                 
                 self.root.screen_manager.current = 'esc_submenu'
                 return True  # Prevent default behavior
@@ -187,6 +320,10 @@ class MemoryGameApp(App):
         # Schedule applying text size to all screens once the app is fully loaded
         # This ensures all screens are created and ready
         Clock.schedule_once(lambda dt: self.apply_text_size_to_all_screens(), 0.5)
+        
+        if self.replay_request:
+            path, speed = self.replay_request
+            Clock.schedule_once(lambda dt: play_replay(self.root.screen_manager, path, speed), 0)
     
     def build(self):
         # Create a root layout that will contain the background and screen manager
@@ -245,8 +382,21 @@ class MemoryGameApp(App):
         
         # Stop music
         self.music_manager.stop()
+        audio_mixer.stop_all()
+        pcm_bank.close()
+        # Keep the recording of a game that was left unfinished
+        replay_recorder.save()
+        
+        if latency_monitor.enabled:
+            latency_monitor.print_report()
+            latency_monitor.save_report(get_report_path(get_settings_dir()))
         
         return True
 
 if __name__ == '__main__':
-    MemoryGameApp().run()
\ No newline at end of file
+    app = MemoryGameApp()
+    # Watch a recorded game: python main.py -- --replay <file> [speed]
+    # (Kivy leaves the arguments after -- in sys.argv)
+    if len(sys.argv) > 2 and sys.argv[1] == '--replay':
+        app.replay_request = (sys.argv[2], float(sys.argv[3]) if len(sys.argv) > 3 else 1.0)
+    app.run()
\ No newline at end of file
@@ -5,10 +5,13 @@ from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.switch import Switch
 from kivy.uix.slider import Slider
+from kivy.uix.spinner import Spinner
 from kivy.app import App
 from kivy.metrics import dp
 from kivy.graphics import Color, Rectangle
 from utils.settings_manager import save_settings
+from utils.color_filters import COLORBLIND_FILTERS
+from utils.pcm_bank import pcm_bank
 
 class BackgroundLabel(Label):
     """Label class without background - we'll use the container background instead"""
@@ -69,11 +72,19 @@ class AdaptationsScreen(Screen):
         # Colorblind mode with explanation
         option_layout1 = self.create_option_layout(
             "Colorblind Mode", 
-            "Cards will be displayed in black and white to help colorblind players",
+            "Cards will be displayed with adapted colours to help colorblind players",
             self.colorblind_switch_factory
         )
         content_layout.add_widget(option_layout1)
         
+        # Colorblind filter with explanation
+        option_layout_filter = self.create_option_layout(
+            "Colorblind Filter", 
+            "Black and white, or colours adapted for protanopia, deuteranopia or tritanopia",
+            self.colorblind_filter_spinner_factory
+        )
+        content_layout.add_widget(option_layout_filter)
+        
         # Audio assistance with explanation
         option_layout2 = self.create_option_layout(
             "Audio Assistance", 
@@ -98,6 +109,14 @@ class AdaptationsScreen(Screen):
         )
         content_layout.add_widget(option_layout_easy_mode)
         
+        # Hints with explanation
+        option_layout_hints = self.create_option_layout(
+            "Hints", 
+            "Shows a button that highlights the next card to flip",
+            self.hints_switch_factory
+        )
+        content_layout.add_widget(option_layout_hints)
+        
         # Text size scaling with explanation
         option_layout_text_size_scaling = self.create_option_layout(
             "Text Size Scaling", 
@@ -184,6 +203,11 @@ class AdaptationsScreen(Screen):
         self.colorblind_switch.bind(active=self.on_colorblind_toggle)
         return self.colorblind_switch
     
+    def colorblind_filter_spinner_factory(self):
+        self.colorblind_filter_spinner = Spinner(text='grayscale', values=COLORBLIND_FILTERS)
+        self.colorblind_filter_spinner.bind(text=self.on_colorblind_filter_change)
+        return self.colorblind_filter_spinner
+    
     def audio_assist_switch_factory(self):
         self.audio_assist_switch = Switch(active=False)
         self.audio_assist_switch.bind(active=self.on_audio_assist_toggle)
@@ -199,6 +223,11 @@ class AdaptationsScreen(Screen):
         self.easy_mode_switch.bind(active=self.on_easy_mode_toggle)
         return self.easy_mode_switch
     
+    def hints_switch_factory(self):
+        self.hints_switch = Switch(active=False)
+        self.hints_switch.bind(active=self.on_hints_toggle)
+        return self.hints_switch
+    
     def text_size_scaling_slider_factory(self):
         self.text_size_scaling_slider = Slider(min=0.5, max=2.0, value=1.0)
         self.text_size_scaling_slider.bind(value=self.on_text_size_scaling_change)
@@ -220,9 +249,11 @@ class AdaptationsScreen(Screen):
         app = App.get_running_app()
         if hasattr(app, 'settings'):
             self.colorblind_switch.active = app.settings.get('colorblind_mode', False)
+            self.colorblind_filter_spinner.text = app.settings.get('colorblind_filter', 'grayscale')
             self.audio_assist_switch.active = app.settings.get('audio_assist', False)
             self.visual_feedback_switch.active = app.settings.get('visual_feedback', True)
             self.easy_mode_switch.active = app.settings.get('easy_mode', False)
+            self.hints_switch.active = app.settings.get('hints', False)
             self.text_size_scaling_slider.value = app.settings.get('text_size_factor', 1.0)
     
     def on_colorblind_toggle(self, instance, value):
@@ -232,11 +263,20 @@ class AdaptationsScreen(Screen):
             save_settings(app.settings)
         print(f"Colorblind mode: {'on' if value else 'off'}")
     
+    def on_colorblind_filter_change(self, instance, value):
+        app = App.get_running_app()
+        if hasattr(app, 'settings'):
+            app.settings['colorblind_filter'] = value
+            save_settings(app.settings)
+        print(f"Colorblind filter: {value}")
+    
     def on_audio_assist_toggle(self, instance, value):
         app = App.get_running_app()
         if hasattr(app, 'settings'):
             app.settings['audio_assist'] = value
             save_settings(app.settings)
+        if value:
+            pcm_bank.load_async()
         print(f"Audio assistance: {'on' if value else 'off'}")
     
     def on_visual_feedback_toggle(self, instance, value):
@@ -253,6 +293,13 @@ class AdaptationsScreen(Screen):
             save_settings(app.settings)
         print(f"Easy mode: {'on' if value else 'off'}")
     
+    def on_hints_toggle(self, instance, value):
+        app = App.get_running_app()
+        if hasattr(app, 'settings'):
+            app.settings['hints'] = value
+            save_settings(app.settings)
+        print(f"Hints: {'on' if value else 'off'}")
+    
     def on_text_size_scaling_change(self, instance, value):
         app = App.get_running_app()
         if hasattr(app, 'settings'):
@@ -267,9 +314,11 @@ class AdaptationsScreen(Screen):
             app.settings = {}
         
         app.settings['colorblind_mode'] = self.colorblind_switch.active
+        app.settings['colorblind_filter'] = self.colorblind_filter_spinner.text
         app.settings['audio_assist'] = self.audio_assist_switch.active
         app.settings['visual_feedback'] = self.visual_feedback_switch.active
         app.settings['easy_mode'] = self.easy_mode_switch.active
+        app.settings['hints'] = self.hints_switch.active
         app.settings['text_size_factor'] = self.text_size_scaling_slider.value
         
         # Save settings to file
@@ -0,0 +1,271 @@
+import math
+import time
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.widget import Widget
+from kivy.graphics import InstructionGroup, Color, Rectangle
+from kivy.core.image import Image as CoreImage
+
+# Colour a card is drawn with when nothing highlights it
+PLAIN_COLOR = (1, 1, 1, 1)
+
+class BoardView(Widget):
+    """
+    Draws the cards of a board as textured rectangles in one instruction
+    group, instead of one Button per card.
+
+    Flipping a card only swaps the texture (an atlas region) of its
+    rectangle, and the view finds the card under a touch itself. Only the
+    cards inside the viewport have a rectangle: all of them on a regular
+    board, the visible ones when the view is the plane of a
+    CulledBoardView. Rectangles of cards that leave the viewport are kept
+    in a pool and reused.
+
+    The game screen decides what a card shows: the view calls
+    screen.draw_card(index) when a card gets a rectangle and
+    screen.flip_card(index, tap_time) when a card is tapped.
+    """
+
+    def __init__(self, screen, spacing=10, padding=10, **kwargs):
+        super(BoardView, self).__init__(**kwargs)
+        self.screen = screen
+        self.spacing = spacing
+        self.padding = padding
+
+        self.num_cards = 0
+        self.cols = 1
+        self.rows = 0
+        self.card_width = self.card_height = 0
+        self.viewport = None  # (left, bottom, width, height) in board coordinates, None for the whole board
+        self.visible_range = None
+
+        self.cards = InstructionGroup()
+        self.canvas.add(self.cards)
+        self.drawn = {}  # card index -> (Color, Rectangle)
+        self.pool = []  # (Color, Rectangle) not drawing any card
+        self.textures = {}  # source -> texture, for the sources of the current board
+
+        self.bind(pos=self.layout, size=self.layout)
+
+    def clear(self):
+        """Stop drawing the current board"""
+        self.cards.clear()
+        self.pool.extend(self.drawn.values())
+        self.drawn = {}
+        self.textures = {}
+        self.num_cards = 0
+        self.visible_range = None
+
+    def set_board(self, num_cards, cols, card_width, card_height):
+        """Show a new board, every card gets drawn again"""
+        self.clear()
+        self.num_cards = num_cards
+        self.set_grid(cols, card_width, card_height)
+
+    def set_grid(self, cols, card_width, card_height):
+        """Change the number of columns or the card size of the current board"""
+        self.cols = cols
+        self.rows = math.ceil(self.num_cards / cols)
+        self.card_width = card_width
+        self.card_height = card_height
+        self.width = cols * card_width + max(0, cols - 1) * self.spacing + 2 * self.padding
+        if self.size_hint_y is None:
+            self.height = self.rows * card_height + max(0, self.rows - 1) * self.spacing + 2 * self.padding
+        self.layout()
+
+    def set_viewport(self, left, bottom, width, height):
+        """Part of the board on screen, in board coordinates (0, 0 is the bottom left corner)"""
+        self.viewport = (left, bottom, width, height)
+        self.update_visible()
+
+    def clear_textures(self):
+        """Forget the textures of the previous sources (the deck changed resolution)"""
+        self.textures = {}
+
+    def layout(self, *args):
+        """Move the rectangles to the current position and card size"""
+        for index, (color, rect) in self.drawn.items():
+            rect.pos = self.get_card_pos(index)
+            rect.size = (self.card_width, self.card_height)
+        self.visible_range = None
+        self.update_visible()
+
+    def get_card_pos(self, index):
+        """Bottom left corner of a card (row 0 at the top)"""
+        row, col = divmod(index, self.cols)
+        return (self.x + self.padding + col * (self.card_width + self.spacing),
+                self.top - self.padding - (row + 1) * self.card_height - row * self.spacing)
+
+    def get_visible_range(self):
+        """(first col, last col, first row, last row) of the cards in the viewport"""
+        if self.viewport is None:
+            return 0, self.cols - 1, 0, self.rows - 1
+        left, bottom, width, height = self.viewport
+        step_x = self.card_width + self.spacing
+        step_y = self.card_height + self.spacing
+        # Rows are counted from the top of the board
+        top = self.height - bottom - height
+        first_col = max(0, int((left - self.padding) // step_x))
+        last_col = min(self.cols - 1, int((left + width - self.padding) // step_x))
+        first_row = max(0, int((top - self.padding) // step_y))
+        last_row = min(self.rows - 1, int((top + height - self.padding) // step_y))
+        return first_col, last_col, first_row, last_row
+
+    def update_visible(self, *args):
+        """Give rectangles to the cards that came into view, take them from the ones that left"""
+        if not self.num_cards or not self.card_width:
+            return
+        visible_range = self.get_visible_range()
+        if visible_range == self.visible_range:
+            return
+        self.visible_range = visible_range
+        first_col, last_col, first_row, last_row = visible_range
+
+        for index in [index for index in self.drawn
+                      if not (first_col <= index % self.cols <= last_col and first_row <= index // self.cols <= last_row)]:
+            self._release(index)
+
+        for row in range(first_row, last_row + 1):
+            for index in range(row * self.cols + first_col, min(row * self.cols + last_col + 1, self.num_cards)):
+                if index not in self.drawn:
+                    self._acquire(index)
+
+    def _acquire(self, index):
+        color, rect = self.pool.pop() if self.pool else (Color(*PLAIN_COLOR), Rectangle())
+        rect.pos = self.get_card_pos(index)
+        rect.size = (self.card_width, self.card_height)
+        self.cards.add(color)
+        self.cards.add(rect)
+        self.drawn[index] = (color, rect)
+        self.screen.draw_card(index)
+
+    def _release(self, index):
+        color, rect = self.drawn.pop(index)
+        self.cards.remove(color)
+        self.cards.remove(rect)
+        self.pool.append((color, rect))
+
+    def is_drawn(self, index):
+        return index in self.drawn
+
+    def draw_card(self, index, source, rgba=PLAIN_COLOR):
+        """Show source on a card, tinted with rgba (nothing to do if the card is out of view)"""
+        entry = self.drawn.get(index)
+        if entry is None:
+            return
+        color, rect = entry
+        color.rgba = rgba
+        rect.texture = self.get_texture(source)
+
+    def get_texture(self, source):
+        """Texture of a file or atlas:// source, loaded once per board"""
+        texture = self.textures.get(source)
+        if texture is None:
+            try:
+                texture = CoreImage(source).texture
+            except Exception as e:
+                print(f"Error loading card texture {source}: {e}")
+            self.textures[source] = texture
+        return texture
+
+    def get_card_at(self, x, y):
+        """
+        Index of the card under a point, -1 if there is none (gap between
+        cards, outside the board or a card without a rectangle).
+
+        Computed from the grid the cards are laid out on, so a touch costs
+        the same on a 4x4 board and on a 40x40 one.
+        """
+        step_x = self.card_width + self.spacing
+        step_y = self.card_height + self.spacing
+        if not self.num_cards or step_x <= 0 or step_y <= 0:
+            return -1
+        # Offsets from the top left corner of the first card (rows go down)
+        offset_x = x - self.x - self.padding
+        offset_y = self.top - self.padding - y
+        if offset_x < 0 or offset_y < 0:
+            return -1
+        col, inside_x = divmod(offset_x, step_x)
+        row, inside_y = divmod(offset_y, step_y)
+        if inside_x > self.card_width or inside_y > self.card_height or col >= self.cols:
+            return -1
+        index = int(row) * self.cols + int(col)
+        return index if index in self.drawn else -1
+
+    def on_touch_down(self, touch):
+        index = self.get_card_at(*touch.pos)
+        if index < 0:
+            return False
+        # The card is flipped if the touch is released over it. Every touch keeps
+        # its own card, so several fingers can play at once
+        touch.grab(self)
+        touch.ud[self] = index
+        return True
+
+    def on_touch_up(self, touch):
+        if touch.grab_current is not self:
+            return super(BoardView, self).on_touch_up(touch)
+        touch.ungrab(self)
+        index = self.get_card_at(*touch.pos)
+        if index >= 0 and index == touch.ud.get(self):
+            tap_time = getattr(touch, 'time_update', 0) or time.time()
+            self.screen.flip_card(index, tap_time)
+        return True
+
+# Zoom limits of a huge board, relative to its default card size
+MIN_ZOOM = 0.5
+MAX_ZOOM = 3.0
+ZOOM_STEP = 1.25
+
+class CulledBoardView(ScrollView):
+    """
+    A board that is bigger than the screen: it scrolls and zooms, and its
+    BoardView (the plane) only draws the cards inside the viewport, so the
+    cost of a frame depends on the size of the screen, not of the board.
+    """
+
+    def __init__(self, screen, spacing=10, **kwargs):
+        super(CulledBoardView, self).__init__(do_scroll_x=True, do_scroll_y=True, **kwargs)
+        self.plane = BoardView(screen, spacing=spacing, padding=spacing, size_hint=(None, None))
+        self.add_widget(self.plane)
+        self.base_width = self.base_height = 0
+        self.zoom = 1.0
+
+        self.bind(scroll_x=self.update_visible, scroll_y=self.update_visible, size=self.update_visible)
+
+    @property
+    def card_width(self):
+        return self.base_width * self.zoom
+
+    @property
+    def card_height(self):
+        return self.base_height * self.zoom
+
+    def set_board(self, num_cards, cols, card_width, card_height):
+        """Show a new board, card_width x card_height is the size at zoom 1"""
+        self.base_width = card_width
+        self.base_height = card_height
+        self.zoom = 1.0
+        self.scroll_x = 0
+        self.scroll_y = 1
+        self.plane.set_board(num_cards, cols, card_width, card_height)
+        self.update_visible()
+
+    def set_card_size(self, card_width, card_height):
+        """Change the size of the cards at zoom 1 (the window was resized), keeping the zoom"""
+        self.base_width = card_width
+        self.base_height = card_height
+        self.layout()
+
+    def set_zoom(self, zoom):
+        self.zoom = min(MAX_ZOOM, max(MIN_ZOOM, zoom))
+        self.layout()
+
+    def layout(self):
+        self.plane.set_grid(self.plane.cols, self.card_width, self.card_height)
+        self.update_visible()
+
+    def update_visible(self, *args):
+        # Part of the plane inside the viewport (ScrollView scrolls the plane under it)
+        left = self.scroll_x * max(0, self.plane.width - self.width)
+        bottom = self.scroll_y * max(0, self.plane.height - self.height)
+        self.plane.set_viewport(left, bottom, self.width, self.height)
@@ -4,6 +4,8 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.metrics import dp
 from kivy.app import App
+from logic.game_logic import DIFFICULTIES, HUGE_BOARDS
+from utils import synthetic_deck
 
 class DifficultySelectionScreen(Screen):
     def __init__(self, **kwargs):
@@ -42,10 +44,7 @@ class DifficultySelectionScreen(Screen):
         self.section_labels.append(self.easy_label)
         
         # Botões Fácil
-        easy_buttons = [
-            ("4x4", 16, (4, 4)),
-            ("5x4", 20, (5, 4))
-        ]
+        easy_buttons = DIFFICULTIES["Easy"]
         for text, num_cards, grid_size in easy_buttons:
             btn = Button(
                 text=text,
@@ -71,10 +70,7 @@ class DifficultySelectionScreen(Screen):
         self.section_labels.append(self.medium_label)
         
         # Botões Médio
-        medium_buttons = [
-            ("6x4", 24, (6, 4)),
-            ("6x5", 30, (6, 5))
-        ]
+        medium_buttons = DIFFICULTIES["Medium"]
         for text, num_cards, grid_size in medium_buttons:
             btn = Button(
                 text=text,
@@ -100,10 +96,7 @@ class DifficultySelectionScreen(Screen):
         self.section_labels.append(self.hard_label)
         
         # Botões Difícil
-        hard_buttons = [
-            ("6x6", 36, (6, 6)),
-            ("6x7", 42, (6, 7))
-        ]
+        hard_buttons = DIFFICULTIES["Hard"]
         for text, num_cards, grid_size in hard_buttons:
             btn = Button(
                 text=text,
@@ -116,10 +109,38 @@ class DifficultySelectionScreen(Screen):
             hard_section.add_widget(btn)
             self.all_buttons.append(btn)
         
+        # Seção Enorme (só com o baralho sintético, nenhum tema tem cartas que cheguem)
+        huge_section = None
+        if synthetic_deck.is_available():
+            huge_section = BoxLayout(orientation='vertical', spacing=dp(10))
+            self.huge_label = Label(
+                text="Huge",
+                font_size=dp(40),
+                size_hint=(1, 0.2),
+                halign='center',
+                valign='middle'
+            )
+            huge_section.add_widget(self.huge_label)
+            self.section_labels.append(self.huge_label)
+            
+            for text, num_cards, grid_size in HUGE_BOARDS:
+                btn = Button(
+                    text=text,
+                    size_hint=(1, 0.4),
+                    background_color=(0, 0.5, 0, 1),
+                    font_size=dp(32)
+                )
+                btn.bind(on_release=lambda instance, nc=num_cards, gs=grid_size: 
+                        self.select_difficulty(instance, nc, gs))
+                huge_section.add_widget(btn)
+                self.all_buttons.append(btn)
+        
         # Adiciona as seções ao layout horizontal
         sections_layout.add_widget(easy_section)
         sections_layout.add_widget(medium_section)
         sections_layout.add_widget(hard_section)
+        if huge_section:
+            sections_layout.add_widget(huge_section)
         
         self.main_layout.add_widget(sections_layout)
         
@@ -158,8 +179,9 @@ class DifficultySelectionScreen(Screen):
     def select_difficulty(self, instance, num_cards, grid_size):
         theme = self.manager.get_screen('theme_selection').selected_theme
         game_screen = self.manager.get_screen('game_screen')
-        game_screen.apply_theme(theme, num_cards)
+        # Set the grid size first so the card size (and deck resolution) is known when building the board
         game_screen.set_grid_size(grid_size)
+        game_screen.apply_theme(theme, num_cards)
         self.manager.current = 'game_screen'
     
     def go_back(self, instance):
@@ -2,6 +2,7 @@ from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
+from logic.replay import replay_recorder, EVENT_RESUME
 
 class EscSubmenu(Screen):
     def __init__(self, **kwargs):
@@ -57,6 +58,7 @@ class EscSubmenu(Screen):
         self.manager.current = 'game_screen'
         game_screen = self.manager.get_screen('game_screen')
         game_screen.start_timer()  # Restart the timer
+        replay_recorder.record(EVENT_RESUME)
 
     def show_options(self, instance):
         self.manager.current = 'options_screen'
@@ -2,21 +2,29 @@ from kivy.uix.screenmanager import Screen
 from kivy.uix.button import Button
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
-from kivy.uix.gridlayout import GridLayout
 from kivy.clock import Clock
 from kivy.app import App
 from kivy.core.window import Window
-from kivy.uix.image import Image
-from kivy.core.audio import SoundLoader
-from kivy.properties import NumericProperty, StringProperty
-from kivy.uix.widget import Widget
+from kivy.properties import StringProperty
 import os
 import math
-from logic.game_logic import start_game, check_win_condition  # Fix the import
+from logic.game_logic import start_game, check_win_condition, get_display_theme, get_board_theme, is_huge_board, MATCH_CHECK_DELAY, MISMATCH_DELAY, REVEAL_TIME, HINT_TIME
+from logic.hints import HintEngine
+from logic.replay import replay_recorder, EVENT_FLIP, EVENT_CHECK, EVENT_REVEAL, EVENT_HIDE
 from utils.stats_manager import update_stats
+from utils.paths import get_items_dir
+from utils.sound_bank import sound_bank
+from utils.audio_mixer import audio_mixer
+from utils.latency_monitor import latency_monitor, TAP_TO_FLIP, TAP_TO_PIXEL, TAP_TO_SOUND
+from utils.settings_manager import get_colorblind_filter
+from utils import synthetic_deck
+from utils.texture_atlas import ensure_deck_atlas, get_card_source, choose_tier
+from utils.deck_preloader import install_atlas, get_atlas_key
+from utils.texture_manager import texture_manager, DECK, ICON
 from pathlib import Path
 from kivy.metrics import dp
 from kivy.uix.floatlayout import FloatLayout
+from screens.board_view import BoardView, CulledBoardView, ZOOM_STEP, PLAIN_COLOR
 
 # Load the .kv file
 from kivy.lang import Builder
@@ -24,36 +32,36 @@ kv_file = Path(__file__).parent / 'game_screen.kv'
 # Removed the line that loads the KV file since it is missing and not required for the current functionality.
 # Builder.load_file(str(kv_file))
 
-def find_project_root():
-    """Find the project root directory by looking for known directories"""
-    # Start with the directory of this file and go up until we find the project root
-    current_dir = Path(__file__).resolve().parent.parent.parent.parent
-    
-    # Check if we're at the project root
-    if (current_dir / "Items_Jogo").exists():
-        return str(current_dir)
-    if (current_dir.parent / "Items_Jogo").exists():
-        return str(current_dir.parent)
-    
-    # Fallback to a hardcoded path but with the correct username from the file path
-    file_path = Path(__file__).resolve()
-    username = file_path.parts[2]  # Extract username from path
-    return os.path.join('C:', os.sep, 'Users', username, 'Documents', 'GitHub', 'IPC')
+def get_card_backs_dir():
+    """Returns the directory with the card backs"""
+    return os.path.join(get_items_dir(), "Parte_Traseira_Cartas")
+
+def get_card_backs_atlas():
+    """Returns the atlas with the card backs (None if atlases can't be used)"""
+    # Card backs are small, keep them at their original size
+    return ensure_deck_atlas(get_card_backs_dir(), cell_width=None)
 
 def get_card_back_path():
-    """Returns the path to the blue card back"""
-    project_root = find_project_root()
-    return os.path.join(project_root, "Items_Jogo", "Parte_Traseira_Cartas", "cardBack_blue3.png")
+    """Returns the source of the blue card back (inside the card backs atlas if possible)"""
+    return get_card_source(get_card_backs_atlas(), os.path.join(get_card_backs_dir(), "cardBack_blue3.png"))
+
+def choose_card_tier(deck_dir, card_width):
+    """Atlas tier of a deck for cards drawn card_width wide, never above the size its images are drawn at"""
+    tier = choose_tier(card_width)
+    if synthetic_deck.is_synthetic_deck(deck_dir):
+        # Upscaling the synthetic faces only costs time and texture memory
+        tier = min(tier, choose_tier(synthetic_deck.FACE_WIDTH))
+    return tier
 
 def get_wood_texture_path():
     """Returns the path to the wood texture"""
-    project_root = find_project_root()
-    return os.path.join(project_root, "Items_Jogo", "Icons", "wood_sign.png")
+    return os.path.join(get_items_dir(), "Icons", "wood_sign.png")
 
-class CardButton(Button):
-    card_width = NumericProperty(0)
-    card_height = NumericProperty(0)
-    card_back_path = StringProperty('')
+# Cards of a huge board never get smaller than this, the board scrolls instead
+HUGE_CARD_MIN_WIDTH = dp(64)
+HINT_COLOR = (1, 1, 0.4, 1)
+# A flipped card of a lazy board whose face is still loading: its back, greyed
+LOADING_COLOR = (0.6, 0.6, 0.6, 1)
 
 class WoodLabel(BoxLayout):
     text = StringProperty('')
@@ -106,15 +114,17 @@ class GameScreen(Screen):
         self.hud_layout.add_widget(self.timer_label)
         self.main_layout.add_widget(self.hud_layout)
 
-        # Game grid - Adjusted size_hint_y
-        self.game_grid = GridLayout(
-            cols=4, 
+        # Game board - every card is drawn on the canvas of this one widget
+        self.board_view = BoardView(
+            self,
             spacing=10, 
             padding=10, 
             size_hint=(None, 0.8),  # Adjusted size_hint_y slightly down
             pos_hint={'center_x': 0.5} 
         )
-        self.main_layout.add_widget(self.game_grid)
+        self.main_layout.add_widget(self.board_view)
+        # Used instead for huge boards, it scrolls and only draws the cards on screen
+        self.huge_view = CulledBoardView(self, spacing=10, size_hint=(1, 0.8))
         
         # Buttons - Adjusted size_hint_y
         self.button_layout = BoxLayout(
@@ -135,6 +145,33 @@ class GameScreen(Screen):
         )
         self.reveal_button.bind(on_release=self.reveal_cards)
         self.button_layout.add_widget(self.reveal_button)
+        self.hint_button = Button(
+            text="Hint", 
+            size_hint=(None, 0.8),
+            width=dp(160),
+            pos_hint={'center_x': 0.5},
+            background_color=(0.9, 0.6, 0, 1), # Orange
+            color=(1, 1, 1, 1), 
+            font_size='18sp', 
+            opacity=0, 
+            disabled=True
+        )
+        self.hint_button.bind(on_release=self.show_hint)
+        self.button_layout.add_widget(self.hint_button)
+        # Zoom buttons, only shown on huge boards
+        self.zoom_buttons = []
+        for text, factor in (("-", 1 / ZOOM_STEP), ("+", ZOOM_STEP)):
+            zoom_button = Button(
+                text=text,
+                size_hint=(None, 0.8),
+                width=dp(60),
+                font_size='24sp',
+                opacity=0,
+                disabled=True
+            )
+            zoom_button.bind(on_release=lambda instance, factor=factor: self.zoom_board(factor))
+            self.button_layout.add_widget(zoom_button)
+            self.zoom_buttons.append(zoom_button)
         # Removed the Spacer widget
         self.main_layout.add_widget(self.button_layout)
         
@@ -142,23 +179,34 @@ class GameScreen(Screen):
         self.add_widget(self.main_layout)
         
         # Initialization of variables
-        self.cards = []
-        self.selected_cards = []
+        self.board = None  # Board engine (logic.game_logic.Board), the screen only draws it
+        self.huge_board = False
+        self.replay_player = None  # ReplayPlayer driving the board instead of the player's taps
+        self.hints = None  # HintEngine following what the player has seen of the board
+        self.hinted_cards = []
+        self.hint_event = None
         self.is_checking = False
+        # Clock events scheduled for the current board, cancelled when it's replaced
+        self.check_event = None
+        self.mismatch_event = None
+        self.hide_event = None
         self.current_theme = None
         self.current_difficulty = None
-        self.multiplier = 1
-        self.consecutive_matches = 0
         self.easy_mode_used = False
-        self.sounds = {}
+        self.revealed_cards = []  # Cards turned by the reveal button, hidden again by hide_cards
+        self.sounds = []  # Loaded sound of every pair, by pair id
+        self.sound_paths = []  # Sounds this board holds in the sound bank
         self.card_back_path = get_card_back_path()
+        self.card_tier = None
+        self.faces_loading = False  # The preloader is loading the faces of a lazy board
+        self.card_variant = None
+        self.pinned_atlases = []
         
         # Timer configuration
         self.elapsed_time = 0
         self.timer_event = None
         
-        # Score configuration
-        self.score = 0
+        # Score configuration (the score itself is kept by the board)
         self.lives = 0  # No longer used
         
         # Grid configuration
@@ -188,6 +236,7 @@ class GameScreen(Screen):
             self.timer_display = app.settings.get('timer_display', True)
             self.casual_mode = app.settings.get('casual_mode', False)  # Default to False
             easy_mode_enabled = app.settings.get('easy_mode', False)
+            hints_enabled = app.settings.get('hints', False)
         else:
             self.accessibility_mode = True
             self.colorblind_mode = False
@@ -196,6 +245,7 @@ class GameScreen(Screen):
             self.timer_display = True
             self.casual_mode = False
             easy_mode_enabled = False
+            hints_enabled = False
         
         # Update HUD visibility
         self.score_label.opacity = 1 if self.score_display else 0
@@ -211,61 +261,180 @@ class GameScreen(Screen):
         else:
             self.reveal_button.opacity = 0
             self.reveal_button.disabled = True
-    
-    def apply_theme(self, theme, num_cards):
-        # Clear the current grid
-        self.game_grid.clear_widgets()
         
-        # Check for colorblind mode and modify theme path if needed
+        self.hint_button.opacity = 1 if hints_enabled else 0
+        self.hint_button.disabled = not hints_enabled
+    
+    def apply_theme(self, theme, num_cards, seed=None):
+        requested_theme = theme
+        # A check or hide scheduled on the previous board must not run on this one
+        self.cancel_board_events()
+        self.use_huge_view(is_huge_board(num_cards))
+        # Boards with more pairs than the deck has cards are played with the synthetic deck
+        theme = get_board_theme(theme, num_cards)
+        
+        # Check for colorblind mode and pick the colour variant of the deck
         app = App.get_running_app()
-        colorblind_enabled = hasattr(app, 'settings') and app.settings.get('colorblind_mode', False)
+        colorblind_filter = get_colorblind_filter(app.settings) if hasattr(app, 'settings') else None
         
-        # Store original theme for audio lookup
-        original_theme = theme
+        theme, variant = get_display_theme(theme, colorblind_filter)
+        if colorblind_filter:
+            print(f"Using colorblind deck: {theme} ({variant})")
         
-        if colorblind_enabled:
-            # Convert the original theme path to the black and white version
-            project_root = find_project_root()
-            
-            if "baralho_animais" in theme:
-                theme = os.path.join(project_root, "Items_Jogo", "baralho_animais_preto_e_branco")
-                print(f"Using black and white animal theme: {theme}")
-            elif "baralho_numeros" in theme:
-                theme = os.path.join(project_root, "Items_Jogo", "baralho_numeros_preto_e_branco")
-                print(f"Using black and white numbers theme: {theme}")
+        # Calculate the optimal layout first, the card size decides which deck resolution is loaded
+        optimal_cols, card_width, card_height = self.calculate_optimal_grid(num_cards)
+        if self.huge_board:
+            card_width, card_height = self.get_huge_card_size(card_width, card_height)
+        
+        # Prefer the resolution the preloader already has in memory if it's sharp enough
+        preloader = getattr(app, 'deck_preloader', None)
+        if (preloader and preloader.deck_dir == theme and preloader.variant == variant
+                and preloader.cell_width >= choose_card_tier(theme, card_width)):
+            tier_width = preloader.cell_width
+        else:
+            tier_width = choose_card_tier(theme, card_width)
+        
+        # In lazy mode the board is shown with the card backs only and the faces are loaded later
+        lazy_faces = hasattr(app, 'settings') and app.settings.get('lazy_card_faces', False)
         
         # Start the new game
-        self.cards = start_game(theme, num_cards)
+        self.board = start_game(theme, num_cards, tier_width, variant, lazy_faces, seed)
+        self.hints = HintEngine(self.board)
+        self.hinted_cards = []
         self.current_theme = theme
         self.current_difficulty = num_cards
+        self.card_tier = choose_card_tier(theme, tier_width)
+        self.card_variant = variant
+        
+        # Latency samples are grouped by board size and the settings that affect a flip
+        latency_monitor.set_context(f"{optimal_cols}x{math.ceil(num_cards / optimal_cols)}", getattr(app, 'settings', {}))
+        
+        # Flips wait for the preloader instead of loading the deck in the tap handler
+        self.faces_loading = lazy_faces and preloader is not None
+        if lazy_faces:
+            self.pin_atlases(None)
+            # Start loading the faces in the background once the board is on screen
+            Clock.schedule_once(lambda dt: self.prefetch_card_faces(), 0)
+        else:
+            # Upload the deck from the raw texture cache before the cards ask Kivy for it
+            self.pin_atlases(ensure_deck_atlas(theme, cell_width=self.card_tier, variant=variant))
         
-        # Calculate the optimal layout
-        optimal_cols, card_width, card_height = self.calculate_optimal_grid(len(self.cards))
-        self.game_grid.cols = optimal_cols
-        
-        # Clear selected cards
-        self.selected_cards = []
-        
-        # Add card buttons
-        for card in self.cards:
-            self.game_grid.add_widget(self.create_card_button(card, card_width, card_height))
+        # Show the cards, the view asks draw_card for every card it draws
+        self.is_checking = False
+        self.revealed_cards = []
+        if self.huge_board:
+            self.huge_view.set_board(len(self.board), optimal_cols, card_width, card_height)
+        else:
+            self.board_view.set_board(len(self.board), optimal_cols, card_width, card_height)
+        self.update_card_layout()
         
         # Configure sounds for the current theme - always use original theme for sound folder
-        self.setup_sounds(original_theme)
+        self.setup_sounds()
+        
+        # The seed is enough to shuffle the same board again when the recording is replayed
+        if not self.replay_player:
+            replay_recorder.start(requested_theme, num_cards, self.board.seed)
         
         # Reset the game
         self.reset_game()
     
+    def use_huge_view(self, huge_board):
+        """Show the scrolling board of huge boards instead of the grid (or the other way round)"""
+        if huge_board == self.huge_board:
+            return
+        self.huge_board = huge_board
+        old, new = (self.board_view, self.huge_view) if huge_board else (self.huge_view, self.board_view)
+        # Nothing of the previous board may be drawn once the next one starts
+        self.board_view.clear()
+        self.huge_view.plane.clear()
+        # Same place in the layout, between the HUD and the buttons
+        position = self.main_layout.children.index(old)
+        self.main_layout.remove_widget(old)
+        self.main_layout.add_widget(new, index=position)
+        for zoom_button in self.zoom_buttons:
+            zoom_button.opacity = 1 if huge_board else 0
+            zoom_button.disabled = not huge_board
+    
+    def get_huge_card_size(self, card_width, card_height):
+        """Card size of a huge board: the size that fits the screen, unless that is too small to tap"""
+        if card_width >= HUGE_CARD_MIN_WIDTH:
+            return card_width, card_height
+        return HUGE_CARD_MIN_WIDTH, HUGE_CARD_MIN_WIDTH * card_height / card_width
+    
+    def zoom_board(self, factor):
+        if not self.huge_board:
+            return
+        self.huge_view.set_zoom(self.huge_view.zoom * factor)
+        # Zoomed in past the loaded deck resolution: switch to a sharper one
+        if self.card_tier is not None and choose_card_tier(self.current_theme, self.huge_view.card_width) > self.card_tier:
+            self.update_card_tier(self.huge_view.card_width)
+    
+    def pin_atlases(self, deck_atlas):
+        """Load the atlases used by the board and protect them from texture eviction"""
+        # The previous deck can now be evicted if we run out of texture budget
+        for key in self.pinned_atlases:
+            texture_manager.unpin(key)
+        self.pinned_atlases = []
+        
+        backs_atlas = get_card_backs_atlas()
+        for atlas_base, category in ((backs_atlas, ICON), (deck_atlas, DECK)):
+            if atlas_base and install_atlas(atlas_base, category):
+                key = get_atlas_key(atlas_base)
+                texture_manager.pin(key)
+                self.pinned_atlases.append(key)
+    
+    def prefetch_card_faces(self):
+        """Load the faces of a lazy board on the preloader thread before they are flipped"""
+        if not self.board or self.board.pairs[0]["face"] is not None:
+            return
+        
+        app = App.get_running_app()
+        preloader = getattr(app, 'deck_preloader', None)
+        if preloader:
+            board = self.board
+            tier = self.card_tier
+            self.faces_loading = True
+            preloader.preload(self.current_theme, tier, variant=self.card_variant,
+                              on_ready=lambda atlas_base: self.on_card_faces_ready(board, tier, atlas_base))
+    
+    def on_card_faces_ready(self, board, tier, atlas_base):
+        """The preloader installed the deck of a lazy board: give every card its face"""
+        if board is not self.board:
+            return  # A new game started in the meantime
+        if tier != self.card_tier:
+            # The window was resized while loading, load the resolution the cards need now
+            self.prefetch_card_faces()
+            return
+        self.faces_loading = False
+        self.set_card_faces(atlas_base)
+        # Cards flipped while the deck was loading showed a placeholder
+        for index in self.get_drawn_cards():
+            if self.board.is_face_up(index):
+                self.draw_card(index)
+    
+    def set_card_faces(self, atlas_base):
+        self.pin_atlases(atlas_base)
+        for pair in self.board.pairs:
+            pair["face"] = get_card_source(atlas_base, pair["image"])
+    
+    def get_card_face(self, index):
+        """
+        Source of a card face, None while the preloader is still loading the
+        faces of a lazy board (the card is drawn with a placeholder until then)
+        """
+        pair = self.board.get_pair(index)
+        if pair["face"] is None and not self.faces_loading:
+            # No preloader to wait for: load the deck now
+            self.set_card_faces(ensure_deck_atlas(self.current_theme, cell_width=self.card_tier, variant=self.card_variant))
+        return pair["face"]
+    
     def reset_game(self):
         """Resets the game state, including Easy Mode usage."""
-        self.score = 0
         self.lives = 0  # No longer used
         self.easy_mode_used = False  # Reset Easy Mode usage
-        self.consecutive_matches = 0
-        self.multiplier = 1
 
         # Update the HUD
-        self.score_label.text = f"Score: {self.score}"
+        self.score_label.text = f"Score: {self.board.score}"
 
         # Reset and start the timer
         self.stop_timer()
@@ -278,44 +447,35 @@ class GameScreen(Screen):
         if app.settings.get('easy_mode', False):
             self.reveal_button.disabled = False
     
-    def setup_sounds(self, theme):
+    def setup_sounds(self):
         """Configure sounds for the current theme"""
-        project_root = find_project_root()
-        sound_folder = None
-        
-        if "baralho_animais" in theme.lower():
-            sound_folder = os.path.join(project_root, "Items_Jogo", "audios_wav_animais")
-        elif "baralho_numeros" in theme.lower():
-            sound_folder = os.path.join(project_root, "Items_Jogo", "audios_numeros_wav")
-        else:
-            sound_folder = os.path.join(project_root, "Items_Jogo", "audios_wav_animais")
-        
-        # Clear previous sounds
-        for sound in self.sounds.values():
-            if sound:
-                sound.unload()
-        self.sounds.clear()
-        
-        # Load new sounds
-        for card in self.cards:
-            base_filename = os.path.basename(card["image"])
-            
-            # Handle black and white image filenames for sound matching
-            if "_B&W" in base_filename:
-                # Remove the _B&W suffix to get the original filename for sound lookup
-                base_sound_filename = base_filename.replace("_B&W.png", ".wav")
-            else:
-                # Regular image file
-                base_sound_filename = base_filename.replace(".png", ".wav")
-            
-            sound_path = os.path.join(sound_folder, base_sound_filename)
+        # Take the sounds of the new board from the sound bank first, so the ones the
+        # previous board also used (same deck) are never unloaded in between
+        previous_sound_paths = self.sound_paths
+        self.sound_paths = []
+        self.sounds = []
+        missing = 0
+        
+        for pair in self.board.pairs:
+            # The manifest already matched every card with its sound (black and white
+            # cards use the sounds of the original deck)
+            sound_path = pair["sound"]
+            if not sound_path:
+                missing += 1
+                self.sounds.append(None)
+                continue
             
-            if os.path.exists(sound_path):
-                self.sounds[card["image"]] = SoundLoader.load(sound_path)
-            else:
-                print(f"Sound file not found: {sound_path}")
+            self.sounds.append(sound_bank.acquire(sound_path))
+            self.sound_paths.append(sound_path)
+        
+        # The bank keeps the previous sounds loaded while there is room for them
+        for sound_path in previous_sound_paths:
+            sound_bank.release(sound_path)
+        # One line per board, the synthetic deck has no sounds at all
+        if missing:
+            print(f"No sound for {missing} of {len(self.board.pairs)} cards of {self.current_theme}")
     
-    def calculate_optimal_grid(self, num_cards):
+    def calculate_optimal_grid(self, num_cards, grid_size=None):
         """Calculate the optimal card size based on screen dimensions and grid size"""
         # Card aspect ratio (height/width)
         card_aspect_ratio = 1.5
@@ -328,13 +488,17 @@ class GameScreen(Screen):
         available_width = screen_width - 40
         available_height = screen_height * 0.8  # 80% of screen height
         
-        # Use the predefined grid size or calculate optimal
-        cols = self.grid_cols if hasattr(self, 'grid_cols') else math.ceil(math.sqrt(num_cards))
-        rows = self.grid_rows if hasattr(self, 'grid_rows') else math.ceil(num_cards / cols)
+        # Use the given or predefined grid size or calculate optimal
+        if grid_size:
+            cols, rows = grid_size
+        else:
+            cols = self.grid_cols if hasattr(self, 'grid_cols') else math.ceil(math.sqrt(num_cards))
+            rows = self.grid_rows if hasattr(self, 'grid_rows') else math.ceil(num_cards / cols)
         
-        # Calculate card dimensions
-        card_width = (available_width - (cols - 1) * 10) / cols
-        card_height = (available_height - (rows - 1) * 10) / rows
+        # Calculate card dimensions (same spacing as the board view, which hit-tests with this geometry)
+        spacing = self.board_view.spacing
+        card_width = (available_width - (cols - 1) * spacing) / cols
+        card_height = (available_height - (rows - 1) * spacing) / rows
         
         # Apply specific adjustments for 6x6 and 6x7 difficulties
         if cols == 6 and (rows == 6 or rows == 7):
@@ -351,39 +515,46 @@ class GameScreen(Screen):
     
     def on_window_resize(self, instance, width, height):
         """Handle window resize events by recalculating card layout"""
-        if self.cards:
+        if self.board:
             # Recalculate and update the layout
             self.update_card_layout()
     
     def update_card_layout(self):
         """Update the card layout based on current screen dimensions"""
-        if not self.cards:
+        if not self.board:
             return
             
-        num_cards = len(self.cards)
+        num_cards = len(self.board)
         optimal_cols, card_width, card_height = self.calculate_optimal_grid(num_cards)
         
-        # Update grid columns
-        self.game_grid.cols = optimal_cols
-        
-        # Calculate the number of rows
-        rows = math.ceil(num_cards / optimal_cols)
-        
-        # Calculate the total grid width based on cards, spacing, and padding
-        # Padding: left + right = padding[0] + padding[2]
-        # Spacing: (cols - 1) * spacing_x = (optimal_cols - 1) * self.game_grid.spacing[0]
-        grid_width = (optimal_cols * card_width + 
-                      max(0, optimal_cols - 1) * self.game_grid.spacing[0] + 
-                      self.game_grid.padding[0] + self.game_grid.padding[2])
+        if self.huge_board:
+            # The view keeps its zoom and scroll, only the size at zoom 1 changes
+            self.huge_view.set_card_size(*self.get_huge_card_size(card_width, card_height))
+            return
         
-        # Set the calculated width for the grid (important for pos_hint centering)
-        self.game_grid.width = grid_width
+        # Update the columns and card size, the view sets its own width from them
+        # (important for pos_hint centering)
+        self.board_view.set_grid(optimal_cols, card_width, card_height)
         
-        # Update individual card sizes (still necessary)
-        for widget in self.game_grid.children:
-            if isinstance(widget, CardButton): # Ensure we only resize CardButtons
-                widget.size_hint = (None, None)
-                widget.size = (card_width, card_height)
+        # Cards got bigger than the loaded deck resolution: switch to a sharper one
+        if self.card_tier is not None and choose_card_tier(self.current_theme, card_width) > self.card_tier:
+            self.update_card_tier(card_width)
+    
+    def update_card_tier(self, card_width):
+        """Switch the card faces to the deck resolution that matches the new card width"""
+        self.card_tier = choose_card_tier(self.current_theme, card_width)
+        if self.board.pairs[0]["face"] is None:
+            return  # Lazy board: the faces will be loaded at the new resolution
+        atlas_base = ensure_deck_atlas(self.current_theme, cell_width=self.card_tier, variant=self.card_variant)
+        self.pin_atlases(atlas_base)
+        for pair in self.board.pairs:
+            pair["face"] = get_card_source(atlas_base, pair["image"])
+        self.get_board_view().clear_textures()
+        
+        # Refresh the cards that are currently face up
+        for index in self.get_drawn_cards():
+            if self.board.is_face_up(index):
+                self.draw_card(index)
     
     def start_timer(self):
         if not self.timer_display:
@@ -410,125 +581,123 @@ class GameScreen(Screen):
             self.timer_event.cancel()
             self.timer_event = None
     
-    def create_card_button(self, card_data, card_width, card_height):
-        """Create a card button with flip animation"""
-        btn = CardButton(
-            size_hint=(None, None),
-            size=(card_width, card_height),
-            background_normal=self.card_back_path,
-            background_down=self.card_back_path,
-            card_width=card_width,
-            card_height=card_height,
-            card_back_path=self.card_back_path
-        )
-        
-        def on_card_press(instance):
-            self.flip_card(instance, card_data)
-        
-        btn.bind(on_release=on_card_press)
-        return btn
+    def get_board_view(self):
+        """BoardView drawing the current board"""
+        return self.huge_view.plane if self.huge_board else self.board_view
+    
+    def get_drawn_cards(self):
+        """Indexes of the cards the board view draws (the visible ones on a huge board)"""
+        return list(self.get_board_view().drawn)
+    
+    def draw_card(self, index):
+        """Make the board view show the state of a card: face or back, highlighted by a hint or not"""
+        view = self.get_board_view()
+        if not view.is_drawn(index):
+            return  # Drawn when it scrolls into view
+        color = HINT_COLOR if index in self.hinted_cards else PLAIN_COLOR
+        source = self.get_card_face(index) if self.board.is_face_up(index) else self.card_back_path
+        if source is None:
+            source, color = self.card_back_path, LOADING_COLOR
+        view.draw_card(index, source, color)
 
-    def flip_card(self, instance, card):
-        # Prevent flipping cards while checking a match or if card is already flipped/matched
-        if self.is_checking or card["flipped"] or card["matched"]:
-            return
-        
-        # Mark the card as flipped immediately to prevent double-clicks
-        card["flipped"] = True
-        
+    def show_flipped_card(self, index):
+        """Show the face of a card the board just flipped and play its sound. True if a sound was played"""
         # Update the card image immediately with no animation
-        instance.background_normal = card["image"]
-        instance.background_down = card["image"]
-        
-        # Add to selected cards
-        self.selected_cards.append((instance, card))
+        self.draw_card(index)
+        self.hints.on_seen(index)
         
         # Play sound if enabled
         app = App.get_running_app()
-        if app.settings.get('audio_assist', False):
-            if card["image"] in self.sounds and self.sounds[card["image"]]:
-                self.sounds[card["image"]].play()
+        if not app.settings.get('audio_assist', False):
+            return False
+        # The mixer picks a voice (pre-decoded PCM when loaded, the Kivy sound otherwise)
+        pair_id = self.board.pair_ids[index]
+        audio_mixer.play(self.board.pairs[pair_id]["sound"], self.sounds[pair_id])
+        return True
+
+    def flip_card(self, index, tap_time):
+        """A card was tapped on the board view, tap_time is when the touch was released"""
+        # Prevent flipping cards while checking a match, if card is already flipped/matched or during a replay
+        if self.replay_player or self.is_checking or not self.board.flip(index):
+            return
+        replay_recorder.record(EVENT_FLIP, index)
+        
+        if self.show_flipped_card(index):
+            latency_monitor.record(TAP_TO_SOUND, tap_time)
+        latency_monitor.record(TAP_TO_FLIP, tap_time)
+        latency_monitor.record_on_next_frame(TAP_TO_PIXEL, tap_time)
         
         # Check for match immediately if we have two cards
-        if len(self.selected_cards) == 2:
+        if self.board.has_pair_selected():
             self.is_checking = True
-            Clock.schedule_once(self.check_match, 0.5)  # Keep a small delay for better UX
+            self.check_event = Clock.schedule_once(self.check_match, MATCH_CHECK_DELAY)  # Keep a small delay for better UX
     
     def check_match(self, dt):
+        self.check_event = None
         # Make sure we have exactly 2 cards to check
-        if len(self.selected_cards) != 2:
-            print(f"Warning: check_match called with {len(self.selected_cards)} cards")
+        if not self.board.has_pair_selected():
+            print(f"Warning: check_match called with {len(self.board.selected)} cards")
             self.is_checking = False
             return
         
-        # Get the card data for easier reference
-        widget1, card1 = self.selected_cards[0]
-        widget2, card2 = self.selected_cards[1]
-        is_match = card1["image"] == card2["image"]
+        first, second, is_match = self.board.check_selected()
+        replay_recorder.record(EVENT_CHECK, int(is_match))
+        if self.score_display:
+            self.score_label.text = f"Score: {self.board.score}"
         
         # Check if visual feedback is enabled
         app = App.get_running_app()
         visual_feedback_enabled = app.settings.get('visual_feedback', True)
 
         if is_match:
-            # This is a match! Mark cards as matched
-            card1["matched"] = True
-            card2["matched"] = True
-            self.consecutive_matches += 1
-            self.multiplier = min(self.consecutive_matches, 5)  # Cap multiplier at 5
-            self.score += 1 * self.multiplier
-            if self.score_display:
-                self.score_label.text = f"Score: {self.score}"
+            # The last pair goes straight to the win screen instead of the match screen
+            if visual_feedback_enabled and not self.board.is_won():
+                match_screen = self.manager.get_screen('match_screen')
+                match_screen.show_match()
 
-            if visual_feedback_enabled:
-                # Simplified solution: Just check if this is the last pair
-                total_pairs = len(self.cards) // 2
-                matched_pairs = sum(1 for card in self.cards if card["matched"]) // 2
-
-                # If NOT the last pair (at least one pair is still missing), show the match screen
-                if matched_pairs < total_pairs:
-                    match_screen = self.manager.get_screen('match_screen')
-                    match_screen.show_match()
-
-            # Clear selected cards and allow new selections immediately
-            self.selected_cards = []
+            # Allow new selections immediately
             self.is_checking = False
         else:
-            self.consecutive_matches = 0
-            self.multiplier = 1
-            self.score = max(self.score, 0)  # Score remains non-negative
-            if self.score_display:
-                self.score_label.text = f"Score: {self.score}"
-            
             # Turn cards back to face down immediately - no animation
-            for widget, card in self.selected_cards:
-                card["flipped"] = False
-                widget.background_normal = self.card_back_path
-                widget.background_down = self.card_back_path
+            self.draw_card(first)
+            self.draw_card(second)
             
-            # Clear selected cards and allow new selections
-            self.selected_cards = []
             # Small delay to allow player to see the cards before they flip back
-            Clock.schedule_once(lambda dt: setattr(self, 'is_checking', False), 0.5)
+            self.mismatch_event = Clock.schedule_once(self.end_mismatch, MISMATCH_DELAY)
         
         # Check win condition and ensure we transition to win screen
-        if check_win_condition(self.cards):
+        if check_win_condition(self.board):
             print("Win condition met! Stopping the clock and displaying the victory screen.")
             self.stop_timer()
             self.show_win_screen()
     
+    def end_mismatch(self, dt):
+        self.mismatch_event = None
+        self.is_checking = False
+    
+    def cancel_board_events(self):
+        """Cancel the check, unlock and hide scheduled for the current board"""
+        for name in ('check_event', 'mismatch_event', 'hide_event'):
+            event = getattr(self, name)
+            if event:
+                event.cancel()
+                setattr(self, name, None)
+    
     def show_win_screen(self):
         print("Showing win screen")  # Debug print
         
-        # Save game statistics
+        replay_recorder.save()
+        
+        # Save game statistics (not for replays, the game was already counted when it was played)
         game_data = {
-            'score': self.score,
+            'score': self.board.score,
             'time': self.elapsed_time,
             'theme': self.current_theme,
             'difficulty': self.current_difficulty,
-            'pairs_matched': len(self.cards) // 2
+            'pairs_matched': self.board.matched_pairs
         }
-        update_stats(game_data)
+        if not self.replay_player:
+            update_stats(game_data)
         
         # Pass the elapsed time, theme, and difficulty to the win screen
         win_screen = self.manager.get_screen('win_screen')
@@ -546,7 +715,8 @@ class GameScreen(Screen):
         
         # Display score and time based on settings
         if self.score_display:
-            win_screen.display_score(self.score)
+            win_screen.display_score(self.board.score)
+            win_screen.display_moves(self.board.moves, len(self.board))
           # Important: Ensure all changes to the win screen are done before switching to it
         win_screen.update_labels_visibility()
         
@@ -556,6 +726,14 @@ class GameScreen(Screen):
     def on_leave(self):
         # Stop the timer when leaving the game screen
         self.stop_timer()
+        # Don't leave a reveal or a mismatch pending while the screen is away,
+        # finish them now (the ESC menu may bring the player back to this board)
+        if self.hide_event:
+            self.hide_event.cancel()
+            self.hide_cards(0)
+        if self.mismatch_event:
+            self.mismatch_event.cancel()
+            self.end_mismatch(0)
         
     def reveal_cards(self, instance):
         if self.easy_mode_used:
@@ -565,32 +743,43 @@ class GameScreen(Screen):
         self.reveal_button.disabled = True
         self.reveal_button.opacity = 0 # Make button disappear after use
 
-        # Create a mapping of widgets to cards to ensure consistency
-        # Kivy's children list is in reverse order of how widgets were added
-        widgets_to_cards = list(zip(reversed(self.game_grid.children), self.cards))
-
         # Reveal all cards immediately - no animation
-        for widget, card in widgets_to_cards:
-            card["flipped"] = True
-            widget.background_normal = card["image"]
-            widget.background_down = card["image"]
-
-        # Store the mapping for hide_cards to use
-        self._widgets_to_cards = widgets_to_cards
-        
-        # Schedule to hide cards after 2 seconds
-        Clock.schedule_once(self.hide_cards, 2)
+        replay_recorder.record(EVENT_REVEAL)
+        self.revealed_cards = self.board.reveal_all()
+        for index in self.revealed_cards:
+            self.draw_card(index)
+            self.hints.on_seen(index)
+        
+        # Schedule to hide cards after 2 seconds (a replay hides them when the recording did)
+        if not self.replay_player:
+            self.hide_event = Clock.schedule_once(self.hide_cards, REVEAL_TIME)
 
     def hide_cards(self, dt):
-        # Use the same widget-to-card mapping created in reveal_cards
-        if hasattr(self, '_widgets_to_cards'):
-            for widget, card in self._widgets_to_cards:
-                if not card["matched"]:  # Only hide unmatched cards
-                    card["flipped"] = False
-                    widget.background_normal = self.card_back_path
-                    widget.background_down = self.card_back_path
-            # Clean up the mapping to avoid memory leaks
-            del self._widgets_to_cards
+        self.hide_event = None
+        # Hide the cards reveal_cards turned that weren't matched or picked in the meantime
+        replay_recorder.record(EVENT_HIDE)
+        for index in self.board.hide(self.revealed_cards):
+            self.draw_card(index)
+        self.revealed_cards = []
+    
+    def show_hint(self, instance):
+        """Highlight the cards the hint engine suggests for a moment"""
+        if not self.hints or self.is_checking:
+            return
+        self.clear_hint(0)
+        self.hinted_cards = self.hints.get_hint()
+        for index in self.hinted_cards:
+            self.draw_card(index)
+        self.hint_event = Clock.schedule_once(self.clear_hint, HINT_TIME)
+
+    def clear_hint(self, dt):
+        if self.hint_event:
+            self.hint_event.cancel()
+            self.hint_event = None
+        hinted_cards, self.hinted_cards = self.hinted_cards, []
+        for index in hinted_cards:
+            if self.board and index < len(self.board):
+                self.draw_card(index)
     
     def go_back(self, instance):
         pass  # Removed the functionality for the 'Voltar' button
@@ -598,7 +787,6 @@ class GameScreen(Screen):
     def set_grid_size(self, grid_size):
         """Set the grid size (columns x rows)"""
         self.grid_cols, self.grid_rows = grid_size
-        self.game_grid.cols = self.grid_cols
         self.update_card_layout()
 
     def get_wood_texture_path(self):
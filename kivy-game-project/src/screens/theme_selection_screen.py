@@ -2,34 +2,22 @@ from kivy.uix.screenmanager import Screen
 from kivy.uix.togglebutton import ToggleButton
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
+from kivy.app import App
+from logic.game_logic import get_display_theme, get_deck_sound_paths
+from utils.texture_atlas import choose_tier
+from utils.settings_manager import get_colorblind_filter
+from utils.paths import get_items_dir
 import os
-from pathlib import Path
-
-def find_project_root():
-    """Find the project root directory by looking for known directories"""
-    # Start with the directory of this file and go up until we find the project root
-    current_dir = Path(__file__).resolve().parent.parent.parent.parent
-    
-    # Check if we're at the project root
-    if (current_dir / "Items_Jogo").exists():
-        return str(current_dir)
-    if (current_dir.parent / "Items_Jogo").exists():
-        return str(current_dir.parent)
-    
-    # Fallback to a hardcoded path but with the correct username from the file path
-    file_path = Path(__file__).resolve()
-    username = file_path.parts[2]  # Extract username from path
-    return os.path.join('C:', os.sep, 'Users', username, 'Documents', 'GitHub', 'IPC_24-25')
 
 class ThemeSelectionScreen(Screen):
     def __init__(self, **kwargs):
         super(ThemeSelectionScreen, self).__init__(**kwargs)
         
-        # Get the project root directory
-        project_root = find_project_root()
+        # Get the directory with the game assets
+        items_dir = get_items_dir()
         
-        # Use project_root to construct theme paths
-        self.selected_theme = os.path.join(project_root, "Items_Jogo", "baralho_animais")  # Default theme
+        # Use items_dir to construct theme paths
+        self.selected_theme = os.path.join(items_dir, "baralho_animais")  # Default theme
         
         layout = BoxLayout(orientation='vertical', spacing=20, padding=50)
         
@@ -39,10 +27,10 @@ class ThemeSelectionScreen(Screen):
         # Adjust layout for smaller and more organized buttons
         grid_layout = BoxLayout(orientation='horizontal', spacing=20, size_hint=(1, 0.6))
 
-        # Use project_root to construct paths for both themes
+        # Use items_dir to construct paths for both themes
         themes = [
-            ("Animal Theme", self.select_theme_animals, os.path.join(project_root, "Items_Jogo", "baralho_animais")),
-            ("Number Theme", self.select_theme_numbers, os.path.join(project_root, "Items_Jogo", "baralho_numeros"))
+            ("Animal Theme", self.select_theme_animals, os.path.join(items_dir, "baralho_animais")),
+            ("Number Theme", self.select_theme_numbers, os.path.join(items_dir, "baralho_numeros"))
         ]
 
         self.theme_buttons = []
@@ -88,11 +76,31 @@ class ThemeSelectionScreen(Screen):
     
     def select_theme_animals(self, instance, theme):
         self.selected_theme = theme
+        self.preload_theme(theme)
         self.manager.current = 'difficulty_selection'
     
     def select_theme_numbers(self, instance, theme):
         self.selected_theme = theme
+        self.preload_theme(theme)
         self.manager.current = 'difficulty_selection'
     
+    def preload_theme(self, theme):
+        """Start loading the chosen deck while the player picks the difficulty"""
+        app = App.get_running_app()
+        if not hasattr(app, 'deck_preloader'):
+            return
+        
+        try:
+            deck_dir, variant = get_display_theme(theme, get_colorblind_filter(app.settings))
+            
+            # The grid isn't known yet: load the resolution of the biggest cards (4x4),
+            # it stays sharp for every other difficulty
+            game_screen = self.manager.get_screen('game_screen')
+            _, card_width, _ = game_screen.calculate_optimal_grid(16, grid_size=(4, 4))
+            
+            app.deck_preloader.preload(deck_dir, choose_tier(card_width), get_deck_sound_paths(deck_dir), variant)
+        except Exception as e:
+            print(f"Error preloading theme: {e}")
+    
     def go_back(self, instance, theme):
         self.manager.current = 'main_menu'
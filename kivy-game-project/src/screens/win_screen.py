@@ -4,6 +4,7 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.app import App
 from kivy.graphics import Color, Rectangle
+from logic.solver import get_par
 
 class BackgroundLabel(Label):
     """Label class without background - we'll use the container background instead"""
@@ -81,14 +82,25 @@ class WinScreen(Screen):
         
         # Score container with green background
         self.score_container = BorderedScrollContainer(size_hint=(1, 0.2))
+        score_inner_layout = BoxLayout(orientation='vertical', size_hint=(1, 1))
         self.score_label = BackgroundLabel(
             text="",
             font_size=32,
-            size_hint=(1, 1),
+            size_hint=(1, 0.5),
+            halign='center',
+            valign='middle'
+        )
+        score_inner_layout.add_widget(self.score_label)
+        self.moves_label = BackgroundLabel(
+            text="",
+            font_size=28,
+            size_hint=(1, 0.5),
+            color=(1, 0.8, 0, 1),
             halign='center',
             valign='middle'
         )
-        self.score_container.add_widget(self.score_label)
+        score_inner_layout.add_widget(self.moves_label)
+        self.score_container.add_widget(score_inner_layout)
         self.layout.add_widget(self.score_container)
         
         # Buttons container - always visible
@@ -159,11 +171,13 @@ class WinScreen(Screen):
             self.score_container.opacity = 1
             self.score_container.size_hint_y = 0.2
             self.score_label.disabled = False
+            self.moves_label.disabled = False
         else:
             self.score_container.opacity = 0
             self.score_container.size_hint_y = 0
             self.score_container.height = 0
             self.score_label.disabled = True
+            self.moves_label.disabled = True
         
         # Always keep buttons visible
         self.buttons_layout.size_hint_y = 0.3
@@ -203,6 +217,15 @@ class WinScreen(Screen):
     def display_score(self, score):
         self.score_label.text = f"Score: {score}"
     
+    def display_moves(self, moves, num_cards):
+        """Show the moves next to the par of the board (expected moves of a perfect player)"""
+        par = get_par(num_cards)
+        if moves <= par:
+            verdict = "abaixo do par!"
+        else:
+            verdict = f"+{moves - par:.1f}"
+        self.moves_label.text = f"Jogadas: {moves} (par {par:.1f}, {verdict})"
+    
     def display_time(self, elapsed_time):
         self.time_label.text = f"Tempo: {elapsed_time}s"
     
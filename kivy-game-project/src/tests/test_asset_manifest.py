@@ -0,0 +1,72 @@
+import os
+import struct
+import zlib
+from utils.asset_manifest import (build_manifest, refresh_manifest, get_content_signature,
+                                  _load_manifest_file, save_manifest, MANIFEST_NAME)
+
+def write_png(path, width, height):
+    """A PNG header is all the manifest reads of an image"""
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n' + struct.pack('>I', len(ihdr)) + b'IHDR' + ihdr
+                + struct.pack('>I', zlib.crc32(b'IHDR' + ihdr)))
+
+def make_items(items_dir):
+    deck_dir = items_dir / 'baralho_animais'
+    deck_dir.mkdir(parents=True)
+    write_png(deck_dir / 'BEAR.png', 100, 150)
+    write_png(deck_dir / 'CAT.png', 100, 150)
+    sound_dir = items_dir / 'audios_wav_animais'
+    sound_dir.mkdir()
+    (sound_dir / 'bear.wav').write_bytes(b'RIFF')
+    return deck_dir
+
+def test_build_manifest_describes_cards(tmp_path):
+    make_items(tmp_path)
+    data = build_manifest(str(tmp_path))
+    bear, cat = data['decks']['baralho_animais']['cards']
+    assert bear['id'] == 'BEAR'
+    assert bear['image'] == 'baralho_animais/BEAR.png'
+    assert bear['size'] == [100, 150]
+    assert bear['tiers']['128'] == [128, 192]
+    assert bear['sound'] == 'audios_wav_animais/bear.wav'
+    assert cat['sound'] is None
+
+def test_refresh_rehashes_only_edited_cards(tmp_path):
+    deck_dir = make_items(tmp_path)
+    data = build_manifest(str(tmp_path))
+    assert not refresh_manifest(data, str(tmp_path))
+
+    old_sha1 = data['decks']['baralho_animais']['cards'][0]['sha1']
+    write_png(deck_dir / 'BEAR.png', 200, 300)
+    assert refresh_manifest(data, str(tmp_path))
+    bear, cat = data['decks']['baralho_animais']['cards']
+    assert bear['size'] == [200, 300]
+    assert bear['sha1'] != old_sha1
+    assert not refresh_manifest(data, str(tmp_path))
+
+def test_manifest_file_rejected_when_files_change(tmp_path):
+    items_dir = tmp_path / 'items'
+    deck_dir = make_items(items_dir)
+    path = str(tmp_path / 'settings' / MANIFEST_NAME)
+    save_manifest(build_manifest(str(items_dir)), path)
+
+    data, changed = _load_manifest_file(path, str(items_dir))
+    assert not changed
+    os.remove(deck_dir / 'CAT.png')
+    assert _load_manifest_file(path, str(items_dir)) is None
+
+def test_content_signature_ignores_file_times(tmp_path):
+    # A manifest built on another machine (or after a checkout) has other
+    # stat values for the same files, the asset pack must still match it
+    deck_dir = make_items(tmp_path)
+    data = build_manifest(str(tmp_path))
+    signature = get_content_signature(data)
+
+    os.utime(deck_dir / 'BEAR.png', ns=(0, 0))
+    assert refresh_manifest(data, str(tmp_path))
+    assert get_content_signature(data) == signature
+
+    write_png(deck_dir / 'BEAR.png', 64, 96)
+    refresh_manifest(data, str(tmp_path))
+    assert get_content_signature(data) != signature
@@ -0,0 +1,59 @@
+import os
+import gc
+from utils.asset_pack import build_pack, open_pack, MEMBER_ALIGNMENT
+from utils.asset_manifest import build_manifest, refresh_manifest, get_content_signature
+from tests.test_asset_manifest import make_items
+
+MEMBERS = ['baralho_animais/BEAR.png', 'baralho_animais/CAT.png', 'audios_wav_animais/bear.wav']
+
+def make_pack(tmp_path):
+    items_dir = tmp_path / 'items'
+    make_items(items_dir)
+    manifest = build_manifest(str(items_dir))
+    pack_path = str(tmp_path / 'assets.pack')
+    build_pack(str(items_dir), pack_path, MEMBERS, manifest)
+    return items_dir, pack_path, manifest
+
+def test_read_members(tmp_path):
+    items_dir, pack_path, manifest = make_pack(tmp_path)
+    pack = open_pack(pack_path)
+    for member in MEMBERS:
+        assert member in pack
+        assert pack.files[member][0] % MEMBER_ALIGNMENT == 0
+        data = (items_dir / member).read_bytes()
+        assert bytes(pack.read(member)) == data
+        with pack.open(member) as f:
+            assert f.read() == data
+    assert 'baralho_animais/DOG.png' not in pack
+    assert pack.manifest == manifest
+    pack.close()
+
+def test_close_with_live_views(tmp_path):
+    items_dir, pack_path, manifest = make_pack(tmp_path)
+    pack = open_pack(pack_path)
+    view = pack.read(MEMBERS[0])
+    reader = pack.open(MEMBERS[1])
+    # The views belong to their callers, closing the pack must not break them
+    pack.close()
+    assert bytes(view) == (items_dir / MEMBERS[0]).read_bytes()
+    assert reader.read() == (items_dir / MEMBERS[1]).read_bytes()
+    del view, reader
+    gc.collect()
+
+def test_pack_matches_manifest_from_other_machine(tmp_path):
+    # The pack keeps the stat values of the machine that built it, the
+    # manifest of the machine running the game has its own
+    items_dir, pack_path, manifest = make_pack(tmp_path)
+    for member in MEMBERS:
+        os.utime(items_dir / member, ns=(0, 0))
+    refresh_manifest(manifest, str(items_dir))
+    pack = open_pack(pack_path)
+    assert pack.manifest != manifest
+    assert get_content_signature(pack.manifest) == get_content_signature(manifest)
+    pack.close()
+
+def test_open_missing_or_broken_pack(tmp_path):
+    assert open_pack(str(tmp_path / 'missing.pack')) is None
+    broken = tmp_path / 'broken.pack'
+    broken.write_bytes(b'not a pack')
+    assert open_pack(str(broken)) is None
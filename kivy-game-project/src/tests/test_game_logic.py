@@ -0,0 +1,88 @@
+import pytest
+from logic.game_logic import Board, HIDDEN, FLIPPED, MATCHED, MAX_MULTIPLIER
+
+def find_pair(board):
+    """Indexes of the two cards of pair 0"""
+    return [index for index in range(len(board)) if board.pair_ids[index] == 0]
+
+def find_mismatch(board):
+    first = 0
+    second = next(index for index in range(1, len(board)) if board.pair_ids[index] != board.pair_ids[first])
+    return first, second
+
+def test_from_seed_is_repeatable():
+    board = Board.from_seed(8, seed=1234)
+    assert len(board) == 16
+    assert board.seed == 1234
+    assert sorted(board.pair_ids) == sorted(list(range(8)) * 2)
+    assert list(Board.from_seed(8, seed=1234).pair_ids) == list(board.pair_ids)
+    assert Board.from_seed(8).seed is not None
+
+def test_odd_number_of_cards():
+    with pytest.raises(ValueError):
+        Board([0, 0, 1])
+
+def test_match():
+    board = Board.from_seed(4, seed=1)
+    first, second = find_pair(board)
+    assert board.flip(first)
+    assert not board.flip(first)
+    assert board.flip(second)
+    assert board.has_pair_selected()
+    # No third card while two wait to be checked
+    assert not board.can_flip(next(index for index in range(len(board)) if board.states[index] == HIDDEN))
+
+    assert board.check_selected() == (first, second, True)
+    assert board.states[first] == board.states[second] == MATCHED
+    assert board.matched_pairs == 1
+    assert board.moves == 1
+    assert board.score == 1
+    assert board.flipped_count == 0
+
+def test_mismatch():
+    board = Board.from_seed(4, seed=2)
+    first, second = find_mismatch(board)
+    board.flip(first)
+    board.flip(second)
+    assert board.check_selected() == (first, second, False)
+    assert board.states[first] == board.states[second] == HIDDEN
+    assert board.moves == 1
+    assert board.score == 0
+
+def test_check_needs_two_cards():
+    board = Board.from_seed(2, seed=3)
+    board.flip(0)
+    with pytest.raises(ValueError):
+        board.check_selected()
+
+def test_multiplier_and_win():
+    board = Board.from_seed(8, seed=4)
+    for pair in range(8):
+        first, second = [index for index in range(len(board)) if board.pair_ids[index] == pair]
+        assert not board.is_won()
+        board.flip(first)
+        board.flip(second)
+        board.check_selected()
+    assert board.is_won()
+    assert board.multiplier == MAX_MULTIPLIER
+    assert board.score == sum(min(streak, MAX_MULTIPLIER) for streak in range(1, 9))
+
+def test_reveal_and_hide():
+    board = Board.from_seed(4, seed=5)
+    first, second = find_pair(board)
+    board.flip(first)
+    board.flip(second)
+    board.check_selected()
+    selected = next(index for index in range(len(board)) if board.states[index] == HIDDEN)
+    board.flip(selected)
+
+    revealed = board.reveal_all()
+    assert len(revealed) == len(board) - 3
+    assert all(board.is_face_up(index) for index in range(len(board)))
+
+    # The matched pair and the card of the current move stay up
+    hidden = board.hide(revealed)
+    assert hidden == revealed
+    assert board.states[selected] == FLIPPED
+    assert board.is_matched(first) and board.is_matched(second)
+    assert board.flipped_count == 1
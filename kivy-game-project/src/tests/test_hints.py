@@ -0,0 +1,73 @@
+from logic.game_logic import Board
+from logic.hints import HintEngine
+
+def flip(board, hints, index):
+    assert board.flip(index)
+    hints.on_seen(index)
+
+def cards_of(board, pair):
+    return [index for index in range(len(board)) if board.pair_ids[index] == pair]
+
+def test_unseen_card_first():
+    board = Board.from_seed(8, seed=10)
+    hints = HintEngine(board)
+    hint = hints.get_hint()
+    assert len(hint) == 1 and board.can_flip(hint[0])
+
+def test_known_pair():
+    board = Board.from_seed(8, seed=11)
+    hints = HintEngine(board)
+    first, second = cards_of(board, 3)
+    other = cards_of(board, 4)[0]
+    # Seen in two different moves, neither was a match
+    flip(board, hints, first)
+    flip(board, hints, other)
+    board.check_selected()
+    flip(board, hints, second)
+    flip(board, hints, cards_of(board, 5)[0])
+    board.check_selected()
+    assert sorted(hints.get_hint()) == [first, second]
+
+    flip(board, hints, first)
+    flip(board, hints, second)
+    board.check_selected()
+    # The matched pair is never suggested again
+    assert first not in hints.get_hint() and second not in hints.get_hint()
+
+def test_partner_of_flipped_card():
+    board = Board.from_seed(8, seed=12)
+    hints = HintEngine(board)
+    first, second = cards_of(board, 2)
+    flip(board, hints, first)
+    flip(board, hints, cards_of(board, 6)[0])
+    board.check_selected()
+    flip(board, hints, second)
+    assert hints.get_partner(second) == first
+    assert hints.get_hint() == [first]
+
+def test_no_hint_while_checking_or_revealed():
+    board = Board.from_seed(8, seed=13)
+    hints = HintEngine(board)
+    flip(board, hints, 0)
+    flip(board, hints, 1)
+    assert hints.get_hint() == []
+    board.check_selected()
+
+    revealed = board.reveal_all()
+    for index in revealed:
+        hints.on_seen(index)
+    assert hints.get_hint() == []
+    board.hide(revealed)
+    # Everything was seen: the hint is a known pair
+    hint = hints.get_hint()
+    assert len(hint) == 2 and board.pair_ids[hint[0]] == board.pair_ids[hint[1]]
+
+def test_no_hint_once_won():
+    board = Board.from_seed(4, seed=14)
+    hints = HintEngine(board)
+    for pair in range(4):
+        for index in cards_of(board, pair):
+            flip(board, hints, index)
+        board.check_selected()
+    assert board.is_won()
+    assert hints.get_hint() == []
@@ -0,0 +1,83 @@
+import os
+from logic.game_logic import Board
+from logic.replay import (ReplayRecorder, read_replay, replay_board, get_replay_files, RECORD,
+                          EVENT_FLIP, EVENT_CHECK, EVENT_REVEAL, EVENT_HIDE, EVENT_PAUSE, EVENT_RESUME)
+
+THEME = 'Items_Jogo/baralho_animais'
+
+def play_game(recorder, board):
+    """Win a board pair by pair after a wrong move, recording every event like the game screen"""
+    first = 0
+    second = next(index for index in range(1, len(board)) if board.pair_ids[index] != board.pair_ids[first])
+    for index in (first, second):
+        board.flip(index)
+        recorder.record(EVENT_FLIP, index)
+    recorder.record(EVENT_CHECK, int(board.check_selected()[2]))
+
+    recorder.record(EVENT_REVEAL)
+    recorder.record(EVENT_HIDE)
+    recorder.record(EVENT_PAUSE)
+    recorder.record(EVENT_RESUME)
+
+    for pair in range(board.total_pairs):
+        for index in [index for index in range(len(board)) if board.pair_ids[index] == pair]:
+            board.flip(index)
+            recorder.record(EVENT_FLIP, index)
+        recorder.record(EVENT_CHECK, int(board.check_selected()[2]))
+
+def record_game(tmp_path, seed=99):
+    recorder = ReplayRecorder()
+    recorder.enabled = True
+    recorder.replay_dir = str(tmp_path)
+    recorder.start(THEME, 16, seed)
+    play_game(recorder, Board.from_seed(8, seed))
+    return recorder, recorder.save()
+
+def test_round_trip(tmp_path):
+    recorder, path = record_game(tmp_path)
+    assert get_replay_files(str(tmp_path)) == [path]
+    assert os.path.basename(path).endswith('-00000063.mgr')
+
+    theme, records = read_replay(path)
+    assert theme == THEME
+    times = [record[0] for record in records]
+    assert times == sorted(times)
+    assert all(seed == 99 for record_time, seed, card, event in records)
+
+    result = replay_board(records)
+    assert result['errors'] == []
+    assert result['board'].is_won()
+    assert result['board'].moves == 9
+
+def test_cut_recording(tmp_path):
+    # The game was killed while the last record was written
+    recorder, path = record_game(tmp_path)
+    theme, full_records = read_replay(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-RECORD.size // 2])
+    theme, records = read_replay(path)
+    assert records == full_records[:-1]
+    assert replay_board(records)['errors'] == []
+
+def test_wrong_check_is_reported(tmp_path):
+    recorder = ReplayRecorder()
+    recorder.enabled = True
+    recorder.replay_dir = str(tmp_path)
+    recorder.start(THEME, 4, 7)
+    board = Board.from_seed(2, 7)
+    first, second = [index for index in range(4) if board.pair_ids[index] == 0]
+    recorder.record(EVENT_FLIP, first)
+    recorder.record(EVENT_FLIP, second)
+    recorder.record(EVENT_CHECK, 0)
+    theme, records = read_replay(recorder.save())
+    assert len(replay_board(records)['errors']) == 1
+
+def test_disabled_recorder_saves_nothing(tmp_path):
+    recorder = ReplayRecorder()
+    recorder.replay_dir = str(tmp_path)
+    recorder.start(THEME, 16, 1)
+    recorder.record(EVENT_FLIP, 0)
+    assert recorder.save() is None
+    assert get_replay_files(str(tmp_path)) == []
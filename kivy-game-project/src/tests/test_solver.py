@@ -0,0 +1,29 @@
+import pytest
+from logic.solver import get_par, estimate_par, expected_moves, PAR_TABLE, MAX_SOLVED_CARDS
+from logic.game_logic import DIFFICULTIES
+
+def test_small_boards():
+    assert get_par(2) == 1
+    # First move matches with probability 1/3 (2 moves in all), otherwise 3 moves
+    assert get_par(4) == pytest.approx(1 / 3 * 2 + 2 / 3 * 3)
+
+def test_known_states():
+    # Three seen cards and their three unseen partners: every unseen card flipped is matched right away
+    assert expected_moves(0, 0) == 0
+    assert expected_moves(0, 3) == pytest.approx(3)
+
+def test_par_table():
+    sizes = {num_cards for boards in DIFFICULTIES.values() for label, num_cards, grid_size in boards}
+    assert set(PAR_TABLE) == sizes
+    assert get_par(16) == pytest.approx(12.393, abs=0.001)
+    assert get_par(42) == pytest.approx(33.375, abs=0.001)
+
+def test_par_grows_with_the_board():
+    pars = [get_par(num_cards) for num_cards in range(2, 60, 2)]
+    assert pars == sorted(pars)
+    assert all(num_cards // 2 <= get_par(num_cards) for num_cards in range(2, 60, 2))
+
+def test_estimate_of_huge_boards():
+    assert get_par(MAX_SOLVED_CARDS) == pytest.approx(estimate_par(MAX_SOLVED_CARDS), abs=0.001)
+    assert get_par(MAX_SOLVED_CARDS + 2) == estimate_par(MAX_SOLVED_CARDS + 2)
+    assert get_par(1600) == pytest.approx(1600 // 2 * 1.6137, rel=0.001)
@@ -0,0 +1,69 @@
+import os
+import pytest
+from logic import sweep
+from logic.sweep import run_sweep, load_checkpoint, get_config_key, get_configurations, CHECKPOINT_NAME
+
+pytest.importorskip('numpy')
+
+SWEEP = {
+    'num_cards': [8],
+    'max_multiplier': [5],
+    'check_delay': [0.5],
+    'mismatch_delay': [0.5],
+    'memory': [1.0, 0.6],
+    'flip_time': [1.0],
+}
+GAMES = 200
+
+def test_config_key_includes_games_and_seed():
+    config = get_configurations(SWEEP)[0]
+    assert get_config_key(config, GAMES) != get_config_key(config, GAMES * 2)
+    assert get_config_key(config, GAMES).endswith(f"games={GAMES},seed={sweep.get_config_seed(config)}")
+
+def test_resume_after_cut_line(tmp_path, monkeypatch):
+    rows = run_sweep(SWEEP, str(tmp_path), GAMES, processes=1)
+    assert len(rows) == 2
+    checkpoint_path = os.path.join(str(tmp_path), CHECKPOINT_NAME)
+    assert len(load_checkpoint(checkpoint_path)) == 2
+
+    # Killed while writing the last record
+    with open(checkpoint_path, 'rb') as f:
+        data = f.read()
+    with open(checkpoint_path, 'wb') as f:
+        f.write(data[:-20])
+    assert len(load_checkpoint(checkpoint_path)) == 1
+
+    simulated = []
+    run_configuration = sweep.run_configuration
+    def count_configuration(task):
+        simulated.append(task)
+        return run_configuration(task)
+    monkeypatch.setattr(sweep, 'run_configuration', count_configuration)
+    # Not in a worker process, so the counting wrapper is what runs
+    monkeypatch.setattr(sweep.multiprocessing, 'Pool', FakePool)
+
+    resumed = run_sweep(SWEEP, str(tmp_path), GAMES, processes=1)
+    assert len(simulated) == 1
+    # Same seed, same numbers (only the time taken differs)
+    assert [dict(row, seconds=0) for row in resumed] == [dict(row, seconds=0) for row in rows]
+    assert len(load_checkpoint(checkpoint_path)) == 2
+
+    # Another number of games is another run, the old rows are kept
+    simulated.clear()
+    more = run_sweep(SWEEP, str(tmp_path), GAMES * 2, processes=1)
+    assert len(simulated) == 2
+    assert len(more) == 4
+    assert len(load_checkpoint(checkpoint_path)) == 4
+
+class FakePool:
+    def __init__(self, processes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def imap_unordered(self, function, tasks):
+        return map(function, tasks)
@@ -0,0 +1,99 @@
+import os
+import threading
+from utils.paths import get_items_dir
+from utils.settings_manager import get_settings_dir
+from utils.asset_pack import open_pack, PACK_NAME
+
+_asset_fs = None
+
+class AssetFS:
+    """
+    Reads the game assets from Items_Jogo/assets.pack when it is there, from
+    the loose files otherwise. Paths are the usual absolute paths inside
+    Items_Jogo, so callers don't need to know where an asset really lives.
+    """
+
+    def __init__(self, items_dir, pack=None):
+        self.items_dir = os.path.normpath(items_dir)
+        self.pack = pack
+        self.extract_dir = os.path.join(get_settings_dir(), 'pack_cache')
+        self._real_paths = {}  # path -> file on disk, for members that had to be extracted
+        self._lock = threading.Lock()
+
+    def _member(self, path):
+        """Name of a path inside the pack, None if it isn't packed"""
+        if self.pack is None:
+            return None
+        relative_path = os.path.relpath(os.path.normpath(path), self.items_dir)
+        if relative_path.startswith('..'):
+            return None
+        relative_path = relative_path.replace(os.sep, '/')
+        return relative_path if relative_path in self.pack else None
+
+    def exists(self, path):
+        return self._member(path) is not None or os.path.exists(path)
+
+    def read(self, path):
+        """Bytes of an asset (a memoryview into the pack when it is packed)"""
+        member = self._member(path)
+        if member is not None:
+            return self.pack.read(member)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def open(self, path):
+        """Binary file object for an asset"""
+        member = self._member(path)
+        if member is not None:
+            return self.pack.open(member)
+        return open(path, 'rb')
+
+    def get_real_path(self, path):
+        """
+        Path of a file on disk with the content of an asset, for loaders that
+        only take file names (SoundLoader, Image.source). Packed members are
+        extracted once to the settings directory.
+        """
+        member = self._member(path)
+        if member is None:
+            return path
+        if path in self._real_paths:
+            return self._real_paths[path]
+
+        with self._lock:
+            real_path = os.path.join(self.extract_dir, *member.split('/'))
+            data = self.pack.read(member)
+            # Reuse what an earlier run extracted unless the pack is newer
+            if (not os.path.exists(real_path) or os.path.getsize(real_path) != len(data)
+                    or os.path.getmtime(real_path) < os.path.getmtime(self.pack.path)):
+                os.makedirs(os.path.dirname(real_path), exist_ok=True)
+                with open(real_path + '.tmp', 'wb') as f:
+                    f.write(data)
+                os.replace(real_path + '.tmp', real_path)
+            self._real_paths[path] = real_path
+        return real_path
+
+def get_pack_path():
+    return os.path.join(get_items_dir(), PACK_NAME)
+
+def get_asset_fs():
+    """The asset file system of the game, opened on first use"""
+    global _asset_fs
+    if _asset_fs is not None:
+        return _asset_fs
+
+    pack = open_pack(get_pack_path())
+    if pack is not None:
+        # A pack built from other assets than the loose ones on disk is out of date
+        from utils.asset_manifest import get_manifest, get_content_signature
+        manifest = get_manifest()
+        # Only the content counts: copying the assets changes every modification time
+        if pack.manifest is None or get_content_signature(pack.manifest) != get_content_signature(manifest.data):
+            print(f"Asset pack {pack.path} doesn't match the asset folders, using the loose files")
+            pack.close()
+            pack = None
+        else:
+            print(f"Reading assets from {pack.path} ({len(pack.files)} files)")
+
+    _asset_fs = AssetFS(get_items_dir(), pack)
+    return _asset_fs
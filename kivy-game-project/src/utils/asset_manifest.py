@@ -0,0 +1,290 @@
+import os
+import json
+import struct
+import hashlib
+from utils.paths import get_items_dir
+from utils.settings_manager import get_settings_dir
+from utils.asset_pack import open_pack, PACK_NAME
+
+MANIFEST_NAME = 'asset_manifest.json'
+MANIFEST_VERSION = 2
+
+# Card images that go with each folder of card sounds
+SOUND_FOLDERS = {
+    'baralho_animais': 'audios_wav_animais',
+    'baralho_numeros': 'audios_numeros_wav',
+}
+BACKGROUND_FOLDER = 'fundo'
+MUSIC_FOLDER = 'Musicas_No_Copyright'
+CARD_BACKS_FOLDER = 'Parte_Traseira_Cartas'
+
+_manifest = None
+
+def read_png_size(path):
+    """Read the width and height of a PNG from its header, without decoding it"""
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if header[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+    return list(struct.unpack('>II', header[16:24]))
+
+def _file_sha1(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+def _get_sound_folder(deck_name):
+    for prefix, sound_folder in SOUND_FOLDERS.items():
+        if deck_name.startswith(prefix):
+            return sound_folder
+    return None
+
+def _list_files(items_dir, folder, extensions):
+    path = os.path.join(items_dir, folder)
+    if not os.path.isdir(path):
+        return []
+    return sorted(f for f in os.listdir(path) if f.lower().endswith(extensions))
+
+def _list_assets(items_dir):
+    """
+    Names of the asset files the manifest describes, by folder. A manifest
+    whose listing differs (files added, removed or renamed) is rebuilt.
+    Unlike folder timestamps, the listing is the same on every machine.
+    """
+    listing = {}
+    for entry in sorted(os.listdir(items_dir)):
+        if entry.startswith('baralho_') or entry == CARD_BACKS_FOLDER:
+            listing[entry] = _list_files(items_dir, entry, ('.png',))
+        elif entry in SOUND_FOLDERS.values():
+            listing[entry] = _list_files(items_dir, entry, ('.wav',))
+    listing[BACKGROUND_FOLDER] = _list_files(items_dir, BACKGROUND_FOLDER, ('.jpg', '.jpeg', '.png'))
+    listing[MUSIC_FOLDER] = _list_files(items_dir, MUSIC_FOLDER, ('.mp3', '.wav', '.ogg'))
+    return listing
+
+def _file_stat(path):
+    """Size and modification time of a file, a change means the file must be hashed again"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def _describe_card(card, image_path):
+    """Fill in everything the manifest knows about a card image (reads and hashes the file)"""
+    from utils.texture_atlas import ATLAS_TIERS
+    size = read_png_size(image_path)
+    card['size'] = size
+    # Size of the card in every downscaled atlas tier
+    card['tiers'] = {str(tier): [tier, round(size[1] * tier / size[0])] for tier in ATLAS_TIERS} if size else {}
+    card['bytes'] = os.path.getsize(image_path)
+    card['stat'] = _file_stat(image_path)
+    card['sha1'] = _file_sha1(image_path)
+    return card
+
+def build_manifest(items_dir):
+    """
+    Scan the asset folders once and describe everything the game loads.
+
+    Returns:
+        dict: {'decks': {deck: {'cards': [{id, image, size, tiers, bytes, stat, sha1, sound}]}},
+               'backgrounds': [...], 'music': [...]} with paths relative to items_dir
+    """
+    print(f"Building asset manifest for {items_dir}")
+    listing = _list_assets(items_dir)
+    data = {
+        'version': MANIFEST_VERSION,
+        'files': listing,
+        'decks': {},
+        'backgrounds': [f"{BACKGROUND_FOLDER}/{f}" for f in listing[BACKGROUND_FOLDER]],
+        'music': [f"{MUSIC_FOLDER}/{f}" for f in listing[MUSIC_FOLDER]],
+    }
+
+    for deck_name in sorted(listing):
+        if not (deck_name.startswith('baralho_') or deck_name == CARD_BACKS_FOLDER):
+            continue
+
+        # Sound files are matched without caring about case (BEAR.png -> bear.wav)
+        sound_folder = _get_sound_folder(deck_name)
+        sounds = {f.lower(): f for f in _list_files(items_dir, sound_folder, ('.wav',))} if sound_folder else {}
+
+        cards = []
+        for image_name in listing[deck_name]:
+            card_id = os.path.splitext(image_name)[0]
+            # Black and white cards share the sounds of the colour deck
+            sound_name = sounds.get(card_id.replace('_B&W', '').lower() + '.wav')
+            cards.append(_describe_card({
+                'id': card_id,
+                'image': f"{deck_name}/{image_name}",
+                'sound': f"{sound_folder}/{sound_name}" if sound_name else None,
+            }, os.path.join(items_dir, deck_name, image_name)))
+        data['decks'][deck_name] = {'cards': cards}
+
+    return data
+
+def save_manifest(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+def refresh_manifest(data, items_dir):
+    """
+    Bring the cards of a manifest up to date with the files on disk.
+
+    Every card image is stat'ed and only the ones whose size or
+    modification time changed are hashed again (an image edited in place,
+    or every image the first time a shipped manifest is used on another
+    machine). Returns True if a card changed.
+    """
+    changed = False
+    for deck in data['decks'].values():
+        for card in deck['cards']:
+            image_path = os.path.join(items_dir, *card['image'].split('/'))
+            if card.get('stat') != _file_stat(image_path):
+                _describe_card(card, image_path)
+                changed = True
+    return changed
+
+def _load_manifest_file(path, items_dir):
+    """
+    Load a manifest file, None if it's missing or files were added or removed since.
+
+    Returns:
+        tuple: (data, True if cards had to be hashed again) or None
+    """
+    try:
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != MANIFEST_VERSION or data.get('files') != _list_assets(items_dir):
+            return None
+        return data, refresh_manifest(data, items_dir)
+    except Exception as e:
+        print(f"Error loading asset manifest {path}: {e}")
+        return None
+
+def _load_pack_manifest(items_dir):
+    """Manifest stored in the asset pack, when the game ships without the loose asset folders"""
+    if any(name.startswith('baralho_') for name in os.listdir(items_dir)):
+        return None
+    pack = open_pack(os.path.join(items_dir, PACK_NAME))
+    if pack is None:
+        return None
+    data = pack.manifest
+    pack.close()
+    return data
+
+# Fields of a card that describe its content (not when or where the file was written)
+CONTENT_FIELDS = ('id', 'image', 'sha1', 'sound')
+
+def get_content_signature(data):
+    """The decks of a manifest reduced to their content, equal on every machine"""
+    return {
+        deck_name: [[card.get(field) for field in CONTENT_FIELDS] for card in deck['cards']]
+        for deck_name, deck in data['decks'].items()
+    }
+
+def get_pack_members(data, processed_sounds=None):
+    """
+    Files that go into the asset pack: card images, card sounds and backgrounds.
+    Sounds found in processed_sounds (sound -> processed files) are replaced by them.
+    """
+    processed_sounds = processed_sounds or {}
+    members = []
+    for deck in data['decks'].values():
+        for card in deck['cards']:
+            members.append(card['image'])
+            for sound in processed_sounds.get(card['sound'], [card['sound']] if card['sound'] else []):
+                if sound not in members:
+                    members.append(sound)
+    return members + data['backgrounds']
+
+class AssetManifest:
+    """Answers every asset question (deck cards, sounds, sizes, hashes) from memory"""
+
+    def __init__(self, items_dir, data):
+        self.items_dir = items_dir
+        self.data = data
+        self.decks = {}  # deck name -> list of card entries
+        self.cards = {}  # normalized image path -> card entry
+
+        for deck_name, deck in data['decks'].items():
+            entries = []
+            for card in deck['cards']:
+                entry = dict(card)
+                entry['image'] = self._abspath(card['image'])
+                entry['sound'] = self._abspath(card['sound']) if card['sound'] else None
+                entries.append(entry)
+                self.cards[entry['image']] = entry
+            self.decks[deck_name] = entries
+
+    def _abspath(self, relative_path):
+        return os.path.normpath(os.path.join(self.items_dir, *relative_path.split('/')))
+
+    def get_deck_cards(self, deck_dir):
+        """Card entries of a deck directory (None if the deck isn't in the manifest)"""
+        return self.decks.get(os.path.basename(os.path.normpath(deck_dir)))
+
+    def get_card_images(self, deck_dir):
+        cards = self.get_deck_cards(deck_dir)
+        return None if cards is None else [card['image'] for card in cards]
+
+    def get_card(self, image_path):
+        return self.cards.get(os.path.normpath(image_path))
+
+    def get_card_sound(self, image_path):
+        card = self.get_card(image_path)
+        return card['sound'] if card else None
+
+    def get_deck_sounds(self, deck_dir):
+        cards = self.get_deck_cards(deck_dir) or []
+        return [card['sound'] for card in cards if card['sound']]
+
+    def get_backgrounds(self):
+        return [self._abspath(path) for path in self.data['backgrounds']]
+
+    def get_music_files(self):
+        return [self._abspath(path) for path in self.data['music']]
+
+def get_manifest():
+    """
+    Load the asset manifest once per run.
+
+    The manifest kept in the settings directory is used when it lists the
+    same asset files, then the one shipped in Items_Jogo, then the one
+    inside assets.pack if the folders aren't there at all, otherwise a
+    fresh one is built. Cards edited since the manifest was written are
+    hashed again, and the up to date manifest is kept in the settings
+    directory so the next start only stats the files.
+    """
+    global _manifest
+    if _manifest is not None:
+        return _manifest
+
+    items_dir = get_items_dir()
+    user_manifest = os.path.join(get_settings_dir(), MANIFEST_NAME)
+    loaded = (_load_manifest_file(user_manifest, items_dir)
+              or _load_manifest_file(os.path.join(items_dir, MANIFEST_NAME), items_dir))
+    if loaded is not None:
+        data, changed = loaded
+    else:
+        data = _load_pack_manifest(items_dir)
+        changed = False
+        if data is None:
+            data = build_manifest(items_dir)
+            changed = True
+    if changed:
+        try:
+            save_manifest(data, user_manifest)
+        except Exception as e:
+            print(f"Error saving asset manifest: {e}")
+
+    _manifest = AssetManifest(items_dir, data)
+    return _manifest
+
+if __name__ == '__main__':
+    # Generate the manifest shipped with the assets: python -m utils.asset_manifest
+    items_dir = get_items_dir()
+    save_manifest(build_manifest(items_dir), os.path.join(items_dir, MANIFEST_NAME))
+    print(f"Asset manifest written to {os.path.join(items_dir, MANIFEST_NAME)}")
@@ -0,0 +1,157 @@
+import os
+import io
+import json
+import mmap
+import struct
+
+# File layout: header, members (each starting on a page boundary), table of contents
+# magic, version, flags, toc offset, toc size
+HEADER_FORMAT = '<4sHHQQ'
+HEADER_SIZE = 64
+MAGIC = b'MGPK'
+VERSION = 1
+# Members start on a page boundary so reading one never touches the pages of another
+MEMBER_ALIGNMENT = 4096
+
+PACK_NAME = 'assets.pack'
+
+def _align(offset):
+    return (offset + MEMBER_ALIGNMENT - 1) // MEMBER_ALIGNMENT * MEMBER_ALIGNMENT
+
+def build_pack(items_dir, pack_path, members, manifest=None):
+    """
+    Write the given asset files into one pack file.
+
+    Args:
+        items_dir (str): Directory the member paths are relative to
+        pack_path (str): Output file
+        members (list): Relative paths ('baralho_animais/BEAR.png'), always with '/'
+        manifest (dict): Asset manifest stored with the pack, so a game shipped
+            with only the pack doesn't need to scan any folder
+
+    Returns:
+        int: Size of the pack in bytes
+    """
+    files = {}
+    tmp_path = pack_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * HEADER_SIZE)
+        for relative_path in members:
+            offset = _align(f.tell())
+            f.seek(offset)
+            with open(os.path.join(items_dir, *relative_path.split('/')), 'rb') as src:
+                data = src.read()
+            f.write(data)
+            files[relative_path] = [offset, len(data)]
+
+        toc = json.dumps({'files': files, 'manifest': manifest}).encode('utf-8')
+        toc_offset = f.tell()
+        f.write(toc)
+        size = f.tell()
+
+        f.seek(0)
+        f.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, 0, toc_offset, len(toc)))
+    os.replace(tmp_path, pack_path)
+    return size
+
+class PackMemberReader(io.RawIOBase):
+    """Read-only file object over one member, reading straight from the mapping"""
+
+    def __init__(self, data):
+        super(PackMemberReader, self).__init__()
+        self._data = data
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._data[self._position:self._position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._data)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+class AssetPack:
+    """An opened pack: members are slices of one memory mapping, nothing is copied"""
+
+    def __init__(self, pack_path):
+        self.path = pack_path
+        with open(pack_path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise ValueError(f"Truncated asset pack: {pack_path}")
+            magic, version, _, toc_offset, toc_size = struct.unpack_from(HEADER_FORMAT, header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a supported asset pack: {pack_path}")
+            self._mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._view = memoryview(self._mapping)
+        toc = json.loads(bytes(self._view[toc_offset:toc_offset + toc_size]).decode('utf-8'))
+        self.files = toc['files']
+        self.manifest = toc.get('manifest')
+
+    def __contains__(self, relative_path):
+        return relative_path in self.files
+
+    def read(self, relative_path):
+        """Bytes of a member as a memoryview into the mapping (KeyError if it's not packed)"""
+        offset, size = self.files[relative_path]
+        return self._view[offset:offset + size]
+
+    def open(self, relative_path):
+        """Binary file object for a member, e.g. to give to Pillow"""
+        return io.BufferedReader(PackMemberReader(self.read(relative_path)))
+
+    def close(self):
+        """
+        Close the pack. The memoryviews from read() and the readers from
+        open() belong to their callers (a texture or a sound may keep one
+        for as long as it lives): while one of them is alive the mapping
+        can't be closed, it is then unmapped when the last of them is
+        garbage collected instead.
+        """
+        self._view.release()
+        try:
+            self._mapping.close()
+        except BufferError:
+            pass
+
+def open_pack(pack_path):
+    """Open a pack, None if there is none or it can't be read"""
+    if not os.path.exists(pack_path):
+        return None
+    try:
+        return AssetPack(pack_path)
+    except Exception as e:
+        print(f"Error opening asset pack {pack_path}: {e}")
+        return None
+
+if __name__ == '__main__':
+    # Pack the decks, card sounds and backgrounds into Items_Jogo/assets.pack: python -m utils.asset_pack
+    from utils.paths import get_items_dir
+    from utils.asset_manifest import build_manifest, get_pack_members
+    from utils.audio_preprocess import get_processed_files, PROCESSED_FOLDER, AUDIO_MANIFEST_NAME
+    items_dir = get_items_dir()
+    manifest = build_manifest(items_dir)
+    # The processed card sounds (python -m utils.audio_preprocess) replace the original ones
+    processed_sounds = get_processed_files()
+    members = get_pack_members(manifest, processed_sounds)
+    if processed_sounds:
+        members.append(f"{PROCESSED_FOLDER}/{AUDIO_MANIFEST_NAME}")
+    pack_path = os.path.join(items_dir, PACK_NAME)
+    size = build_pack(items_dir, pack_path, members, manifest)
+    print(f"Asset pack written to {pack_path}: {len(members)} files, {size // 1024} KB")
@@ -0,0 +1,119 @@
+import time
+from kivy.clock import Clock
+from utils.pcm_bank import pcm_bank, VOICES
+
+# Priorities of the sounds competing for a voice, higher wins
+PRIORITY_UI = 0
+PRIORITY_CARD = 1
+
+# Music volume while a card sound plays, as a fraction of the chosen volume
+DUCK_LEVEL = 0.35
+
+class AudioMixer:
+    """
+    Decides which sound effects play: a fixed pool of voices, so tapping
+    faster never starts more sounds at once, with the music ducked under them.
+
+    When every voice is busy the new sound takes the voice of the oldest
+    sound with the same or a lower priority (the card just flipped beats the
+    card flipped before it); if every playing sound matters more it is dropped.
+    Voices are played by the PCM bank when it is loaded, by Kivy sounds otherwise.
+    """
+
+    def __init__(self, voices=VOICES):
+        # Allocated once: [sound, priority, started, ends] per voice
+        self.voices = [[None, PRIORITY_UI, 0.0, 0.0] for _ in range(voices)]
+        self.music_manager = None
+        self.duck_event = None
+        self.ducked_until = 0.0
+
+    def attach_music(self, music_manager):
+        """Duck this music manager while sound effects play"""
+        self.music_manager = music_manager
+
+    def _pick_voice(self, priority, now):
+        free = None
+        victim = None
+        for index, (sound, voice_priority, started, ends) in enumerate(self.voices):
+            if sound is None or now >= ends:
+                free = index
+                break
+            if voice_priority <= priority and (victim is None or started < self.voices[victim][2]):
+                victim = index
+        if free is not None:
+            return free
+        if victim is not None:
+            self._stop_voice(victim)
+        return victim
+
+    def _stop_voice(self, index):
+        sound = self.voices[index][0]
+        if sound is pcm_bank:
+            pcm_bank.stop(index)
+        elif sound is not None and sound.state == 'play':
+            sound.stop()
+        self.voices[index][0] = None
+
+    def play(self, sound_path, kivy_sound=None, priority=PRIORITY_CARD):
+        """
+        Play a sound effect through a voice of the pool.
+
+        Args:
+            sound_path (str): Sound file, played from the PCM bank when it has it
+            kivy_sound: Loaded Kivy Sound used when the PCM bank can't play it
+            priority (int): PRIORITY_CARD or PRIORITY_UI
+
+        Returns:
+            bool: False if the sound couldn't play (nothing to play or no voice left)
+        """
+        use_pcm = sound_path is not None and pcm_bank.has_sound(sound_path)
+        if not use_pcm and kivy_sound is None:
+            return False
+
+        now = time.time()
+        if not use_pcm:
+            # Both cards of a pair share one Kivy sound, it can only be on one voice
+            for voice in self.voices:
+                if voice[0] is kivy_sound:
+                    voice[0] = None
+        index = self._pick_voice(priority, now)
+        if index is None:
+            return False
+
+        if use_pcm:
+            pcm_bank.play(sound_path, index)
+            sound, length = pcm_bank, pcm_bank.get_length(sound_path)
+        else:
+            # Restart from the beginning if this sound is still playing on another voice
+            if kivy_sound.state == 'play':
+                kivy_sound.stop()
+            kivy_sound.play()
+            sound, length = kivy_sound, kivy_sound.length or 1.0
+
+        voice = self.voices[index]
+        voice[0], voice[1], voice[2], voice[3] = sound, priority, now, now + length
+        self._duck(now + length)
+        return True
+
+    def _duck(self, until):
+        """Lower the music until the last sound effect ends"""
+        if self.music_manager is None or until <= self.ducked_until:
+            return
+        self.ducked_until = until
+        self.music_manager.set_duck(DUCK_LEVEL)
+        if self.duck_event:
+            self.duck_event.cancel()
+        self.duck_event = Clock.schedule_once(self._restore_music, until - time.time())
+
+    def _restore_music(self, dt):
+        self.duck_event = None
+        self.ducked_until = 0.0
+        if self.music_manager:
+            self.music_manager.set_duck(1.0)
+
+    def stop_all(self):
+        for index in range(len(self.voices)):
+            self._stop_voice(index)
+
+# Shared by the whole game
+audio_mixer = AudioMixer()
@@ -0,0 +1,208 @@
+import os
+import json
+import wave
+from utils.paths import get_items_dir
+from utils.asset_manifest import SOUND_FOLDERS
+from utils.asset_fs import get_asset_fs
+
+# NumPy is only needed to process the clips (python -m utils.audio_preprocess),
+# soundfile only to write the compact Ogg Vorbis versions
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import soundfile
+except (ImportError, OSError):  # OSError when libsndfile itself is missing
+    soundfile = None
+
+PROCESSED_FOLDER = 'audios_processados'
+AUDIO_MANIFEST_NAME = 'audio_manifest.json'
+AUDIO_MANIFEST_VERSION = 1
+
+# Anything quieter than this (relative to full scale) counts as silence
+SILENCE_THRESHOLD_DB = -50.0
+# Kept around the sound so attacks and tails aren't cut
+LEAD_PAD_MS = 5
+TAIL_PAD_MS = 40
+# Every clip is brought to the same loudness (RMS of the non silent part)...
+TARGET_RMS_DB = -18.0
+# ...unless that would push its peaks over this
+PEAK_LIMIT_DB = -1.0
+# Stereo clips whose channels differ less than this are stored as mono
+MONO_TOLERANCE = 1.0 / 2048
+
+_processed_clips = None
+_checked_clips = {}
+
+def _db_to_gain(db):
+    return 10.0 ** (db / 20.0)
+
+def read_wav(path):
+    """Read a 16 bit WAV as float32 samples in [-1, 1] with shape (frames, channels)"""
+    with wave.open(path, 'rb') as wav:
+        channels = wav.getnchannels()
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"Only 16 bit WAV files are supported: {path}")
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    samples = np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768.0
+    return samples.reshape(-1, channels), rate
+
+def find_sound_bounds(samples, rate):
+    """First and last frame (exclusive) that aren't silence, with some padding"""
+    level = np.abs(samples).max(axis=1)
+    loud = np.flatnonzero(level > _db_to_gain(SILENCE_THRESHOLD_DB))
+    if not len(loud):
+        return 0, len(samples)
+    start = max(0, loud[0] - rate * LEAD_PAD_MS // 1000)
+    end = min(len(samples), loud[-1] + 1 + rate * TAIL_PAD_MS // 1000)
+    return int(start), int(end)
+
+def get_normalization_gain(samples):
+    """Gain that brings the clip to TARGET_RMS_DB without its peaks going over PEAK_LIMIT_DB"""
+    rms = float(np.sqrt(np.mean(np.square(samples)))) if samples.size else 0.0
+    peak = float(np.abs(samples).max()) if samples.size else 0.0
+    if rms == 0.0 or peak == 0.0:
+        return 1.0
+    return min(_db_to_gain(TARGET_RMS_DB) / rms, _db_to_gain(PEAK_LIMIT_DB) / peak)
+
+def process_clip(path):
+    """
+    Trim the silence of a clip, normalize its loudness and drop the second
+    channel if it is a copy of the first.
+
+    Returns:
+        tuple: (int16 samples of shape (frames, channels), sample rate, info dict)
+    """
+    samples, rate = read_wav(path)
+    start, end = find_sound_bounds(samples, rate)
+    trimmed = samples[start:end]
+
+    if trimmed.shape[1] == 2 and np.abs(trimmed[:, 0] - trimmed[:, 1]).max(initial=0) < MONO_TOLERANCE:
+        trimmed = trimmed.mean(axis=1, keepdims=True)
+
+    gain = get_normalization_gain(trimmed)
+    processed = np.clip(np.round(trimmed * gain * 32767.0), -32768, 32767).astype(np.int16)
+    info = {
+        'trimmed_lead_ms': round(start * 1000 / rate, 1),
+        'trimmed_tail_ms': round((len(samples) - end) * 1000 / rate, 1),
+        'gain_db': round(20 * np.log10(gain), 2),
+        'channels': processed.shape[1],
+        'rate': rate,
+        'duration': round(len(processed) / rate, 3),
+    }
+    return processed, rate, info
+
+def write_wav(path, samples, rate):
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(samples.shape[1])
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.astype('<i2').tobytes())
+
+def process_sounds(items_dir):
+    """
+    Process every card sound into items_dir/audios_processados and write the
+    audio manifest the game uses to find them.
+
+    Every clip gets a trimmed, normalized WAV (decoded by the PCM sound bank)
+    and, when soundfile is installed, a much smaller Ogg Vorbis copy that
+    Kivy plays.
+    """
+    output_dir = os.path.join(items_dir, PROCESSED_FOLDER)
+    clips = {}
+    for sound_folder in sorted(set(SOUND_FOLDERS.values())):
+        source_dir = os.path.join(items_dir, sound_folder)
+        if not os.path.isdir(source_dir):
+            continue
+        os.makedirs(os.path.join(output_dir, sound_folder), exist_ok=True)
+
+        for name in sorted(f for f in os.listdir(source_dir) if f.lower().endswith('.wav')):
+            source_path = os.path.join(source_dir, name)
+            try:
+                samples, rate, info = process_clip(source_path)
+            except Exception as e:
+                print(f"Error processing {source_path}: {e}")
+                continue
+
+            base = f"{PROCESSED_FOLDER}/{sound_folder}/{os.path.splitext(name)[0]}"
+            write_wav(os.path.join(items_dir, *(base + '.wav').split('/')), samples, rate)
+            info['wav'] = base + '.wav'
+            info['ogg'] = None
+            if soundfile is not None:
+                soundfile.write(os.path.join(items_dir, *(base + '.ogg').split('/')), samples, rate,
+                                format='OGG', subtype='VORBIS')
+                info['ogg'] = base + '.ogg'
+            info['source_bytes'] = os.path.getsize(source_path)
+            clips[f"{sound_folder}/{name}"] = info
+            print(f"{sound_folder}/{name}: -{info['trimmed_lead_ms']} ms lead, "
+                  f"-{info['trimmed_tail_ms']} ms tail, {info['gain_db']:+} dB")
+
+    manifest = {'version': AUDIO_MANIFEST_VERSION, 'clips': clips}
+    with open(os.path.join(output_dir, AUDIO_MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+def get_processed_clips():
+    """The processed clips listed in the audio manifest, {} if the tool was never run"""
+    global _processed_clips
+    if _processed_clips is not None:
+        return _processed_clips
+
+    _processed_clips = {}
+    asset_fs = get_asset_fs()
+    manifest_path = os.path.join(get_items_dir(), PROCESSED_FOLDER, AUDIO_MANIFEST_NAME)
+    try:
+        # The audio manifest may be inside the asset pack with the clips
+        if asset_fs.exists(manifest_path):
+            manifest = json.loads(bytes(asset_fs.read(manifest_path)).decode('utf-8'))
+            if manifest.get('version') == AUDIO_MANIFEST_VERSION:
+                _processed_clips = manifest['clips']
+    except Exception as e:
+        print(f"Error loading audio manifest: {e}")
+    return _processed_clips
+
+def get_processed_files():
+    """Processed files that replace each card sound, by sound path relative to Items_Jogo"""
+    return {
+        source: [info['wav']] + ([info['ogg']] if info['ogg'] else [])
+        for source, info in get_processed_clips().items()
+    }
+
+def get_playable_sound(sound_path, compact=True):
+    """
+    File to load for a card sound: its processed version when there is one.
+
+    Args:
+        sound_path (str): Original sound file (the one in the asset manifest)
+        compact (bool): Prefer the Ogg Vorbis copy (for Kivy), the processed WAV otherwise
+    """
+    clips = get_processed_clips()
+    if not clips:
+        return sound_path
+
+    items_dir = get_items_dir()
+    relative_path = os.path.relpath(sound_path, items_dir).replace(os.sep, '/')
+    info = clips.get(relative_path)
+    if info is None:
+        return sound_path
+
+    # A clip processed from another version of the sound is out of date
+    if relative_path not in _checked_clips:
+        _checked_clips[relative_path] = not os.path.exists(sound_path) or os.path.getsize(sound_path) == info['source_bytes']
+    if not _checked_clips[relative_path]:
+        return sound_path
+
+    processed = info['ogg'] if compact and info['ogg'] else info['wav']
+    return os.path.join(items_dir, *processed.split('/'))
+
+if __name__ == '__main__':
+    # Process the card sounds: python -m utils.audio_preprocess
+    if np is None:
+        raise SystemExit("NumPy is required to process the sounds")
+    items_dir = get_items_dir()
+    process_sounds(items_dir)
+    if soundfile is None:
+        print("soundfile not installed, only the processed WAV files were written")
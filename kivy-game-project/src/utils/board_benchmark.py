@@ -0,0 +1,95 @@
+import os
+import sys
+import math
+import time
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.uix.screenmanager import ScreenManager
+from utils.settings_manager import load_settings
+from utils.paths import get_items_dir
+from utils.latency_monitor import percentile
+
+# Boards measured by default: the biggest regular board, the huge boards and one bigger still
+DEFAULT_SIZES = (42, 400, 1600, 6400)
+# Frames measured on every board, the board scrolls a little on each of them
+FRAMES_PER_BOARD = 300
+# Frames left out after a board is built (textures are uploaded during those)
+WARMUP_FRAMES = 30
+SCROLL_STEP = 0.005
+
+def get_grid_size(num_cards):
+    cols = math.ceil(math.sqrt(num_cards))
+    return cols, math.ceil(num_cards / cols)
+
+class BoardBenchmarkApp(App):
+    """
+    Plays no game: builds boards of growing size on a GameScreen and measures
+    the frame time while the board scrolls diagonally, one board after the
+    other. With viewport culling the frame time and the number of card
+    rectangles drawn should not grow with the board.
+    """
+
+    def __init__(self, sizes, **kwargs):
+        super(BoardBenchmarkApp, self).__init__(**kwargs)
+        self.settings = load_settings()
+        self.sizes = list(sizes)
+        self.results = []
+        self.frame_times = []
+        self.last_flip = None
+        self.frame = 0
+
+    def build(self):
+        from screens.game_screen import GameScreen
+        self.game_screen = GameScreen(name='game_screen')
+        manager = ScreenManager()
+        manager.add_widget(self.game_screen)
+        return manager
+
+    def on_start(self):
+        Window.bind(on_flip=self.on_frame_flip)
+        Clock.schedule_once(lambda dt: self.next_board(), 0)
+
+    def next_board(self):
+        if not self.sizes:
+            self.print_results()
+            self.stop()
+            return
+        num_cards = self.sizes.pop(0)
+        self.game_screen.set_grid_size(get_grid_size(num_cards))
+        self.game_screen.apply_theme(os.path.join(get_items_dir(), "baralho_numeros"), num_cards)
+        self.num_cards = num_cards
+        self.frame_times = []
+        self.last_flip = None
+        self.frame = 0
+
+    def on_frame_flip(self, *args):
+        now = time.perf_counter()
+        if self.last_flip is not None and self.frame > WARMUP_FRAMES:
+            self.frame_times.append(now - self.last_flip)
+        self.last_flip = now
+        self.frame += 1
+
+        view = self.game_screen.huge_view
+        if self.game_screen.huge_board:
+            # Scroll every frame so the view keeps swapping the cards it draws
+            view.scroll_x = (view.scroll_x + SCROLL_STEP) % 1.0
+            view.scroll_y = (view.scroll_y - SCROLL_STEP) % 1.0
+        if self.frame >= FRAMES_PER_BOARD + WARMUP_FRAMES:
+            board_view = self.game_screen.get_board_view()
+            drawn = len(board_view.drawn) + len(board_view.pool)
+            values = sorted(self.frame_times)
+            self.results.append((self.num_cards, percentile(values, 0.50), percentile(values, 0.95), drawn))
+            # Not from inside on_flip, the next board is built between two frames
+            self.frame = -sys.maxsize
+            Clock.schedule_once(lambda dt: self.next_board(), 0)
+
+    def print_results(self):
+        print(f"{'cards':>6} {'p50 ms':>8} {'p95 ms':>8} {'drawn':>8}")
+        for num_cards, p50, p95, drawn in self.results:
+            print(f"{num_cards:>6} {p50 * 1000:>8.2f} {p95 * 1000:>8.2f} {drawn:>8}")
+
+if __name__ == '__main__':
+    # Frame time of growing boards: python -m utils.board_benchmark [cards ...]
+    sizes = [int(arg) for arg in sys.argv[1:] if arg.isdigit()] or DEFAULT_SIZES
+    BoardBenchmarkApp(sizes).run()
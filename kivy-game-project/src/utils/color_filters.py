@@ -0,0 +1,102 @@
+# Colour transforms used to generate the colorblind versions of the decks.
+# Every filter is a single 3x3 matrix applied to the RGB channels, so a whole
+# atlas page is converted with one vectorized NumPy product.
+
+# NumPy is optional: without it the game falls back to the black and white decks on disk
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+COLOR = 'color'
+GRAYSCALE = 'grayscale'
+PROTAN = 'protan'
+DEUTAN = 'deutan'
+TRITAN = 'tritan'
+
+# Filters offered in the accessibility options
+COLORBLIND_FILTERS = (GRAYSCALE, PROTAN, DEUTAN, TRITAN)
+
+# Colour vision deficiency simulation (Machado, Oliveira and Fernandes 2009, severity 1.0)
+_SIMULATION = {
+    PROTAN: ((0.152286, 1.052583, -0.204868),
+             (0.114503, 0.786281, 0.099216),
+             (-0.003882, -0.048116, 1.051998)),
+    DEUTAN: ((0.367322, 0.860646, -0.227968),
+             (0.280085, 0.672501, 0.047413),
+             (-0.011820, 0.042940, 0.968881)),
+    TRITAN: ((1.255528, -0.076749, -0.178779),
+             (-0.078411, 0.930809, 0.147602),
+             (0.004733, 0.691367, 0.303900)),
+}
+
+# Where the colour information lost by each deficiency is moved to (daltonization)
+_ERROR_SHIFT = {
+    PROTAN: ((0.0, 0.0, 0.0), (0.7, 1.0, 0.0), (0.7, 0.0, 1.0)),
+    DEUTAN: ((0.0, 0.0, 0.0), (0.7, 1.0, 0.0), (0.7, 0.0, 1.0)),
+    TRITAN: ((1.0, 0.0, 0.7), (0.0, 1.0, 0.7), (0.0, 0.0, 0.0)),
+}
+
+# Rec. 709 luma weights
+_LUMA = (0.2126, 0.7152, 0.0722)
+
+_matrices = {}
+
+def is_available():
+    """Check if the colour filters can be used (the decks are filtered while building their atlas)"""
+    return np is not None and PILImage is not None
+
+def get_filter_matrix(mode):
+    """Return the 3x3 matrix that applies a filter to an RGB column vector"""
+    if mode in _matrices:
+        return _matrices[mode]
+
+    if mode == GRAYSCALE:
+        matrix = np.array([_LUMA] * 3, dtype=np.float32)
+    elif mode in _SIMULATION:
+        # daltonized = rgb + shift @ (rgb - simulated) = (I + shift @ (I - simulation)) @ rgb
+        identity = np.eye(3, dtype=np.float32)
+        simulation = np.array(_SIMULATION[mode], dtype=np.float32)
+        shift = np.array(_ERROR_SHIFT[mode], dtype=np.float32)
+        matrix = identity + shift @ (identity - simulation)
+    else:
+        raise ValueError(f"Unknown colour filter: {mode}")
+
+    _matrices[mode] = matrix
+    return matrix
+
+def apply_filter(pixels, mode):
+    """
+    Apply a colour filter to an RGBA image.
+
+    Args:
+        pixels (numpy.ndarray): uint8 array of shape (height, width, 4)
+        mode (str): One of COLORBLIND_FILTERS
+
+    Returns:
+        numpy.ndarray: New uint8 array with the same shape, alpha untouched
+    """
+    if mode == COLOR:
+        return pixels
+
+    rgb = pixels[..., :3].reshape(-1, 3).astype(np.float32)
+    filtered = rgb @ get_filter_matrix(mode).T
+    np.clip(filtered, 0, 255, out=filtered)
+
+    result = np.empty_like(pixels)
+    result[..., :3] = (filtered + 0.5).astype(np.uint8).reshape(pixels.shape[:-1] + (3,))
+    result[..., 3] = pixels[..., 3]
+    return result
+
+def filter_image(image, mode):
+    """Apply a colour filter to a Pillow RGBA image, returning a new image"""
+    if mode == COLOR:
+        return image
+
+    pixels = np.asarray(image.convert('RGBA'))
+    return PILImage.fromarray(apply_filter(pixels, mode), 'RGBA')
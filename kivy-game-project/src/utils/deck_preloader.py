@@ -0,0 +1,180 @@
+import os
+import json
+import threading
+from kivy.clock import Clock
+from kivy.cache import Cache
+from kivy.atlas import Atlas
+from kivy.graphics.texture import Texture
+from utils.texture_atlas import ensure_deck_atlas, PILImage
+from utils.color_filters import COLOR
+from utils.sound_bank import sound_bank
+from utils.raw_texture_cache import RawTexture, open_raw_texture, write_raw_texture
+from utils.texture_manager import texture_manager, evict_atlas, texture_bytes, DECK
+
+class PreloadedAtlas(Atlas):
+    """Kivy atlas whose pages were already decoded on a worker thread"""
+
+    def __init__(self, filename, pages):
+        # pages maps each page file name to a RawTexture with its decoded pixels
+        self._pages = pages
+        super(PreloadedAtlas, self).__init__(filename)
+
+    def _load(self):
+        with open(self._filename, 'r') as f:
+            meta = json.load(f)
+
+        textures = {}
+        for page_name, ids in meta.items():
+            page = self._pages[page_name]
+            # Only the upload happens here, the pixels were decoded (or mapped) beforehand
+            texture = Texture.create(size=(page.width, page.height), colorfmt='rgba')
+            texture.blit_buffer(page.pixels, colorfmt='rgba', bufferfmt='ubyte')
+            page.close()
+            self.original_textures.append(texture)
+            for card_id, coords in ids.items():
+                textures[card_id] = texture.get_region(*coords)
+        self.textures = textures
+        # The pixels are on the GPU now, no need to keep a copy around
+        self._pages = None
+
+def load_atlas_pages(atlas_base):
+    """
+    Get the RGBA pixels of every page of an atlas (bottom row first, like OpenGL).
+
+    Pages are memory-mapped from the raw texture cache when it is up to date,
+    otherwise the PNG is decoded and the cache written for the next start.
+    Returns None if a page can't be loaded without Kivy's own image loader.
+    """
+    with open(atlas_base + '.atlas', 'r') as f:
+        meta = json.load(f)
+
+    atlas_dir = os.path.dirname(atlas_base)
+    pages = {}
+    for page_name in meta:
+        page_path = os.path.join(atlas_dir, page_name)
+        page = open_raw_texture(page_path)
+        if page is None:
+            if PILImage is None:
+                for loaded in pages.values():
+                    loaded.close()
+                return None
+            with PILImage.open(page_path) as img:
+                img = img.convert('RGBA').transpose(PILImage.FLIP_TOP_BOTTOM)
+                page = RawTexture(img.width, img.height, img.tobytes())
+            write_raw_texture(page_path, page.width, page.height, page.pixels)
+        pages[page_name] = page
+    return pages
+
+def get_atlas_key(atlas_base):
+    """Key kivy.core.image uses to cache the atlas behind atlas:// uris"""
+    return atlas_base.replace(os.sep, '/')
+
+def register_atlas(atlas_base, atlas, category=DECK):
+    """Put a loaded atlas in Kivy's cache and under the texture budget"""
+    key = get_atlas_key(atlas_base)
+    Cache.append('kv.atlas', key, atlas)
+    size_bytes = sum(texture_bytes(texture) for texture in atlas.original_textures)
+    texture_manager.register(key, category, size_bytes, evict_atlas)
+
+def install_atlas(atlas_base, category=DECK):
+    """Make an atlas resident right now, through the raw texture cache (UI thread only)"""
+    if atlas_base is None:
+        return True
+    if is_atlas_resident(atlas_base):
+        texture_manager.touch(get_atlas_key(atlas_base))
+        return True
+    try:
+        pages = load_atlas_pages(atlas_base)
+        if pages is None:
+            return False
+        register_atlas(atlas_base, PreloadedAtlas(atlas_base + '.atlas', pages), category)
+        return True
+    except Exception as e:
+        print(f"Error loading atlas {atlas_base}: {e}")
+        return False
+
+def is_atlas_resident(atlas_base):
+    """Check if Kivy already has this atlas loaded"""
+    return Cache.get('kv.atlas', get_atlas_key(atlas_base)) is not None
+
+class DeckPreloader:
+    """
+    Loads a deck in the background while the player is still choosing the
+    difficulty, so GameScreen.apply_theme finds the textures and sounds ready.
+    """
+
+    def __init__(self):
+        self.deck_dir = None
+        self.cell_width = 0
+        self.variant = COLOR
+        self.pending_sounds = []
+        self.generation = 0  # Bumped on every new request, stale results are dropped
+        self.sound_event = None
+
+    def preload(self, deck_dir, cell_width, sound_paths=(), variant=COLOR, on_ready=None):
+        """
+        Start loading a deck atlas (worker thread) and its sounds (one per frame).
+
+        on_ready(atlas_base) is called on the UI thread once the atlas is
+        resident (atlas_base is None if the deck has to be used from its loose
+        images). It isn't called if another preload was started in between.
+        """
+        self.generation += 1
+        generation = self.generation
+        self.deck_dir = deck_dir
+        self.cell_width = cell_width
+        self.variant = variant
+
+        worker = threading.Thread(
+            target=self._load_atlas_worker,
+            args=(deck_dir, cell_width, variant, generation, on_ready),
+            daemon=True
+        )
+        worker.start()
+
+        # SoundLoader is not thread safe, spread the loading over the next frames instead
+        # (sounds already in the sound bank, e.g. from the previous game, are skipped)
+        self.pending_sounds = [path for path in sound_paths if not sound_bank.is_loaded(path)]
+        if self.sound_event is None and self.pending_sounds:
+            self.sound_event = Clock.schedule_interval(self._load_next_sound, 0)
+
+    def _load_atlas_worker(self, deck_dir, cell_width, variant, generation, on_ready):
+        atlas_base = pages = None
+        try:
+            atlas_base = ensure_deck_atlas(deck_dir, cell_width=cell_width, variant=variant)
+            if atlas_base is not None and not is_atlas_resident(atlas_base):
+                pages = load_atlas_pages(atlas_base)
+        except Exception as e:
+            print(f"Error preloading deck {deck_dir}: {e}")
+        if pages is None and on_ready is None:
+            return
+
+        # Textures can only be created on the UI thread
+        Clock.schedule_once(lambda dt: self._install_atlas(atlas_base, pages, generation, on_ready))
+
+    def _install_atlas(self, atlas_base, pages, generation, on_ready=None):
+        if generation != self.generation:
+            if pages:
+                for page in pages.values():
+                    page.close()
+            return
+        if pages:
+            if is_atlas_resident(atlas_base):
+                for page in pages.values():
+                    page.close()
+            else:
+                try:
+                    register_atlas(atlas_base, PreloadedAtlas(atlas_base + '.atlas', pages))
+                    print(f"Preloaded deck atlas: {os.path.basename(atlas_base)}")
+                except Exception as e:
+                    print(f"Error installing preloaded atlas: {e}")
+        if on_ready:
+            on_ready(atlas_base)
+
+    def _load_next_sound(self, dt):
+        if not self.pending_sounds:
+            self.sound_event = None
+            return False
+
+        sound_path = self.pending_sounds.pop(0)
+        sound_bank.preload(sound_path)
@@ -0,0 +1,131 @@
+import os
+import json
+import math
+import time
+from array import array
+
+# Metrics recorded for every card flip
+TAP_TO_FLIP = 'tap_to_flip'    # Touch released -> flip_card done (face and state updated)
+TAP_TO_PIXEL = 'tap_to_pixel'  # Touch released -> next frame swapped to the screen
+TAP_TO_SOUND = 'tap_to_sound'  # Touch released -> the card sound was started
+
+# Samples kept per metric, board size and settings combination
+DEFAULT_CAPACITY = 512
+
+class LatencyRing:
+    """Fixed size ring buffer of latency samples (seconds), no allocation per sample"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.samples = array('d', bytes(8 * capacity))
+        self.count = 0
+
+    def add(self, seconds):
+        self.samples[self.count % len(self.samples)] = seconds
+        self.count += 1
+
+    def values(self):
+        return list(self.samples[:min(self.count, len(self.samples))])
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+def get_settings_key(settings):
+    """The settings that change what a flip costs, as one readable string"""
+    colorblind = settings.get('colorblind_filter', 'grayscale') if settings.get('colorblind_mode', False) else 'off'
+    return ','.join([
+        f"colorblind={colorblind}",
+        f"lazy_faces={'on' if settings.get('lazy_card_faces', False) else 'off'}",
+        f"audio_assist={'on' if settings.get('audio_assist', False) else 'off'}",
+    ])
+
+class LatencyMonitor:
+    """
+    Records how long a card takes to react to a tap: until flip_card is done,
+    until the frame with the face is on screen and until its sound starts.
+
+    Samples are grouped by board size and settings, e.g.
+    ('tap_to_pixel', '4x4', 'colorblind=off,lazy_faces=off,audio_assist=on').
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.enabled = False
+        self.rings = {}  # (metric, board, settings) -> LatencyRing
+        self.board = None
+        self.settings_key = None
+        self._frame_waiting = []  # (metric ring, tap time) resolved on the next frame flip
+
+    def set_context(self, board, settings):
+        """Start grouping the samples under a new board size ('4x4') and settings"""
+        self.board = board
+        self.settings_key = get_settings_key(settings)
+
+    def _ring(self, metric):
+        key = (metric, self.board, self.settings_key)
+        ring = self.rings.get(key)
+        if ring is None:
+            ring = self.rings[key] = LatencyRing(self.capacity)
+        return ring
+
+    def record(self, metric, tap_time, now=None):
+        """Record the time from tap_time (time.time() clock, like Kivy touches) until now"""
+        if not self.enabled:
+            return
+        if now is None:
+            now = time.time()
+        self._ring(metric).add(now - tap_time)
+
+    def record_on_next_frame(self, metric, tap_time):
+        """Record the time from tap_time until the next frame reaches the screen"""
+        if self.enabled:
+            self._frame_waiting.append((self._ring(metric), tap_time))
+
+    def on_frame_flip(self, *args):
+        """Bound to Window.on_flip: the frame just swapped contains every change made before it"""
+        if not self._frame_waiting:
+            return
+        now = time.time()
+        for ring, tap_time in self._frame_waiting:
+            ring.add(now - tap_time)
+        self._frame_waiting = []
+
+    def get_percentiles(self):
+        """p50/p95/p99 in milliseconds for every metric, board size and settings seen"""
+        report = {}
+        for (metric, board, settings_key), ring in sorted(self.rings.items(), key=lambda item: tuple(map(str, item[0]))):
+            values = sorted(ring.values())
+            if not values:
+                continue
+            report.setdefault(metric, {}).setdefault(str(board), {})[settings_key] = {
+                'count': ring.count,
+                'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+            }
+        return report
+
+    def print_report(self):
+        for metric, boards in self.get_percentiles().items():
+            for board, combos in boards.items():
+                for settings_key, stats in combos.items():
+                    print(f"{metric} {board} [{settings_key}]: p50 {stats['p50_ms']} ms, "
+                          f"p95 {stats['p95_ms']} ms, p99 {stats['p99_ms']} ms ({stats['count']} taps)")
+
+    def save_report(self, path):
+        """Write the percentiles to a JSON file (kept next to the settings)"""
+        report = self.get_percentiles()
+        if not report:
+            return
+        try:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+        except Exception as e:
+            print(f"Error saving latency report: {e}")
+
+def get_report_path(settings_dir):
+    return os.path.join(settings_dir, 'latency_report.json')
+
+# Shared by the whole game, turned on by the 'latency_monitor' setting
+latency_monitor = LatencyMonitor()
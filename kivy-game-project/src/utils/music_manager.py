@@ -2,69 +2,43 @@ import os
 import random
 from kivy.core.audio import SoundLoader
 from kivy.clock import Clock
-from pathlib import Path
+from utils.paths import get_items_dir
+from utils.asset_manifest import get_manifest, MUSIC_FOLDER
+from utils.asset_fs import get_asset_fs
+from utils import music_stream
 
-def find_project_root():
-    """Find the project root directory by looking for known directories"""
-    # Start with the directory of this file and go up until we find the project root
-    current_dir = Path(__file__).resolve().parent.parent.parent.parent
-    
-    # Check if we're at the project root
-    if (current_dir / "Items_Jogo").exists():
-        return str(current_dir)
-    if (current_dir.parent / "Items_Jogo").exists():
-        return str(current_dir.parent)
-    
-    # Fallback to a hardcoded path but with the correct username from the file path
-    file_path = Path(__file__).resolve()
-    username = file_path.parts[2]  # Extract username from path
-    return os.path.join('C:', os.sep, 'Users', username, 'Documents', 'GitHub', 'IPC_24-25')
+# Without streaming support, the next track is loaded this long after one starts
+# (not when it ends, so the switch doesn't stall a frame). SoundLoader isn't
+# thread safe, so the load still runs on the UI thread and can hitch one frame
+# at that moment; install miniaudio and NumPy to open tracks on a worker thread
+PREFETCH_DELAY = 5
 
 class MusicManager:
     def __init__(self):
         self.current_music = None
+        self.next_music = None  # Kivy sound loaded ahead of time for the next track
         self.music_files = []
         self.volume = 1.0
+        self.duck = 1.0  # Lowered by the audio mixer while sound effects play
         self.enabled = True
         
-        # Find project root and set music folder path
-        project_root = find_project_root()
-        self.music_folder = os.path.join(project_root, "Items_Jogo", "Musicas_No_Copyright")
+        # Set music folder path
+        self.music_folder = os.path.join(get_items_dir(), MUSIC_FOLDER)
         print(f"Music folder path: {self.music_folder}")
         self.load_music_files()
         self.schedule = None
+        
+        # Stream the tracks and crossfade between them when miniaudio and NumPy are installed
+        self.streamer = music_stream.MusicStreamer(self.choose_next) if music_stream.is_available() else None
     
     def load_music_files(self):
-        """Load all music files from the music folder"""
-        print(f"Attempting to load music from: {self.music_folder}")
+        """Load the list of music files from the asset manifest"""
+        self.music_files = get_manifest().get_music_files()
         
-        if os.path.exists(self.music_folder):
-            print(f"Music folder exists. Checking contents...")
-            
-            # List all files in the directory
-            all_files = os.listdir(self.music_folder)
-            print(f"All files in directory: {all_files}")
-            
-            # Filter music files
-            self.music_files = [
-                os.path.join(self.music_folder, f) 
-                for f in all_files 
-                if f.lower().endswith(('.mp3', '.wav', '.ogg'))
-            ]
-            
-            if self.music_files:
-                print(f"Found {len(self.music_files)} music files: {[os.path.basename(f) for f in self.music_files]}")
-            else:
-                print(f"No music files (mp3, wav, ogg) found in {self.music_folder}")
+        if self.music_files:
+            print(f"Found {len(self.music_files)} music files: {[os.path.basename(f) for f in self.music_files]}")
         else:
-            print(f"ERROR: Music folder not found: {self.music_folder}")
-            # Try to check if parent directories exist
-            parent_dir = os.path.dirname(self.music_folder)
-            print(f"Checking if parent directory exists: {parent_dir}")
-            if os.path.exists(parent_dir):
-                print(f"Parent directory exists. Contents: {os.listdir(parent_dir)}")
-            else:
-                print(f"Parent directory does not exist.")
+            print(f"No music files (mp3, wav, ogg) found in {self.music_folder}")
     
     def play_random(self):
         """Start playing a random music track"""
@@ -86,21 +60,29 @@ class MusicManager:
             print(f"Error in play_random: {e}")
             return False
     
+    def choose_next(self, playing_file=None):
+        """Pick the track to play after playing_file (never the same one twice in a row)"""
+        candidates = [f for f in self.music_files if get_asset_fs().get_real_path(f) != playing_file]
+        return get_asset_fs().get_real_path(random.choice(candidates or self.music_files))
+    
     def play(self, music_file):
         """Play a specific music file"""
         if not self.enabled:
             print("Music is disabled. Not playing.")
             return False
         
+        if self.streamer:
+            # Opened on the streamer's worker thread, the next track is queued from there
+            self.streamer.volume = self.volume * self.duck
+            self.streamer.play(get_asset_fs().get_real_path(music_file))
+            return True
+        
         try:
             print(f"Attempting to load and play: {os.path.basename(music_file)}")
-            self.current_music = SoundLoader.load(music_file)
+            self.current_music = SoundLoader.load(get_asset_fs().get_real_path(music_file))
             
             if self.current_music:
-                self.current_music.volume = self.volume
-                print(f"Playing music with volume {self.volume}")
-                self.current_music.play()
-                self.current_music.bind(on_stop=self.on_music_end)
+                self._start_current()
                 print(f"Success! Now playing: {os.path.basename(music_file)}")
                 return True
             else:
@@ -112,22 +94,60 @@ class MusicManager:
             traceback.print_exc()
             return False
     
+    def _start_current(self):
+        self.current_music.volume = self.volume * self.duck
+        print(f"Playing music with volume {self.volume}")
+        self.current_music.play()
+        self.current_music.bind(on_stop=self.on_music_end)
+        # Load the next track while this one plays
+        self.schedule = Clock.schedule_once(self._prefetch_next, PREFETCH_DELAY)
+    
+    def _prefetch_next(self, dt):
+        """
+        Load the next track ahead of the handover (Kivy fallback only).
+
+        Runs on the UI thread: SoundLoader can't be used from another thread,
+        so a big track still costs one slow frame here, PREFETCH_DELAY seconds
+        into the current one, instead of a gap between the two tracks.
+        """
+        self.schedule = None
+        if self.next_music is None and self.current_music:
+            self.next_music = SoundLoader.load(self.choose_next(self.current_music.source))
+    
     def on_music_end(self, instance):
         """Called when a track finishes playing"""
-        if self.enabled:
-            # Schedule starting the next song with a small delay
-            self.schedule = Clock.schedule_once(lambda dt: self.play_random(), 1)
+        if not self.enabled or instance is not self.current_music:
+            return
+        
+        # Only the playing and the next track are ever loaded
+        instance.unbind(on_stop=self.on_music_end)
+        instance.unload()
+        if self.next_music:
+            # Start the prefetched track right away, no gap and no loading on the switch
+            self.current_music, self.next_music = self.next_music, None
+            self._start_current()
+        else:
+            self.current_music = None
+            self.schedule = Clock.schedule_once(lambda dt: self.play_random(), 0)
     
     def stop(self):
         """Stop the current music"""
-        if self.current_music:
-            if self.current_music.state == 'play':
-                self.current_music.stop()
-            self.current_music = None
+        if self.streamer:
+            self.streamer.stop()
         
         if self.schedule:
             self.schedule.cancel()
             self.schedule = None
+        
+        if self.current_music:
+            music, self.current_music = self.current_music, None
+            if music.state == 'play':
+                music.stop()
+            music.unload()
+        
+        if self.next_music:
+            self.next_music.unload()
+            self.next_music = None
     
     def set_enabled(self, enabled):
         """Enable or disable music"""
@@ -150,6 +170,16 @@ class MusicManager:
     def set_volume(self, volume):
         """Set music volume (0.0 to 1.0)"""
         self.volume = max(0, min(1, volume))
+        print(f"Updating music volume to {self.volume}")
+        self._apply_volume()
+    
+    def set_duck(self, level):
+        """Lower the music to a fraction of its volume (1.0 restores it)"""
+        self.duck = level
+        self._apply_volume()
+    
+    def _apply_volume(self):
+        if self.streamer:
+            self.streamer.volume = self.volume * self.duck
         if self.current_music:
-            print(f"Updating music volume to {self.volume}")
-            self.current_music.volume = self.volume
+            self.current_music.volume = self.volume * self.duck
@@ -0,0 +1,233 @@
+import threading
+
+# miniaudio decodes the tracks a few milliseconds at a time and NumPy mixes
+# them; without both MusicManager keeps playing whole tracks through Kivy
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import miniaudio
+except ImportError:
+    miniaudio = None
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+# The next track fades in while the current one fades out
+CROSSFADE_SECONDS = 3.0
+# Size of the device buffer: how much decoded audio exists at any time
+BUFFER_MSEC = 200
+# Biggest chunk decoded at once (the device asks for at most BUFFER_MSEC of audio)
+READ_FRAMES = 4096
+# Tracks that fail to open in a row before the worker stops trying (until the next handover or play())
+MAX_OPEN_FAILURES = 3
+
+def is_available():
+    return np is not None and miniaudio is not None
+
+class Track:
+    """A music file decoded on demand, only the requested frames are ever in memory"""
+
+    def __init__(self, path):
+        self.path = path
+        info = miniaudio.get_file_info(path)
+        self.total_frames = int(info.num_frames * SAMPLE_RATE / info.sample_rate)
+        self.position = 0
+        self.finished = False
+        self._stream = miniaudio.stream_file(
+            path,
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            nchannels=CHANNELS,
+            sample_rate=SAMPLE_RATE,
+            frames_to_read=READ_FRAMES
+        )
+
+    def read(self, frames):
+        """Decode the next frames as a float32 array of shape (n, CHANNELS), n <= frames"""
+        chunks = []
+        wanted = frames
+        while wanted > 0 and not self.finished:
+            try:
+                chunk = self._stream.send(min(wanted, READ_FRAMES))
+            except StopIteration:
+                chunk = b''
+            chunk = np.frombuffer(chunk, dtype=np.int16).reshape(-1, CHANNELS)
+            if len(chunk) < min(wanted, READ_FRAMES):
+                self.finished = True
+            chunks.append(chunk)
+            wanted -= len(chunk)
+        if not chunks:
+            return np.zeros((0, CHANNELS), dtype=np.float32)
+        samples = np.concatenate(chunks).astype(np.float32)
+        self.position += len(samples)
+        return samples
+
+    def remaining_frames(self):
+        return max(0, self.total_frames - self.position)
+
+class MusicStreamer:
+    """
+    Plays music tracks back to back through one output device, crossfading
+    from each track into the next.
+
+    The next track is chosen and opened on a worker thread while the current
+    one plays, so the handover never waits for a file. choose_next is called
+    (on that worker) with the path of the track that is about to play and
+    returns the one to queue after it. A track that can't be opened, or a
+    handover with no track ready, asks for another one, so the music never
+    stops on its own.
+    """
+
+    def __init__(self, choose_next):
+        self.choose_next = choose_next
+        self.volume = 1.0
+        self._applied_volume = 1.0  # Volume at the end of the last buffer, changes are ramped
+        self.current = None
+        self.next = None
+        self.device = None
+        self._fade_frames = int(CROSSFADE_SECONDS * SAMPLE_RATE)
+        self._wanted = None  # (path, generation) of the track to open next
+        self._handover = None  # (path, generation, empty) set by the audio thread when a track ends
+        self._failures = 0  # Tracks that failed to open in a row
+        self._generation = 0  # Bumped by stop(), tracks opened for an older one are dropped
+        self._wake = threading.Event()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def play(self, path):
+        """Start playing a track (opened on the worker thread), the queue follows on its own"""
+        self.stop()
+        with self._lock:
+            self._wanted = (path, self._generation)
+            self._failures = 0
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._prefetch_worker, daemon=True)
+            self._worker.start()
+        self._wake.set()
+
+    def _prefetch_worker(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                wanted, self._wanted = self._wanted, None
+                handover, self._handover = self._handover, None
+                # The audio thread only says a track ended, the next one is chosen here
+                # (a track already being requested is enough)
+                if wanted is None and handover is not None:
+                    played_path, generation, empty = handover
+                    if generation == self._generation:
+                        if empty:
+                            # A new round of attempts, even if the last ones all failed
+                            self._failures = 0
+                        wanted = (self.choose_next(played_path), generation)
+            if wanted is None:
+                continue
+            path, generation = wanted
+            try:
+                track = Track(path)
+            except Exception as e:
+                print(f"Error opening music track {path}: {e}")
+                self._failures += 1
+                if generation != self._generation:
+                    continue
+                if self._failures >= MAX_OPEN_FAILURES:
+                    print(f"{self._failures} music tracks failed to open in a row, trying again when the current one ends")
+                    continue
+                # Try another track instead of leaving the queue empty
+                self._request_next(path)
+                continue
+
+            self._failures = 0
+            if generation != self._generation:
+                continue
+            if self.current is None:
+                self.current = track
+                self._start_device()
+                print(f"Streaming music: {path}")
+                # Queue the following track right away
+                self._request_next(path)
+            else:
+                self.next = track
+                print(f"Next music track ready: {path}")
+
+    def _request_next(self, playing_path):
+        """Queue the track after playing_path (worker thread only, choose_next is app code)"""
+        with self._lock:
+            self._wanted = (self.choose_next(playing_path), self._generation)
+        self._wake.set()
+
+    def _start_device(self):
+        if self.device is not None:
+            return
+        self.device = miniaudio.PlaybackDevice(
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            nchannels=CHANNELS,
+            sample_rate=SAMPLE_RATE,
+            buffersize_msec=BUFFER_MSEC
+        )
+        generator = self._generator()
+        next(generator)
+        self.device.start(generator)
+
+    def _generator(self):
+        frames = yield b''
+        while True:
+            frames = yield self._mix(frames)
+
+    def _mix(self, frames):
+        """Produce the next frames of audio (runs on the audio thread)"""
+        out = np.zeros((frames, CHANNELS), dtype=np.float32)
+        current = self.current
+        if current is None:
+            return out.astype(np.int16)
+
+        start = current.remaining_frames()
+        samples = current.read(frames)
+        count = len(samples)
+        incoming = self.next
+
+        if incoming is not None and start < self._fade_frames + count:
+            # Crossfade: the gain of the current track goes from 1 to 0 over its last frames
+            gains = np.clip((start - np.arange(count)) / self._fade_frames, 0, 1)[:, None]
+            out[:count] = samples * gains
+            fading_in = incoming.read(count)
+            out[:len(fading_in)] += fading_in * (1 - gains[:len(fading_in)])
+        else:
+            out[:count] = samples
+
+        if current.finished:
+            # Gapless handover: the rest of this buffer already comes from the next track
+            self.current = incoming
+            self.next = None
+            if incoming is not None:
+                rest = incoming.read(frames - count)
+                out[count:count + len(rest)] = rest
+            # No lock and no app code on the audio thread: record what ended and wake
+            # the worker. Without an incoming track (slow or failed to open) the worker
+            # starts whatever it opens next as the current track
+            self._handover = (incoming.path if incoming is not None else current.path,
+                              self._generation, incoming is None)
+            self._wake.set()
+
+        # Ramp volume changes (e.g. ducking) over the buffer so they don't click
+        volume = self.volume
+        if volume != self._applied_volume:
+            out *= np.linspace(self._applied_volume, volume, frames, dtype=np.float32)[:, None]
+            self._applied_volume = volume
+        else:
+            out *= volume
+        return np.clip(out, -32768, 32767).astype(np.int16)
+
+    def stop(self):
+        """Stop the music and forget the queued track"""
+        with self._lock:
+            self._wanted = None
+            self._handover = None
+            self._generation += 1
+        if self.device is not None:
+            self.device.close()
+            self.device = None
+        self.current = None
+        self.next = None
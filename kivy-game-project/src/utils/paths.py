@@ -0,0 +1,30 @@
+import os
+from pathlib import Path
+
+# Computed once, every module asks for it
+_project_root = None
+
+def find_project_root():
+    """Find the project root directory by looking for known directories"""
+    global _project_root
+    if _project_root is not None:
+        return _project_root
+    
+    # Start with the directory of this file and go up until we find the project root
+    current_dir = Path(__file__).resolve().parent.parent.parent.parent
+    
+    # Check if we're at the project root
+    if (current_dir / "Items_Jogo").exists():
+        _project_root = str(current_dir)
+    elif (current_dir.parent / "Items_Jogo").exists():
+        _project_root = str(current_dir.parent)
+    else:
+        # Fallback to a hardcoded path but with the correct username from the file path
+        file_path = Path(__file__).resolve()
+        username = file_path.parts[2]  # Extract username from path
+        _project_root = os.path.join('C:', os.sep, 'Users', username, 'Documents', 'GitHub', 'IPC_24-25')
+    return _project_root
+
+def get_items_dir():
+    """Directory with all the game assets"""
+    return os.path.join(find_project_root(), "Items_Jogo")
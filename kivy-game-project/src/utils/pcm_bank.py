@@ -0,0 +1,236 @@
+import wave
+import threading
+from utils.asset_fs import get_asset_fs
+from utils.asset_manifest import get_manifest, SOUND_FOLDERS
+from utils.audio_preprocess import get_playable_sound
+
+# NumPy and sounddevice are optional: without them audio assistance plays
+# through Kivy's Sound objects like every other sound
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError):  # OSError when the PortAudio library itself is missing
+    sd = None
+
+# Every card sound is converted to this format once, when the bank is loaded
+SAMPLE_RATE = 48000
+CHANNELS = 2
+# Frames per audio callback: 256 frames is 5.3 ms at 48 kHz, well under one 60 Hz frame
+BLOCK_SIZE = 256
+# Latency measurements kept for the report
+LATENCY_SAMPLES = 256
+# Sounds that can play at the same time, the audio mixer decides which voice plays what
+VOICES = 4
+# Entry that silences a voice
+_SILENCE = (0, 0)
+
+_SAMPLE_TYPES = {1: 'u1', 2: '<i2', 4: '<i4'}
+
+def is_available():
+    return np is not None and sd is not None
+
+def decode_wav(f):
+    """
+    Decode a WAV file to 16 bit stereo PCM at SAMPLE_RATE.
+
+    Returns:
+        numpy.ndarray: int16 array of shape (frames, CHANNELS)
+    """
+    with wave.open(f, 'rb') as wav:
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    if sample_width not in _SAMPLE_TYPES:
+        raise ValueError(f"Unsupported WAV sample width: {sample_width * 8} bits")
+    samples = np.frombuffer(frames, dtype=_SAMPLE_TYPES[sample_width]).astype(np.float32)
+    if sample_width == 1:
+        samples = (samples - 128) * 256
+    elif sample_width == 4:
+        samples /= 65536
+    samples = samples.reshape(-1, channels)
+
+    # Mono sounds go to both speakers, extra channels are dropped
+    if channels == 1:
+        samples = np.repeat(samples, CHANNELS, axis=1)
+    samples = samples[:, :CHANNELS]
+
+    if rate != SAMPLE_RATE and len(samples):
+        # Linear resampling is plenty for short spoken words and animal sounds
+        length = max(1, round(len(samples) * SAMPLE_RATE / rate))
+        source_times = np.arange(len(samples)) / rate
+        target_times = np.arange(length) / SAMPLE_RATE
+        samples = np.stack([np.interp(target_times, source_times, samples[:, c]) for c in range(CHANNELS)], axis=1)
+
+    return np.clip(samples, -32768, 32767).astype(np.int16)
+
+def get_audio_assist_sounds():
+    """Sound files of every card that has one (the audio assistance set)"""
+    manifest = get_manifest()
+    sound_paths = []
+    for deck in SOUND_FOLDERS:
+        sound_paths.extend(manifest.get_deck_sounds(deck))
+    return sound_paths
+
+class PCMBank:
+    """
+    All the audio assistance sounds, decoded once into one shared PCM buffer
+    and played by an always open output stream.
+
+    play() only hands a precomputed (start, end) pair to one of the voices of
+    the audio callback, which mixes them into a buffer allocated up front,
+    so triggering a sound never decodes, opens or allocates anything. The
+    callback measures how long it took from play() to the moment the first
+    sample reaches the speaker (tap to audio start, play() runs in the touch
+    handler).
+    """
+
+    def __init__(self, voices=VOICES):
+        self.voices = voices
+        self.buffer = None
+        self.index = {}  # sound path -> (start frame, end frame) in buffer
+        self.stream = None
+        self.ready = False
+        self._loading = False
+
+        # Shared with the audio callback, one slot per voice
+        self._pending = [None] * voices
+        self._pending_times = [0.0] * voices
+        self._positions = [0] * voices
+        self._ends = [0] * voices
+        self._mix = None
+        self.latencies = None
+        self.latency_count = 0
+
+    def load(self, sound_paths):
+        """Decode the sounds and open the output stream (slow, see load_async)"""
+        asset_fs = get_asset_fs()
+        chunks = []
+        index = {}
+        position = 0
+        for sound_path in sound_paths:
+            try:
+                # Processed clips start right at the sound, no leading silence to play through
+                with asset_fs.open(get_playable_sound(sound_path, compact=False)) as f:
+                    samples = decode_wav(f)
+            except Exception as e:
+                print(f"Error decoding {sound_path}: {e}")
+                continue
+            index[sound_path] = (position, position + len(samples))
+            chunks.append(samples)
+            position += len(samples)
+
+        self.buffer = np.concatenate(chunks) if chunks else np.zeros((0, CHANNELS), dtype=np.int16)
+        self.index = index
+        self.latencies = np.zeros(LATENCY_SAMPLES, dtype=np.float64)
+        self._mix = np.zeros((BLOCK_SIZE, CHANNELS), dtype=np.int32)
+
+        self.stream = sd.OutputStream(
+            samplerate=SAMPLE_RATE,
+            channels=CHANNELS,
+            dtype='int16',
+            blocksize=BLOCK_SIZE,
+            latency='low',
+            callback=self._callback
+        )
+        self.stream.start()
+        self.ready = True
+        print(f"PCM sound bank ready: {len(index)} sounds, {self.buffer.nbytes // 1024} KB, "
+              f"output latency {self.stream.latency * 1000:.1f} ms")
+
+    def load_async(self, sound_paths=None):
+        """Load the bank on a worker thread, sounds play through Kivy until it is ready"""
+        if not is_available() or self.ready or self._loading:
+            return
+        self._loading = True
+        if sound_paths is None:
+            sound_paths = get_audio_assist_sounds()
+
+        def worker():
+            try:
+                self.load(sound_paths)
+            except Exception as e:
+                print(f"Error loading the PCM sound bank: {e}")
+            finally:
+                self._loading = False
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def has_sound(self, sound_path):
+        return self.ready and sound_path in self.index
+
+    def get_length(self, sound_path):
+        """Duration of a sound in seconds (0 if it isn't in the bank)"""
+        start, end = self.index.get(sound_path, _SILENCE)
+        return (end - start) / SAMPLE_RATE
+
+    def play(self, sound_path, voice=0):
+        """Start a sound on a voice right away, replacing what it was playing. False if it isn't in the bank"""
+        if not self.ready:
+            return False
+        entry = self.index.get(sound_path)
+        if entry is None:
+            return False
+        # Time first: the callback takes the entry as soon as it sees it
+        self._pending_times[voice] = self.stream.time
+        self._pending[voice] = entry
+        return True
+
+    def stop(self, voice):
+        """Silence a voice"""
+        self._pending_times[voice] = 0.0
+        self._pending[voice] = _SILENCE
+
+    def _callback(self, outdata, frames, time_info, status):
+        mix = self._mix[:frames] if frames <= len(self._mix) else np.zeros((frames, CHANNELS), dtype=np.int32)
+        mix[:] = 0
+        for voice in range(self.voices):
+            pending = self._pending[voice]
+            if pending is not None:
+                self._pending[voice] = None
+                self._positions[voice], self._ends[voice] = pending
+                # Some host APIs don't report the DAC time, don't record nonsense then
+                if pending is not _SILENCE and time_info.outputBufferDacTime > 0:
+                    self.latencies[self.latency_count % LATENCY_SAMPLES] = time_info.outputBufferDacTime - self._pending_times[voice]
+                    self.latency_count += 1
+
+            position = self._positions[voice]
+            count = max(0, min(frames, self._ends[voice] - position))
+            if count:
+                mix[:count] += self.buffer[position:position + count]
+                self._positions[voice] = position + count
+
+        np.clip(mix, -32768, 32767, out=mix)
+        outdata[:] = mix
+
+    def get_latency_stats(self):
+        """Measured tap to audio start latency in milliseconds, None before the first play"""
+        if not self.latency_count:
+            return None
+        latencies = self.latencies[:min(self.latency_count, LATENCY_SAMPLES)] * 1000
+        return {
+            'count': self.latency_count,
+            'median_ms': float(np.median(latencies)),
+            'max_ms': float(latencies.max()),
+            'output_latency_ms': self.stream.latency * 1000,
+        }
+
+    def close(self):
+        """Stop the output stream, reporting the measured latency"""
+        stats = self.get_latency_stats()
+        if stats:
+            print(f"Audio assistance latency over {stats['count']} sounds: "
+                  f"median {stats['median_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        self.ready = False
+
+# Shared by the whole game, loaded when audio assistance is turned on
+pcm_bank = PCMBank()
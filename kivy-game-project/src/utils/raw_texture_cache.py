@@ -0,0 +1,89 @@
+import os
+import mmap
+import struct
+import hashlib
+
+# File layout: fixed header followed by the RGBA pixels, bottom row first (OpenGL order)
+# magic, version, flags, width, height, source mtime (ns), source size, source sha1
+HEADER_FORMAT = '<4sHHIIQQ20s'
+HEADER_SIZE = 64
+MAGIC = b'MGRT'
+VERSION = 1
+
+def get_raw_path(source_path):
+    """Path of the raw pixel cache for a decoded image"""
+    return os.path.splitext(source_path)[0] + '.rgba'
+
+def _file_sha1(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha1.update(chunk)
+    return sha1.digest()
+
+class RawTexture:
+    """Decoded RGBA pixels ready for Texture.blit_buffer"""
+
+    def __init__(self, width, height, pixels, mapping=None):
+        self.width = width
+        self.height = height
+        self.pixels = pixels
+        self._mapping = mapping
+
+    def close(self):
+        """Release the pixels (and unmap the cache file)"""
+        if isinstance(self.pixels, memoryview):
+            self.pixels.release()
+        self.pixels = None
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+def write_raw_texture(source_path, width, height, pixels):
+    """Store already decoded pixels of source_path so the next start skips decoding"""
+    stat = os.stat(source_path)
+    header = struct.pack(
+        HEADER_FORMAT, MAGIC, VERSION, 0, width, height,
+        stat.st_mtime_ns, stat.st_size, _file_sha1(source_path)
+    ).ljust(HEADER_SIZE, b'\0')
+
+    raw_path = get_raw_path(source_path)
+    tmp_path = raw_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(pixels)
+    os.replace(tmp_path, raw_path)
+
+def open_raw_texture(source_path):
+    """
+    Memory-map the cached pixels of source_path.
+
+    Returns None when there is no cache or it no longer matches the source
+    image (the source mtime/size changed and so did its content hash).
+    """
+    raw_path = get_raw_path(source_path)
+    if not os.path.exists(raw_path):
+        return None
+
+    with open(raw_path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            return None
+        magic, version, _, width, height, mtime_ns, size, sha1 = struct.unpack_from(HEADER_FORMAT, header)
+        if magic != MAGIC or version != VERSION:
+            return None
+
+        stat = os.stat(source_path)
+        if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+            # The file was touched, only the content hash can tell if it really changed
+            if stat.st_size != size or _file_sha1(source_path) != sha1:
+                return None
+
+        if os.fstat(f.fileno()).st_size != HEADER_SIZE + width * height * 4:
+            return None
+
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # A view into the mapping: the pixels go from the page cache straight to the GPU
+    pixels = memoryview(mapping)[HEADER_SIZE:]
+    return RawTexture(width, height, pixels, mapping)
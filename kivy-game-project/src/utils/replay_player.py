@@ -0,0 +1,103 @@
+import os
+from kivy.clock import Clock
+from logic.game_logic import DIFFICULTIES, HUGE_BOARDS
+from logic.replay import (replay_recorder, read_replay, EVENT_START, EVENT_FLIP, EVENT_CHECK,
+                          EVENT_REVEAL, EVENT_HIDE, EVENT_PAUSE, EVENT_RESUME)
+from utils.paths import get_items_dir
+
+def get_grid_size(num_cards):
+    """Grid of the difficulty screen with this number of cards, None if there isn't one"""
+    for boards in list(DIFFICULTIES.values()) + [HUGE_BOARDS]:
+        for label, board_cards, grid_size in boards:
+            if board_cards == num_cards:
+                return grid_size
+    return None
+
+class ReplayPlayer:
+    """
+    Plays a recorded game on the game screen, speed times faster than it was played.
+
+    The board is rebuilt from the recorded seed and every event goes through
+    the same GameScreen methods a tap would, so the cards, sounds, score and
+    match screen show exactly what the player saw. Touches are ignored while
+    the replay plays.
+    """
+
+    def __init__(self, game_screen, theme, records, speed=1.0):
+        self.game_screen = game_screen
+        self.theme = theme
+        self.records = records
+        self.speed = speed
+        self.index = 0
+        self.event = None
+
+    def start(self):
+        if not self.records or self.records[0][3] != EVENT_START:
+            print("Replay has no board to play")
+            return False
+        record_time, seed, num_cards, event = self.records[0]
+
+        # Recordings made on another computer point to its copy of the decks
+        theme = self.theme
+        if not os.path.isdir(theme):
+            theme = os.path.join(get_items_dir(), os.path.basename(theme))
+
+        # Don't record the replay itself
+        replay_recorder.save()
+        self.game_screen.replay_player = self
+        grid_size = get_grid_size(num_cards)
+        if grid_size:
+            self.game_screen.set_grid_size(grid_size)
+        self.game_screen.apply_theme(theme, num_cards, seed=seed)
+
+        self.index = 1
+        self._schedule_next()
+        return True
+
+    def _schedule_next(self):
+        if self.index >= len(self.records):
+            self.stop()
+            return
+        delay = (self.records[self.index][0] - self.records[self.index - 1][0]) / self.speed
+        self.event = Clock.schedule_once(self._play_next, max(0, delay))
+
+    def _play_next(self, dt):
+        self.event = None
+        record_time, seed, card, event = self.records[self.index]
+        screen = self.game_screen
+        if event == EVENT_FLIP:
+            if screen.board.flip(card):
+                screen.show_flipped_card(card)
+        elif event == EVENT_CHECK:
+            screen.check_match(0)
+        elif event == EVENT_REVEAL:
+            screen.reveal_cards(None)
+        elif event == EVENT_HIDE:
+            screen.hide_cards(0)
+        elif event == EVENT_PAUSE:
+            screen.stop_timer()
+        elif event == EVENT_RESUME:
+            screen.start_timer()
+
+        self.index += 1
+        self._schedule_next()
+
+    def stop(self):
+        if self.event:
+            self.event.cancel()
+            self.event = None
+        if self.game_screen.replay_player is self:
+            self.game_screen.replay_player = None
+
+def play_replay(screen_manager, path, speed=1.0):
+    """Load a replay file and play it on the game screen"""
+    try:
+        theme, records = read_replay(path)
+    except Exception as e:
+        print(f"Error loading replay {path}: {e}")
+        return None
+    player = ReplayPlayer(screen_manager.get_screen('game_screen'), theme, records, speed)
+    if not player.start():
+        return None
+    screen_manager.current = 'game_screen'
+    return player
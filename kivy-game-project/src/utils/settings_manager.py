@@ -1,6 +1,11 @@
 import os
 import json
-from kivy.utils import platform
+# Kivy is only asked which platform we run on: the game logic and the offline
+# tools import this module too and have to work where Kivy isn't installed
+try:
+    from kivy.utils import platform
+except ImportError:
+    platform = 'linux'
 
 def get_settings_dir():
     """Get the appropriate directory for storing settings based on platform"""
@@ -42,9 +47,15 @@ def load_settings():
         'score_display': True,
         'timer_display': True,
         'colorblind_mode': False,
+        'colorblind_filter': 'grayscale',  # grayscale, protan, deutan or tritan
         'audio_assist': False,
         'visual_feedback': True,
         'easy_mode': False,
+        'lazy_card_faces': False,  # Show the board with card backs only, load faces on first flip
+        'texture_budget_mb': 256,  # GPU memory for card decks, backgrounds and icons
+        'latency_monitor': False,  # Measure tap to pixel/sound latency, report saved on exit
+        'hints': False,  # Hint button that points at the next card to flip
+        'record_replays': False,  # Save every game as a replay file (see logic/replay.py)
     }
     
     try:
@@ -73,3 +84,9 @@ def save_settings(settings):
     except Exception as e:
         print(f"Error saving settings: {e}")
         return False
+
+def get_colorblind_filter(settings):
+    """Return the colour filter to apply to the cards, or None if colorblind mode is off"""
+    if not settings.get('colorblind_mode', False):
+        return None
+    return settings.get('colorblind_filter', 'grayscale')
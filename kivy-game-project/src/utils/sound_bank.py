@@ -0,0 +1,80 @@
+import os
+from collections import OrderedDict
+from kivy.core.audio import SoundLoader
+from utils.asset_fs import get_asset_fs
+from utils.audio_preprocess import get_playable_sound
+
+# Loaded sounds no board is using that we keep around (about two decks)
+DEFAULT_MAX_IDLE_SOUNDS = 64
+
+def get_sound_key(sound_path):
+    """Sounds are identified by their deck (sound folder) and card id, e.g. ('audios_wav_animais', 'bear')"""
+    deck = os.path.basename(os.path.dirname(sound_path))
+    card_id = os.path.splitext(os.path.basename(sound_path))[0]
+    return deck, card_id
+
+class SoundBank:
+    """
+    Keeps the card sounds loaded for the whole run of the game.
+
+    Boards acquire the sounds they use and release them when they are
+    replaced, so "Play Again" or another difficulty with the same deck finds
+    every sound already decoded. Sounds nobody holds stay loaded until more
+    than max_idle of them pile up, then the least recently used are unloaded.
+    """
+
+    def __init__(self, max_idle=DEFAULT_MAX_IDLE_SOUNDS):
+        self.max_idle = max_idle
+        self.entries = OrderedDict()  # key -> entry, least recently used first
+
+    def _load(self, sound_path):
+        key = get_sound_key(sound_path)
+        entry = self.entries.get(key)
+        if entry is None:
+            # The trimmed and normalized copy of the sound when the clips were processed
+            sound = SoundLoader.load(get_asset_fs().get_real_path(get_playable_sound(sound_path)))
+            if sound is None:
+                print(f"Could not load sound: {sound_path}")
+            entry = self.entries[key] = {'sound': sound, 'refs': 0}
+        self.entries.move_to_end(key)
+        return entry
+
+    def preload(self, sound_path):
+        """Load a sound without holding it (e.g. while the player is still choosing the difficulty)"""
+        self._load(sound_path)
+        self.evict_idle()
+
+    def acquire(self, sound_path):
+        """Get a loaded sound and hold it until release() is called"""
+        entry = self._load(sound_path)
+        entry['refs'] += 1
+        return entry['sound']
+
+    def release(self, sound_path):
+        """Stop holding a sound, it stays loaded while there is room for it"""
+        entry = self.entries.get(get_sound_key(sound_path))
+        if entry is None or entry['refs'] == 0:
+            return
+        entry['refs'] -= 1
+        self.evict_idle()
+
+    def is_loaded(self, sound_path):
+        return get_sound_key(sound_path) in self.entries
+
+    def evict_idle(self):
+        """Unload the least recently used sounds nobody holds, beyond max_idle"""
+        idle = [key for key, entry in self.entries.items() if entry['refs'] == 0]
+        for key in idle[:max(0, len(idle) - self.max_idle)]:
+            sound = self.entries.pop(key)['sound']
+            if sound:
+                sound.unload()
+
+    def describe(self):
+        """List the loaded sounds, least recently used first"""
+        return [
+            {'deck': key[0], 'card': key[1], 'refs': entry['refs']}
+            for key, entry in self.entries.items()
+        ]
+
+# Shared by the whole game, boards come and go but the sounds stay
+sound_bank = SoundBank()
@@ -0,0 +1,95 @@
+import os
+import colorsys
+from utils.settings_manager import get_settings_dir
+from utils.texture_atlas import forget_checked_atlases
+
+# Pillow draws the faces, without it boards can't be bigger than the real decks
+try:
+    from PIL import Image as PILImage, ImageDraw, ImageFont
+except ImportError:
+    PILImage = ImageDraw = ImageFont = None
+
+SYNTHETIC_DECK_NAME = 'baralho_sintetico'
+# Faces are drawn once at this size, huge boards never show cards bigger than that
+FACE_WIDTH = 128
+FACE_HEIGHT = 192
+SHAPES = ('circle', 'square', 'triangle', 'diamond')
+# Consecutive faces get hues far apart (golden ratio steps around the colour wheel)
+HUE_STEP = 0.618033988749895
+
+def is_available():
+    return PILImage is not None
+
+# Written in a deck directory once all its faces are drawn
+COMPLETE_MARKER = '.complete'
+
+def get_synthetic_deck_dir(num_faces):
+    """One deck (and so one atlas) per number of faces, a board never loads faces it doesn't use"""
+    return os.path.join(get_settings_dir(), f"{SYNTHETIC_DECK_NAME}_{num_faces}")
+
+def is_synthetic_deck(deck_dir):
+    return os.path.basename(os.path.normpath(deck_dir)).startswith(SYNTHETIC_DECK_NAME + '_')
+
+def _load_font(size):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only has the small bitmap font
+        return ImageFont.load_default()
+
+def _to_rgb(hue, saturation, value):
+    return tuple(round(c * 255) for c in colorsys.hsv_to_rgb(hue, saturation, value))
+
+def draw_face(number):
+    """Draw face number: a coloured card with a shape and the number, no two faces alike"""
+    hue = (number * HUE_STEP) % 1.0
+    face = PILImage.new('RGBA', (FACE_WIDTH, FACE_HEIGHT), _to_rgb(hue, 0.25, 0.97) + (255,))
+    draw = ImageDraw.Draw(face)
+    ink = _to_rgb(hue, 0.85, 0.6)
+    draw.rectangle((2, 2, FACE_WIDTH - 3, FACE_HEIGHT - 3), outline=ink, width=4)
+
+    # The shape changes every few numbers, so neighbouring numbers differ in shape and colour
+    left, top, right, bottom = 24, 24, FACE_WIDTH - 24, 24 + FACE_WIDTH - 48
+    shape = SHAPES[(number // 3) % len(SHAPES)]
+    if shape == 'circle':
+        draw.ellipse((left, top, right, bottom), fill=ink)
+    elif shape == 'square':
+        draw.rectangle((left, top, right, bottom), fill=ink)
+    elif shape == 'triangle':
+        draw.polygon(((left + right) // 2, top, right, bottom, left, bottom), fill=ink)
+    else:
+        middle_x, middle_y = (left + right) // 2, (top + bottom) // 2
+        draw.polygon((middle_x, top, right, middle_y, middle_x, bottom, left, middle_y), fill=ink)
+
+    draw.text((FACE_WIDTH // 2, bottom + (FACE_HEIGHT - bottom) // 2), str(number + 1),
+              fill=ink, font=_load_font(40), anchor='mm')
+    return face
+
+def ensure_synthetic_deck(num_faces):
+    """
+    Return the directory of the synthetic deck with exactly num_faces faces
+    (0.png, 1.png, ...), drawing them the first time.
+
+    The faces are kept with the settings, the atlases of the deck are built
+    from them like for any other deck. Once a deck is complete a marker file
+    says so, and later boards only check that one file.
+    """
+    deck_dir = get_synthetic_deck_dir(num_faces)
+    marker = os.path.join(deck_dir, COMPLETE_MARKER)
+    if os.path.exists(marker):
+        return deck_dir
+
+    os.makedirs(deck_dir, exist_ok=True)
+    drawn = 0
+    for number in range(num_faces):
+        path = os.path.join(deck_dir, f"{number}.png")
+        # Faces left by an interrupted run are kept
+        if not os.path.exists(path):
+            draw_face(number).save(path + '.tmp', format='PNG')
+            os.replace(path + '.tmp', path)
+            drawn += 1
+    with open(marker, 'w') as f:
+        f.write(f"{num_faces}\n")
+    print(f"Synthetic deck: drew {drawn} faces ({num_faces} in total)")
+    forget_checked_atlases(deck_dir)
+    return deck_dir
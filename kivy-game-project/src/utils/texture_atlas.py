@@ -0,0 +1,251 @@
+import os
+import json
+import threading
+from utils.settings_manager import get_settings_dir
+from utils.raw_texture_cache import write_raw_texture
+from utils.asset_manifest import get_manifest
+from utils.asset_fs import get_asset_fs
+from utils.color_filters import COLOR, filter_image
+
+# Pillow is only needed to build the atlases, the game can still run from the
+# loose PNG files if it is not installed
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+# Width of every card face inside the atlas (height follows the image aspect ratio)
+ATLAS_CELL_WIDTH = 256
+# Card widths (in pixels) we keep downscaled decks for, from smallest to biggest
+ATLAS_TIERS = (128, 192, 256, 384, 512)
+# Biggest texture we are willing to upload in one go (safe on OpenGL ES 2.0 devices)
+ATLAS_MAX_PAGE_SIZE = 4096
+# Empty pixels around every card to avoid texture bleeding
+ATLAS_PADDING = 2
+
+# Atlases already validated during this run of the game
+_checked_atlases = {}
+# The preloader builds atlases on a worker thread, never build the same one twice at once
+_atlas_lock = threading.Lock()
+
+def get_atlas_dir():
+    """Get the directory where the generated atlases are stored"""
+    atlas_dir = os.path.join(get_settings_dir(), 'atlas')
+
+    # Make sure the directory exists
+    if not os.path.exists(atlas_dir):
+        os.makedirs(atlas_dir)
+
+    return atlas_dir
+
+def get_deck_images(deck_dir):
+    """Return the sorted list of card images inside a deck directory"""
+    images = get_manifest().get_card_images(deck_dir)
+    if images is not None:
+        return images
+    # Decks the manifest doesn't know about are scanned
+    return sorted(
+        os.path.join(deck_dir, f)
+        for f in os.listdir(deck_dir)
+        if f.lower().endswith('.png')
+    )
+
+def get_card_id(image_path):
+    """The id of a card inside the atlas is its file name without extension"""
+    return os.path.splitext(os.path.basename(image_path))[0]
+
+def choose_tier(card_width):
+    """Smallest atlas tier that is still sharp for a card drawn card_width pixels wide"""
+    for tier in ATLAS_TIERS:
+        if tier >= card_width:
+            return tier
+    return ATLAS_TIERS[-1]
+
+def get_atlas_base(deck_dir, cell_width=ATLAS_CELL_WIDTH, variant=COLOR):
+    """Path of the atlas for a deck, without the .atlas extension"""
+    deck_name = os.path.basename(os.path.normpath(deck_dir))
+    if variant != COLOR:
+        deck_name += f"_{variant}"
+    suffix = 'native' if cell_width is None else str(cell_width)
+    return os.path.join(get_atlas_dir(), f"{deck_name}_{suffix}")
+
+def atlas_uri(atlas_base, card_id):
+    """Build the atlas:// uri Kivy uses to find a texture inside an atlas"""
+    return 'atlas://' + atlas_base.replace(os.sep, '/') + '/' + card_id
+
+def _sources_signature(images):
+    """Describe the source images so we know when the atlas must be rebuilt"""
+    manifest = get_manifest()
+    signature = []
+    for image_path in images:
+        card = manifest.get_card(image_path)
+        if card is not None:
+            # The manifest already hashed the image, no need to stat it again
+            signature.append([os.path.basename(image_path), card['sha1']])
+        else:
+            stat = os.stat(image_path)
+            signature.append([os.path.basename(image_path), int(stat.st_mtime), stat.st_size])
+    return signature
+
+def _write_json(path, data):
+    # Write to a temporary file first so a crash never leaves half an atlas behind
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def is_atlas_current(deck_dir, atlas_base, images=None):
+    """Check if the atlas exists and was built from the current deck images"""
+    if not os.path.exists(atlas_base + '.atlas'):
+        return False
+
+    if images is None:
+        images = get_deck_images(deck_dir)
+
+    try:
+        with open(atlas_base + '.sources.json', 'r') as f:
+            return json.load(f) == _sources_signature(images)
+    except Exception:
+        return False
+
+def build_atlas(deck_dir, atlas_base, cell_width=ATLAS_CELL_WIDTH, images=None, variant=COLOR):
+    """
+    Pack all the cards of a deck into one (or a few) texture pages.
+
+    The result uses the same .atlas format as kivy.atlas, so the cards can be
+    used everywhere with atlas://<atlas_base>/<card_id> uris.
+
+    Args:
+        deck_dir (str): Directory with the card images
+        atlas_base (str): Output path without the .atlas extension
+        cell_width (int): Width of every card in the atlas, None keeps the original size
+        variant (str): Colour filter applied to the cards (see utils.color_filters)
+
+    Returns:
+        str: The atlas base path
+    """
+    if PILImage is None:
+        raise RuntimeError("Pillow is required to build texture atlases")
+
+    if images is None:
+        images = get_deck_images(deck_dir)
+
+    print(f"Building atlas {os.path.basename(atlas_base)} from {len(images)} images")
+
+    # Load and resize every card (through the asset pack when there is one)
+    asset_fs = get_asset_fs()
+    cards = []
+    for image_path in images:
+        with PILImage.open(asset_fs.open(image_path)) as img:
+            img = img.convert('RGBA')
+            if cell_width is not None and img.width != cell_width:
+                height = max(1, round(img.height * cell_width / img.width))
+                img = img.resize((cell_width, height), PILImage.LANCZOS)
+            cards.append((get_card_id(image_path), img))
+
+    # Simple shelf packing: fill rows left to right, open a new page when full
+    pages = []
+    placements = []
+    x = y = shelf_height = 0
+    for card_id, img in cards:
+        w, h = img.size
+        if x + w + 2 * ATLAS_PADDING > ATLAS_MAX_PAGE_SIZE:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        if not pages or y + h + 2 * ATLAS_PADDING > ATLAS_MAX_PAGE_SIZE:
+            pages.append([0, 0])
+            x = y = shelf_height = 0
+        placements.append((len(pages) - 1, card_id, img, x + ATLAS_PADDING, y + ATLAS_PADDING))
+        x += w + ATLAS_PADDING
+        shelf_height = max(shelf_height, h + ATLAS_PADDING)
+        page = pages[-1]
+        page[0] = max(page[0], x + ATLAS_PADDING)
+        page[1] = max(page[1], y + shelf_height + ATLAS_PADDING)
+
+    # Draw the pages and write the metadata
+    atlas_name = os.path.basename(atlas_base)
+    page_images = [PILImage.new('RGBA', tuple(size), (0, 0, 0, 0)) for size in pages]
+    meta = {}
+    for page_index, card_id, img, px, py in placements:
+        page_image = page_images[page_index]
+        page_image.paste(img, (px, py))
+        page_name = f"{atlas_name}-{page_index}.png"
+        # Kivy atlases use OpenGL coordinates (origin at the bottom left)
+        meta.setdefault(page_name, {})[card_id] = [px, page_image.height - py - img.height, img.width, img.height]
+
+    for page_index, page_image in enumerate(page_images):
+        # Colorblind variants are generated here, one vectorized pass for the whole page
+        page_image = filter_image(page_image, variant)
+        page_path = f"{atlas_base}-{page_index}.png"
+        page_image.save(page_path + '.tmp', format='PNG')
+        os.replace(page_path + '.tmp', page_path)
+        # Keep the decoded pixels too, so loading the page never has to inflate the PNG
+        flipped = page_image.transpose(PILImage.FLIP_TOP_BOTTOM)
+        write_raw_texture(page_path, flipped.width, flipped.height, flipped.tobytes())
+
+    _write_json(atlas_base + '.atlas', meta)
+    _write_json(atlas_base + '.sources.json', _sources_signature(images))
+
+    print(f"Atlas {atlas_name} ready with {len(page_images)} page(s)")
+    return atlas_base
+
+def ensure_deck_atlas(deck_dir, cell_width=ATLAS_CELL_WIDTH, variant=COLOR):
+    """
+    Return the atlas base for a deck, building it first if needed.
+
+    Returns None when the atlas can't be used (e.g. Pillow is missing), in that
+    case the callers keep using the loose image files.
+    """
+    atlas_base = get_atlas_base(deck_dir, cell_width, variant)
+    if atlas_base in _checked_atlases:
+        return _checked_atlases[atlas_base]
+
+    with _atlas_lock:
+        # Another thread may have finished it while we were waiting
+        if atlas_base in _checked_atlases:
+            return _checked_atlases[atlas_base]
+
+        result = None
+        try:
+            images = get_deck_images(deck_dir)
+            if is_atlas_current(deck_dir, atlas_base, images):
+                result = atlas_base
+            elif PILImage is not None:
+                result = build_atlas(deck_dir, atlas_base, cell_width, images, variant)
+            else:
+                print("Pillow not installed, using loose card images instead of an atlas")
+        except Exception as e:
+            print(f"Error preparing atlas for {deck_dir}: {e}")
+
+        _checked_atlases[atlas_base] = result
+    return result
+
+def forget_checked_atlases(deck_dir):
+    """The images of a deck changed during this run: check (and rebuild) its atlases again"""
+    prefix = get_atlas_base(deck_dir, cell_width=None)[:-len('native')]
+    for atlas_base in [key for key in _checked_atlases if key.startswith(prefix)]:
+        del _checked_atlases[atlas_base]
+
+def get_card_source(atlas_base, image_path):
+    """Source to give to a widget for a card: atlas uri if possible, the file otherwise"""
+    if atlas_base is None:
+        return get_asset_fs().get_real_path(image_path)
+    return atlas_uri(atlas_base, get_card_id(image_path))
+
+if __name__ == '__main__':
+    # Prebuild the atlases of every deck: python -m utils.texture_atlas
+    from utils.paths import get_items_dir
+    items_dir = get_items_dir()
+    from utils.color_filters import COLORBLIND_FILTERS, is_available
+    variants = (COLOR,) + (COLORBLIND_FILTERS if is_available() else ())
+    for deck in ("baralho_animais", "baralho_numeros"):
+        for tier in ATLAS_TIERS:
+            for variant in variants:
+                ensure_deck_atlas(os.path.join(items_dir, deck), cell_width=tier, variant=variant)
+    if not is_available():
+        # Without NumPy the black and white decks on disk are used in colorblind mode
+        for deck in ("baralho_animais_preto_e_branco", "baralho_numeros_preto_e_branco"):
+            for tier in ATLAS_TIERS:
+                ensure_deck_atlas(os.path.join(items_dir, deck), cell_width=tier)
+    ensure_deck_atlas(os.path.join(items_dir, "Parte_Traseira_Cartas"), cell_width=None)
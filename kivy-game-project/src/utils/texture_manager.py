@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from kivy.cache import Cache
+
+# Categories of textures we keep track of
+DECK = 'deck'
+BACKGROUND = 'background'
+ICON = 'icon'
+
+DEFAULT_BUDGET_MB = 256
+
+class TextureManager:
+    """
+    Keeps track of the textures the game holds on the GPU and evicts the least
+    recently used ones (decks, backgrounds, icons) when a byte budget is exceeded.
+    Pinned textures (e.g. the deck of the running game) are never evicted.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_MB * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()  # key -> entry, least recently used first
+        self.pinned = set()
+
+    def set_budget(self, budget_bytes):
+        """Change the budget, evicting right away if we are now over it"""
+        self.budget_bytes = budget_bytes
+        self.enforce_budget()
+
+    def register(self, key, category, size_bytes, on_evict=None):
+        """
+        Start tracking a resident texture.
+
+        Args:
+            key (str): Unique name of the texture (atlas base, file path...)
+            category (str): DECK, BACKGROUND or ICON
+            size_bytes (int): GPU memory used by the texture
+            on_evict (callable): Called with the key to release the texture
+        """
+        self.entries[key] = {
+            'category': category,
+            'bytes': size_bytes,
+            'on_evict': on_evict,
+        }
+        self.entries.move_to_end(key)
+        self.enforce_budget()
+
+    def touch(self, key):
+        """Mark a texture as just used"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+
+    def is_resident(self, key):
+        return key in self.entries
+
+    def pin(self, key):
+        """Protect a texture from eviction (e.g. the deck on the board)"""
+        self.pinned.add(key)
+        self.touch(key)
+
+    def unpin(self, key):
+        self.pinned.discard(key)
+        self.enforce_budget()
+
+    def evict(self, key):
+        """Release a texture now, even if it is pinned"""
+        entry = self.entries.pop(key, None)
+        self.pinned.discard(key)
+        if entry is None:
+            return
+        print(f"Evicting {entry['category']} texture {key} ({entry['bytes'] // 1024} KB)")
+        if entry['on_evict']:
+            try:
+                entry['on_evict'](key)
+            except Exception as e:
+                print(f"Error evicting texture {key}: {e}")
+
+    def enforce_budget(self):
+        """Evict least recently used, unpinned textures until we fit in the budget"""
+        total = self.total_bytes()
+        for key in list(self.entries):
+            if total <= self.budget_bytes:
+                break
+            if key in self.pinned:
+                continue
+            total -= self.entries[key]['bytes']
+            self.evict(key)
+
+    def total_bytes(self):
+        return sum(entry['bytes'] for entry in self.entries.values())
+
+    def resident_bytes(self):
+        """Return the resident bytes per category, e.g. {'deck': 25165824, 'icon': 53200}"""
+        usage = {DECK: 0, BACKGROUND: 0, ICON: 0}
+        for entry in self.entries.values():
+            usage[entry['category']] = usage.get(entry['category'], 0) + entry['bytes']
+        return usage
+
+    def describe(self):
+        """List the resident textures, least recently used first"""
+        return [
+            {
+                'key': key,
+                'category': entry['category'],
+                'bytes': entry['bytes'],
+                'pinned': key in self.pinned,
+            }
+            for key, entry in self.entries.items()
+        ]
+
+def evict_atlas(atlas_key):
+    """Drop an atlas and its card textures from Kivy's caches"""
+    atlas = Cache.get('kv.atlas', atlas_key)
+    Cache.remove('kv.atlas', atlas_key)
+    if atlas is not None:
+        # Kivy also caches every atlas:// texture it handed out
+        for card_id in atlas.textures:
+            Cache.remove('kv.texture', 'atlas://%s/%s|0|0' % (atlas_key, card_id))
+
+def evict_image(source):
+    """Drop an image file from Kivy's caches"""
+    Cache.remove('kv.texture', '%s|0|0' % source)
+    Cache.remove('kv.image', '%s|0|0' % source)
+
+def texture_bytes(texture):
+    """GPU memory used by a texture (RGBA, no mipmaps)"""
+    width, height = texture.size
+    return width * height * 4
+
+# Shared by the whole game, the budget is set from the settings when the app starts
+texture_manager = TextureManager()